@@ -125,11 +125,39 @@ class DataUtility(FileSystemUtility):
 
     return _df
 
+  def _json_row(self, json_el, map=None, **kwargs):
+    """Row (dict) of an element using the column to key map, None if the element cannot be converted"""
+    if map and isinstance(map, (dict)):
+      # If column map is provided
+      return {_column: self.get_deep_key(json_el, _dotkey, **kwargs) for _column, _dotkey in map.items()}
+    elif isinstance(json_el, (dict)):
+      # If column map is not provided
+      return dict(json_el)
+
+    self.log_warning("JSON_TO_DF: Could not process data.")
+
+  def _json_chunks_to_df(self, json_els, map, chunk_size, **kwargs):
+    _rows = []
+    for _json_el in json_els:
+      _row = self._json_row(_json_el, map, **kwargs)
+      if _row is not None:
+        _rows.append(_row)
+      if len(_rows) >= chunk_size:
+        yield self.DF(_rows)
+        _rows = []
+
+    if _rows:
+      yield self.DF(_rows)
+
   def _json_file_to_df(self, *args, **kwargs):
     """JSON structure to DataFrame converter
 
+    Elements of the top level array are streamed from the file (see iter_json) and converted to rows in chunks,
+    so the parsed document is never held in memory together with the DataFrame.
+
     :param json|0: JSON file path (string)/object (dict)
     :param map|1: Dot notation of keys to parse (parsable using UL.deepkey) i.e., column to key map e.g. entity|0|metadata|header
+    :param chunk_size: Returns a generator of DataFrames of chunk_size rows instead of a single DataFrame
 
     :return: pandas.DataFrame
 
@@ -137,37 +165,107 @@ class DataUtility(FileSystemUtility):
     _json_path = kwargs.get("json_path", args[0] if len(args) > 0 else None)
     _map = kwargs.get("map", args[1] if len(args) > 1 else None)
     _sep = kwargs.get("sep", args[2] if len(args) > 2 else '.')
+    _chunk_size = kwargs.pop("chunk_size", None)
 
+    kwargs = {_k: _v for _k, _v in kwargs.items() if _k not in ("json_path", "map")}
     kwargs.setdefault("sep", _sep)
-    _result = []
 
-    _json_path = EntityPath(_json_path)
-
-    if _json_path.exists():
-      _json = self.read_json(_json_path)
+    if isinstance(_json_path, (list, tuple, dict)):
+      _json = [_json_path] if isinstance(_json_path, dict) else _json_path
+    elif EntityPath(_json_path).exists():
+      _json = self.iter_json(_json_path)
     else:
-      self.log_error(f'Please provide valid JSON path {_json}')
-      return self.DF(_result)
-
-    for _json_el in _json:
-      _row = {}
-      if _map and isinstance(_map, (dict)):
-        # If column map is provided
-        for _column, _dotkey in _map.items():
-          _row[_column] = self.get_deep_key(_json_el, _dotkey, **kwargs)
-        _result.append(_row)
-      elif isinstance(_json_el, (dict)):
-        # If column map is not provided
-        for _column, _value in _json_el.items():
-          _row[_column] = _value
-        _result.append(_row)
-      else:
-        self.log_warning("JSON_TO_DF: Could not process data.")
+      self.log_error(f'Please provide valid JSON path {_json_path}')
+      return self.DF([])
 
-    return self.DF(_result)
+    _chunks = self._json_chunks_to_df(_json, _map, _chunk_size or 100000, **kwargs)
+    if _chunk_size:
+      return _chunks
+
+    _dfs = list(_chunks)
+    if len(_dfs) > 1:
+      return self.PD.concat(_dfs, ignore_index=True)
+
+    return _dfs[0] if _dfs else self.DF([])
 
   json_to_df = _json_file_to_df
 
+  def _deep_key_getter(self, keys, default=None, sep="|"):
+    """get_deep_key for a fixed key path (compiled once), to project many records
+
+    :return: callable(obj) -> same value as get_deep_key(obj, keys, default, sep)
+    """
+    _steps = self._compile_deep_key(keys, sep)
+    _walk = self._walk_deep_key
+
+    if len(_steps) == 1 and _steps[0][2] and not _steps[0][1]:
+      _key = _steps[0][0]
+      return lambda obj: obj.get(_key, default) if isinstance(obj, dict) else _walk(obj, _steps, default)
+
+    return lambda obj: _walk(obj, _steps, default)
+
+  def _typed_column(self, values, dtype):
+    try:
+      return self.PD.Series(values, dtype=dtype)
+    except (TypeError, ValueError):
+      # e.g., numbers as strings
+      return self.PD.Series(values).astype(dtype)
+
+  def _jsonl_to_df(self, *args, **kwargs):
+    """Reads a plain or compressed JSONL file into DataFrame batches of batch_size rows
+
+    Records are decoded a batch at a time (see iter_jsonl) and only the requested keys are projected into columns.
+
+    @example
+    for _df in UL.jsonl_to_df("feed.jsonl.gz", {"id": "id", "score": "metrics|score", "tag": "tags|0"}, {"id": "int64", "score": "float32", "tag": "category"}):
+      pass
+
+    :param file_path|0:
+    :param keys|1: Column to get_deep_key path map, list of paths (path as column name) or None for all keys
+    :param schema|2: Column to dtype map (e.g., Int64 for integers with missing values), columns are taken from schema when keys is None
+    :param batch_size|3: Rows per DataFrame (Default 100000)
+    :param sep: Path separator (Default |)
+    :param default: Value for the missing keys (Default None)
+    :param skip_rows:
+    :param max_rows:
+
+    :return: generator of pandas.DataFrame
+    """
+    _file_path = kwargs.get("file_path", args[0] if len(args) > 0 else None)
+    _keys = kwargs.get("keys", args[1] if len(args) > 1 else None)
+    _schema = kwargs.get("schema", args[2] if len(args) > 2 else None) or {}
+    _batch_size = kwargs.get("batch_size", args[3] if len(args) > 3 else 100000)
+    _sep = kwargs.get("sep", "|")
+    _default = kwargs.get("default")
+
+    if _keys is None and _schema:
+      _keys = list(_schema.keys())
+
+    if isinstance(_keys, dict):
+      _columns = list(_keys.items())
+    elif _keys is not None:
+      _columns = [(_k if isinstance(_k, str) else _sep.join(map(str, _k)), _k) for _k in _keys]
+    else:
+      _columns = None
+
+    _getters = [(_column, self._deep_key_getter(_path, _default, _sep)) for _column, _path in _columns or []]
+
+    self.require("pandas", "PD")
+    for _records in self.iter_jsonl(_file_path, _batch_size, kwargs.get("skip_rows", 0), max_rows=kwargs.get("max_rows")):
+      if _columns is None:
+        yield self.DF(_records)
+        continue
+
+      _data = {}
+      for _column, _get in _getters:
+        _values = [_get(_record) for _record in _records]
+        _data[_column] = self._typed_column(_values, _schema[_column]) if _column in _schema else _values
+
+      yield self.PD.DataFrame(_data, copy=False)
+
+  jsonl_to_df = _jsonl_to_df
+  parse_jsonl_df = _jsonl_to_df
+
   def pd_categorical(self, df, col_name, sort=True):
     """
     Arguments:
@@ -699,24 +797,35 @@ class DataUtility(FileSystemUtility):
     _default = args[2] if len(args) > 2 else kwargs.get("default")
     _sep = args[3] if len(args) > 3 else kwargs.get("sep", "|")
 
+    return self._walk_deep_key(_obj, self._compile_deep_key(_keys, _sep), _default)
+
+  @staticmethod
+  def _compile_deep_key(keys, sep="|"):
+    """Key path as [(key, flag_all, flag_key, index)] steps for _walk_deep_key"""
+    _keys = keys if isinstance(keys, (tuple, set, list)) else keys.split(sep)
+    _steps = []
+    for _k in _keys:
+      _index = int(_k) if isinstance(_k, int) or str(_k).isnumeric() else None
+      _steps.append((_k, isinstance(_k, str) and "*" in _k, isinstance(_k, (str, int)), _index))
+    return _steps
+
+  @staticmethod
+  def _walk_deep_key(obj, steps, default=None):
+    """Traversal of get_deep_key, type mismatches (e.g., name on a list) keep the current value like out of range indices"""
     _instance_list = (tuple, set, list)
     _instance_dict = (dict)
-    _instance_singluar = (str, int)
 
-    _keys = _keys if isinstance(_keys, _instance_list) else _keys.split(_sep)
-
-    for _k in _keys:
+    for _k, _flag_all, _flag_key, _index in steps:
       # hasattr(, 'get') & str|int=> _dict key, int => list, tuple, or set
-      if "*" in _k:
-        _obj = list(_obj)
-      elif isinstance(_obj, _instance_dict) and isinstance(_k, _instance_singluar):
-        _obj = _obj.get(_k, _default)
-      elif(isinstance(_obj, _instance_list) and (isinstance(_k, _instance_singluar) or _k.isnumeric())):
-        _k = int(_k)
-        if len(_obj) > _k:
-          _obj = _obj[_k]
-
-    return _obj
+      if _flag_all:
+        obj = list(obj) if isinstance(obj, (_instance_dict, *_instance_list)) else obj
+      elif _flag_key and isinstance(obj, _instance_dict):
+        obj = obj.get(_k, default)
+      elif _index is not None and isinstance(obj, _instance_list):
+        if len(obj) > _index:
+          obj = obj[_index]
+
+    return obj
 
   dotkey_value = get_deep_key
 
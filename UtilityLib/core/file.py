@@ -1,5 +1,13 @@
 from .db import DatabaseUtility
 from ..lib.path import EntityPath
+from ..lib.gzindex import GzipIndex
+from ..lib.archive import ArchivePool, TarIndex
+from ..lib.writer import FileWriter
+from ..lib.walk import DirWalker, PathMatcher
+from ..lib.trash import Trash
+from ..lib.fetch import HTTPClient, HTTPCache
+from ..lib.split import FileSplitter
+from ..lib.statcache import StatCache
 
 class FileSystemUtility(DatabaseUtility):
   def __init__(self, *args, **kwargs):
@@ -133,24 +141,78 @@ class FileSystemUtility(DatabaseUtility):
 
     self._compress_dir(*args, **kwargs)
 
+  def _gzip_compress_blocks(self, *args, **kwargs):
+    """Compresses blocks of a file handle as independent gzip members on a thread pool
+
+    Members are written in the original order, concatenated members form a valid multi-member gzip.
+    Only `max_workers * 2` blocks are held in memory at a time.
+
+    :param file_in|0: Binary file handle to read from
+    :param file_out|1: Binary file handle to write to
+    :param level|2: Compression level (1-9)
+    :param block_size|3: Uncompressed bytes per member
+    :param max_workers|4: Number of threads
+    """
+    _f_in = kwargs.get("file_in", args[0] if len(args) > 0 else None)
+    _f_out = kwargs.get("file_out", args[1] if len(args) > 1 else None)
+    _level = kwargs.get("level", args[2] if len(args) > 2 else 9)
+    _block_size = kwargs.get("block_size", args[3] if len(args) > 3 else 16 * 1024 * 1024)
+    _max_workers = kwargs.get("max_workers", args[4] if len(args) > 4 else self._get_max_workers())
+
+    self.require("gzip", "GZip")
+    self.require("collections", "Collections")
+    self.require('concurrent.futures', 'ConcurrentFutures')
+
+    _pending = self.Collections.deque()
+    with self.ConcurrentFutures.ThreadPoolExecutor(max_workers=_max_workers) as _executor:
+      for _block in self._get_fh_blocks(_f_in, _block_size):
+        # mtime=0 keeps the output reproducible for the same input
+        _pending.append(_executor.submit(self.GZip.compress, _block, _level, mtime=0))
+        if len(_pending) >= _max_workers * 2:
+          _f_out.write(_pending.popleft().result())
+
+      while _pending:
+        _f_out.write(_pending.popleft().result())
+
+    if _f_out.tell() == 0:
+      # Empty input still needs one member to be a valid gz file
+      _f_out.write(self.GZip.compress(b"", _level, mtime=0))
+
   def _compress_file_to_gzip(self, *args, **kwargs):
     """Compress a file to gz
 
     :param path_file|0:
     :param flag_move|1: Default False
+    :param level|2: Compression level 1-9 (Default 9)
+    :param flag_parallel|3: Compress blocks on a thread pool into a multi-member gz (Default False)
+    :param block_size: Uncompressed bytes per gz member in parallel mode (Default 16MiB)
+    :param max_workers: Threads used in parallel mode
+
+    @stats: See benchmarks/bench_gz.py
 
     """
     self.path_file = kwargs.get("path_file", args[0] if len(args) > 0 else None)
     self.flag_move = kwargs.get("flag_move", args[1] if len(args) > 1 else False)
+    _level = kwargs.get("level", args[2] if len(args) > 2 else 9)
+    _flag_parallel = kwargs.get("flag_parallel", args[3] if len(args) > 3 else False)
+    _block_size = kwargs.get("block_size", 16 * 1024 * 1024)
+    _max_workers = kwargs.get("max_workers", self._get_max_workers())
     self.require("gzip", "GZip")
 
-    with open(self.path_file, 'rb') as _f_in, self.GZip.open(f"{self.path_file}.gz", 'wb') as _f_out:
-      _f_out.writelines(_f_in)
+    _path_gz = f"{self.path_file}.gz"
+    if _flag_parallel:
+      with open(self.path_file, 'rb') as _f_in, open(_path_gz, 'wb') as _f_out:
+        self._gzip_compress_blocks(_f_in, _f_out, _level, _block_size, _max_workers)
+    else:
+      with open(self.path_file, 'rb') as _f_in, self.GZip.open(_path_gz, 'wb', compresslevel=_level) as _f_out:
+        _f_out.writelines(_f_in)
 
     if self.flag_move == True:
       # delete file to simulate moving a file to gz compression
       self.delete_path(self.path_file)
 
+    return self.check_path(_path_gz)
+
   compress_gz = _compress_file_to_gzip
   to_gz = _compress_file_to_gzip
   gz = _compress_file_to_gzip
@@ -159,72 +221,107 @@ class FileSystemUtility(DatabaseUtility):
 
   def _add_files_to_tar_gzip(self, *args, **kwargs):
     """Adds files to tarball with gz compression
-      Note: Directory architecture is not maintained for now.
+
+      Existing members are streamed from the old archive to the new one (nothing is extracted),
+      new files are added in the same pass and the old archive is replaced.
+      Paths are stored relative to `root_dir` (default current working directory) so that batches of the same tree
+      get consistent member names, files outside root_dir are stored under their absolute path without the leading /
+      (like tar). A dict of {arcname: path} can be used for custom member names.
+      Existing members with the same name are replaced by the new files.
 
       @params
       :param path_tgz|0:
-      :param files_path|1:
+      :param files_path|1: path, list of paths or dict {arcname: path}
       :param mode|2: (default: w:gz)
+      :param root_dir|3: Directory to which member names are relative (default current working directory)
+      :raises ValueError: if two different files get the same member name
     """
-    self.path_tgz = kwargs.get("path_tgz", args[0] if len(args) > 0 else getattr('path_tgz', None))
+    self.path_tgz = kwargs.get("path_tgz", args[0] if len(args) > 0 else getattr(self, 'path_tgz', None))
     _file_paths = kwargs.get("files_path", args[1] if len(args) > 1 else [])
     _mode = kwargs.get("mode", args[2] if len(args) > 2 else "w:gz")
+    _root_dir = kwargs.get("root_dir", args[3] if len(args) > 3 else None)
 
     if isinstance(_file_paths, (str, EntityPath)):
       _file_paths = [_file_paths]
 
     if isinstance(_file_paths, (list, tuple, set)):
-      _file_paths = {self.file_name(_f, with_ext=True): _f for _f in _file_paths if self.check_path(_f)}
+      _root = self.OS.path.abspath(str(_root_dir) if _root_dir is not None else self.OS.getcwd())
+      _arcnames = {}
+      for _f in [str(_f) for _f in _file_paths if self.check_path(_f)]:
+        _path = self.OS.path.abspath(_f)
+        try:
+          _name = self.OS.path.relpath(_path, _root)
+        except ValueError:
+          # Different drive
+          _name = ".."
+        if _name == ".." or _name.startswith(f"..{self.OS.sep}"):
+          _name = self.OS.path.splitdrive(_path)[1].lstrip(self.OS.sep)
+
+        if _name in _arcnames and _arcnames[_name] != _path:
+          raise ValueError(f"{_arcnames[_name]} and {_path} would both be stored as {_name} in {self.path_tgz}.")
+        _arcnames[_name] = _path
+      _file_paths = _arcnames
 
     if isinstance(_file_paths, (dict)):
       self.require("tarfile", "TarFileManager")
-      if not self.exists(self.path_tgz):
-        _tar = self.TarFileManager.open(self.path_tgz, _mode)
-        _tar.close()
+      _file_paths = {self.OS.path.normpath(str(_name)).replace(self.OS.sep, "/"): _path for _name, _path in _file_paths.items()}
 
-      _tar = self.TarFileManager.open(self.path_tgz, 'r:gz')
       _tmp_tgz = f"{self.path_tgz}.tmp.tgz"
+      try:
+        with self.TarFileManager.open(_tmp_tgz, _mode) as _tmp_tarh:
+          if self.exists(self.path_tgz):
+            with self.TarFileManager.open(self.path_tgz, 'r:*') as _tar:
+              for _mem in _tar:
+                if _mem.name in _file_paths:
+                  self.log_debug(f"FILE_05: Replacing {_mem.name} in {self.path_tgz}.")
+                  continue
+                _tmp_tarh.addfile(_mem, _tar.extractfile(_mem) if _mem.isfile() else None)
+
+          for _name, _path in _file_paths.items():
+            if self.check_path(_path):
+              _tmp_tarh.add(_path, arcname=_name)
+
+        self.OS.replace(_tmp_tgz, self.path_tgz)
+      finally:
+        if self.OS.path.exists(_tmp_tgz):
+          self.OS.remove(_tmp_tgz)
+
+    return self.check_path(self.path_tgz)
 
-      _tmp_tarh = self.TarFileManager.open(_tmp_tgz, _mode)
-
-      _tar.extractall()
-      for _mem in _tar.members:
-        _tmp_tarh.add(_mem.path)
-        self.delete_file(_mem.path)
-
-      # @TODO Same file name in different path will be overridden
-      for _name, _path in _file_paths.items():
-        if self.check_path(_path):
-          _tmp_tarh.add(_path, arcname=_name)
+  add_tgz_files = _add_files_to_tar_gzip
 
-      _tmp_tarh.close()
-      _tar.close()
+  _archive_pool = None
 
-      self.delete_file(self.path_tgz)
-      self.rename(_tmp_tgz, self.path_tgz)
+  @property
+  def archive_pool(self):
+    """LRU pool of open archive handles (use `with self.archive_pool:` to close them at the end)"""
+    if self._archive_pool is None:
+      self._archive_pool = ArchivePool()
+    return self._archive_pool
 
-  add_tgz_files = _add_files_to_tar_gzip
+  def _get_tar_index(self, *args, **kwargs):
+    """Pooled TarIndex of the tarball (built once and saved as <path_tgz>.taridx)"""
+    _path_tgz = kwargs.get("path_tgz", args[0] if len(args) > 0 else None)
+    return self.archive_pool.get(_path_tgz, lambda _p: TarIndex(_p).load_or_build(), "tar")
 
   def list_tgz_items(self, *args, **kwargs):
-    """
-
-    @bug: Doesn't renew file in loop due to path_tgz
-    Workaround to assign path_tgz at the beginning of every loop.
+    """Lists members of a tarball using the member index
 
+    :param path_tgz|0:
+    :param info_type|1: names|info
+    :param flag_filter|2: Returns tarfile.TarInfo objects
     """
-    if not hasattr(self, "path_tgz"):
-      self.path_tgz = args[0] if len(args) > 0 else kwargs.get("path_tgz")
+    self.path_tgz = args[0] if len(args) > 0 else kwargs.get("path_tgz", getattr(self, "path_tgz", None))
 
     _info_type = args[1] if len(args) > 1 else kwargs.get("info_type", "names") # names|info
     _flag_filter = args[2] if len(args) > 2 else kwargs.get("flag_filter", False)
 
-    self.require("tarfile", "TarFileManager")
-    self.tgz_obj = self.TarFileManager.open(self.path_tgz, "r:gz") # File is left open
+    _tar_index = self._get_tar_index(self.path_tgz)
 
     if _info_type == "names" and _flag_filter == False:
-      self.tgz_items = self.tgz_obj.getnames()
+      self.tgz_items = _tar_index.names()
     else:
-      self.tgz_items = self.tgz_obj.getmembers()
+      self.tgz_items = _tar_index.members_info()
     return self.tgz_items
 
   def list_tgz_files(self, *args, **kwargs):
@@ -235,17 +332,20 @@ class FileSystemUtility(DatabaseUtility):
     return self.tgz_files
 
   def read_tgz_file(self, *args, **kwargs):
-    if not hasattr(self, "tgz_files") or not hasattr(self, "tgz_obj"):
-      self.list_tgz_files(*args, **kwargs)
+    """Reads a member of tarball using the member index and pooled handles
+
+    :param path_tgz|0:
+    :param filename|3:
+    :param encoding|4:
+    """
+    self.path_tgz = args[0] if len(args) > 0 else kwargs.get("path_tgz", getattr(self, "path_tgz", None))
     _filename = args[3] if len(args) > 3 else kwargs.get("filename")
     _encoding = args[4] if len(args) > 4 else kwargs.get("encoding", "utf-8")
 
-    _file_content = None
-    if _filename in self.tgz_files:
-      _file = self.tgz_obj.extractfile(_filename)
-      _file_content = _file.read()
+    _file_content = self._get_tar_index(self.path_tgz).read(_filename)
+    if _file_content is not None:
       try:
-        _file_content = _file_content.decode()
+        _file_content = _file_content.decode(_encoding)
       except:
         # Don't raise error for image/media file types ["png", "jpg", "htaccess", "gif", "woff2", "ttf", "mp4"]
         if self.ext(_filename) in ["png", "jpg", "htaccess", "gif", "woff2", "ttf", "mp4"]:
@@ -259,6 +359,12 @@ class FileSystemUtility(DatabaseUtility):
     """
       Reads gzipped files only (not tar.gz, tgz or a compressed file) line by line (fasta, txt, jsonl, csv, and tsv etc...)
       Can advance the counter to skip set of lines
+
+      :param file|0:
+      :param processor_line|1: Callable applied on every line
+      :param skip_rows: Lines to skip (Default 0)
+      :param row_size: Number of lines to read (Default 100)
+      :param flag_index: Use GzipIndex (`<file>.gzidx`) to jump to skip_rows (Default True)
     """
     _default_args = {
       "skip_rows": 0,
@@ -269,6 +375,7 @@ class FileSystemUtility(DatabaseUtility):
 
     _file = args[0] if len(args) > 0 else kwargs.get("file")
     _processor_line = args[1] if len(args) > 1 else kwargs.get("processor_line")
+    _flag_index = kwargs.get("flag_index", True)
 
     self.count_lines = self.count_lines if hasattr(self, "count_lines") else self.skip_rows
 
@@ -276,12 +383,20 @@ class FileSystemUtility(DatabaseUtility):
 
     self.require("gzip", "GZip")
     _result = True
-    with self.GZip.open(_file, 'rt') as _fh:
+    if self.row_size and _flag_index:
+      # Jumps near skip_rows using access points instead of decompressing earlier lines again
+      _fh = GzipIndex.get(_file).open(line=self.skip_rows)
+      _skip_rows = 0
+    else:
+      _fh = self.GZip.open(_file, 'rt')
+      _skip_rows = self.skip_rows
+
+    with _fh:
       if not self.row_size:
         _result = _fh.readlines()
       else:
         self.require('itertools', "IterTools")
-        for _line in self.IterTools.islice(_fh, self.skip_rows, self.skip_rows + self.row_size):
+        for _line in self.IterTools.islice(_fh, _skip_rows, _skip_rows + self.row_size):
           # _fh.buffer.fileobj.tell() # https://stackoverflow.com/a/62589283/16963281
           self.count_lines = self.count_lines + 1
           yield _processor_line(_line) if _processor_line else _line
@@ -295,15 +410,95 @@ class FileSystemUtility(DatabaseUtility):
       if not _b: break
       yield _b
 
+  @staticmethod
+  def _count_newlines_in_range(path, start, end, block_size=16 * 1024 * 1024):
+    """Counts b"\\n" in the byte range [start, end) of a file using mmap
+    (staticmethod so that it can be pickled for the process pool)
+    """
+    import mmap as _MMap
+    _count = 0
+    with open(path, 'rb') as _fh, _MMap.mmap(_fh.fileno(), 0, access=_MMap.ACCESS_READ) as _mm:
+      for _pos in range(start, end, block_size):
+        _count += _mm[_pos:min(_pos + block_size, end)].count(b"\n")
+
+    return _count
+
+  def _count_newlines_parallel(self, *args, **kwargs):
+    """Splits a file in byte ranges and counts b"\\n" in the ranges on a process pool
+
+    :param path_file|0:
+    :param num_workers|1: Default os.cpu_count()
+    :param min_size|2: Files smaller than this (Default 64MiB) are counted in the current process
+    """
+    _file_path = kwargs.get('path_file', args[0] if len(args) > 0 else None)
+    _num_workers = kwargs.get('num_workers', args[1] if len(args) > 1 else self.OS.cpu_count())
+    _min_size = kwargs.get('min_size', args[2] if len(args) > 2 else 64 * 1024 * 1024)
+
+    _size = self.OS.path.getsize(_file_path)
+    if _size == 0:
+      return 0
+
+    if _num_workers < 2 or _size < _min_size:
+      return self._count_newlines_in_range(_file_path, 0, _size)
+
+    _step = -(-_size // _num_workers)
+    _ranges = [(_file_path, _start, min(_start + _step, _size)) for _start in range(0, _size, _step)]
+
+    self.require('concurrent.futures', 'ConcurrentFutures')
+    try:
+      with self.ConcurrentFutures.ProcessPoolExecutor(max_workers=_num_workers) as _executor:
+        return sum(_executor.map(self._count_newlines_in_range, *zip(*_ranges)))
+    except Exception as _e:
+      self.log_debug(f"FILE_04: Process pool failed ({_e}), counting lines in current process.")
+      return self._count_newlines_in_range(_file_path, 0, _size)
+
+  def _has_lone_cr(self, file_path, is_gz=False, size=64 * 1024):
+    """True if the start of the file has \r not followed by \n (universal newlines count it as a line end)"""
+    self.require('gzip', 'GZip')
+    with (self.GZip.open if is_gz else open)(file_path, 'rb') as _fh:
+      _data = _fh.read(size)
+
+    # \r at the end of the sample may be followed by \n
+    return b"\r" in _data.replace(b"\r\n", b"")[:-1]
+
   def count_file_lines(self, *args, **kwargs):
-    """Quickly counts lines in a file or gz file
-    @stats: counts lines in a 7GB gz file in 2min
+    """Quickly counts lines (b"\\n") in a file or gz file
+    @stats: counts lines in a 7GB gz file in 2min (text mode), see benchmarks/bench_count_lines.py
+
+    Plain files are counted with mmap over byte ranges on a process pool.
+    gz files are decompressed and counted in binary mode (no text decoding).
+    Binary mode counts b"\n" (\r\n is one line like in text mode). Files with lone \r line ends (old Mac style)
+    in the first 64KiB are counted in text mode so that \r is a line end as well, lone \r after that is not counted.
+
+    :param path_file|0:
+    :param flag_index: For gz files, returns count from GzipIndex and completes the index (Default True)
+    :param flag_binary: False to decode and count as text like earlier versions (Default True)
+    :param num_workers: Processes to count plain files (Default os.cpu_count())
+    :param read_method: Custom open method for text mode
     """
     _file_path = kwargs.get('path_file', args[0] if len(args) > 0 else None)
     _read_method = kwargs.get('read_method', open)
+    _flag_index = kwargs.get('flag_index', True)
+    _flag_binary = kwargs.get('flag_binary', 'read_method' not in kwargs)
+    _num_workers = kwargs.get('num_workers', self.OS.cpu_count())
 
     # To bypass Pathlib open method call
-    _file_path = str(_file_path.resolve())
+    _file_path = str(EntityPath(_file_path).resolve())
+
+    _is_gz = _file_path.endswith('.gz')
+    if _flag_binary and self._has_lone_cr(_file_path, _is_gz):
+      _flag_binary = False
+
+    if _flag_binary and _is_gz and _flag_index:
+      return GzipIndex.get(_file_path).count_lines()
+
+    if _flag_binary and _is_gz:
+      self.require('gzip', 'GZip')
+      with self.GZip.open(_file_path, 'rb') as _fh:
+        return sum(_bl.count(b"\n") for _bl in self._get_fh_blocks(_fh, 1024 * 1024))
+
+    if _flag_binary:
+      return self._count_newlines_parallel(_file_path, _num_workers)
 
     # Fall back
     _args = [_file_path, "r"]
@@ -313,7 +508,7 @@ class FileSystemUtility(DatabaseUtility):
     }
 
     # If gz compressed
-    if str(_file_path).endswith('.gz'):
+    if _is_gz:
       self.require('gzip', 'GZip')
       _read_method = self.GZip.open
       _args = [_file_path, "rt"]
@@ -325,16 +520,147 @@ class FileSystemUtility(DatabaseUtility):
 
     return _num_lines
 
+  def _get_safe_members(self, destination, members, get_name):
+    """Members whose names resolve inside destination, absolute names and ../ escapes are skipped with a warning"""
+    _root = self.OS.path.realpath(str(destination))
+    _safe = []
+    for _member in members:
+      _name = get_name(_member)
+      _path = self.OS.path.realpath(self.OS.path.join(_root, _name))
+      if self.OS.path.isabs(_name) or self.OS.path.commonpath([_root, _path]) != _root:
+        self.log_warning(f"Skipping {_name}, it would be extracted outside {_root}.")
+        continue
+      _safe.append(_member)
+    return _safe
+
+  def _extract_zip_members(self, *args, **kwargs):
+    """Extracts zip members in parallel, every thread reads through its own ZipFile handle
+
+    :param source|0: Zip file
+    :param destination|1: Directory
+    :param pattern|2: glob pattern(s) of member names to extract (all if None and no regex)
+    :param regex|3: regular expression(s) searched in member names
+    :param max_workers: Threads (default from CommandUtility)
+    :param callback: Called with (extracted_members, total_members)
+
+    :return: Number of extracted members
+    """
+    _source = kwargs.get("source", args[0] if len(args) > 0 else None)
+    _destination = kwargs.get("destination", args[1] if len(args) > 1 else None)
+    _pattern = kwargs.get("pattern", args[2] if len(args) > 2 else None)
+    _regex = kwargs.get("regex", args[3] if len(args) > 3 else None)
+    _max_workers = kwargs.get("max_workers", self._get_max_workers())
+    _callback = kwargs.get("callback", None)
+
+    self.require("zipfile", "ZipHandler")
+    self.require("threading", "Threading")
+    self.require("concurrent.futures", "ConcurrentFutures")
+
+    _source, _destination = str(_source), str(_destination)
+    with self.ZipHandler.ZipFile(_source, "r") as _zip:
+      _members = _zip.infolist()
+
+    if _pattern or _regex:
+      _matcher = PathMatcher(glob=_pattern, regex=_regex)
+      _members = [_m for _m in _members if _matcher.match(_m.filename.rstrip("/"), self.OS.path.basename(_m.filename.rstrip("/")), _m.is_dir())]
+
+    _members = self._get_safe_members(_destination, _members, lambda _m: _m.filename)
+    _files = [_m for _m in _members if not _m.is_dir()]
+    # ZipFile.extract creates missing parents without exist_ok, threads would race on shared parents
+    _dirs = {self.OS.path.join(_destination, _m.filename) for _m in _members if _m.is_dir()}
+    _dirs.update(self.OS.path.dirname(self.OS.path.normpath(self.OS.path.join(_destination, _m.filename))) for _m in _files)
+    for _dir in _dirs:
+      self.OS.makedirs(_dir, exist_ok=True)
+
+    # Batches of similar compressed size, larger members first
+    _files.sort(key=lambda _m: _m.compress_size, reverse=True)
+    _num_batches = max(1, min(len(_files), _max_workers * 4))
+    _batches = [_files[_idx::_num_batches] for _idx in range(_num_batches)]
+
+    _local = self.Threading.local()
+    _handles, _lock = [], self.Threading.Lock()
+    _done = [0]
+
+    def _extract_batch(_batch):
+      if not hasattr(_local, "zip"):
+        _local.zip = self.ZipHandler.ZipFile(_source, "r")
+        with _lock:
+          _handles.append(_local.zip)
+      for _member in _batch:
+        _local.zip.extract(_member, _destination)
+      with _lock:
+        _done[0] += len(_batch)
+        _callback and _callback(_done[0], len(_files))
+      return len(_batch)
+
+    try:
+      with self.ConcurrentFutures.ThreadPoolExecutor(max_workers=max(1, _max_workers)) as _executor:
+        _extracted = sum(_executor.map(_extract_batch, [_b for _b in _batches if _b]))
+    finally:
+      for _handle in _handles:
+        _handle.close()
+
+    return _extracted
+
+  def _extract_with_7z(self, *args, **kwargs):
+    """Extracts using 7z command line, waits for it and logs progress
+
+    :param source|0:
+    :param destination|1:
+    :param pattern|2: glob pattern(s) passed to 7z
+    :return: True if 7z exited successfully
+    """
+    _source = kwargs.get("source", args[0] if len(args) > 0 else None)
+    _destination = kwargs.get("destination", args[1] if len(args) > 1 else None)
+    _pattern = kwargs.get("pattern", args[2] if len(args) > 2 else None)
+
+    self.require('subprocess', 'SubProcess')
+    _patterns = [_pattern] if isinstance(_pattern, str) else list(_pattern or [])
+    _command = ["7z", "e", f"{_source}", f"-o{_destination}", "-y", "-bsp1"] + (["-r"] + _patterns if _patterns else [])
+
+    try:
+      _process = self.SubProcess.Popen(_command, stdout=self.SubProcess.PIPE, stderr=self.SubProcess.STDOUT, text=True, bufsize=1)
+    except OSError as _e:
+      self.log_error(f"7z could not be started: {_e}")
+      return False
+
+    self.require("re", "RegEx")
+    _last = -10
+    _buffer = ""
+    while True:
+      _char = _process.stdout.read(1)
+      if not _char:
+        break
+      # 7z rewrites progress line using backspaces
+      if _char in "\b\r\n":
+        _match = self.RegEx.search(r"(\d+)%", _buffer)
+        if _match and int(_match.group(1)) >= _last + 10:
+          _last = int(_match.group(1))
+          self.log_info(f"Extracting {_source}: {_last}%")
+        _buffer = ""
+      else:
+        _buffer += _char
+
+    _return_code = _process.wait()
+    if _return_code != 0:
+      self.log_error(f"7z exited with code {_return_code} for {_source}.")
+
+    return _return_code == 0
+
   def _uncompress_archive(self, *args, **kwargs):
     """Unpack archive like .zip, .gz, .tar
 
     Programs attempted:
-      SHUTIL
-      ZipFile
-      7z Commandline
+      ZipFile (members in parallel)
+      TarFile/SHUTIL
+      7z Commandline (waited, progress is logged)
 
     :param source|0: eg /mnt/data/drive/downloads/files-1.tar.gz
     :param destination|1: /mnt/data/drive/downloads
+    :param pattern|2: glob pattern(s) of members to extract (e.g., "*.pdb", "data/**/*.tsv")
+    :param regex: regular expression(s) searched in member names
+    :param max_workers: Threads for zip extraction
+    :param callback: Called with (extracted_members, total_members) for zip
 
     :return: bool
     """
@@ -345,77 +671,259 @@ class FileSystemUtility(DatabaseUtility):
 
     _source = EntityPath(_source)
     _destination = kwargs.get("destination", args[1] if len(args) > 1 else _source.parent() / _source.stem)
+    _pattern = kwargs.get("pattern", args[2] if len(args) > 2 else None)
+    _regex = kwargs.get("regex", None)
+    _max_workers = kwargs.get("max_workers", self._get_max_workers())
+    _callback = kwargs.get("callback", None)
 
     _destination = EntityPath(_destination)
 
     if _destination.exists():
       self.log_warning(f'{_destination} already exists.')
 
+    _is_extracted = False
     if _source.exists():
         try:
           if _source.has_suffix('.zip'):
             """Extracts ZIP Files Only"""
-            self.require("zipfile", "ZipHandler")
-            with self.ZipHandler.ZipFile(str(_source), 'r') as zipObj:
-              zipObj.extractall(_destination)
+            self._extract_zip_members(_source, _destination, _pattern, _regex, max_workers=_max_workers, callback=_callback)
+          elif _pattern or _regex:
+            self.require("tarfile", "TarFileManager")
+            _matcher = PathMatcher(glob=_pattern, regex=_regex)
+            with self.TarFileManager.open(str(_source), "r:*") as _tar:
+              _members = [_m for _m in _tar if _matcher.match(_m.name.rstrip("/"), self.OS.path.basename(_m.name), _m.isdir())]
+              _members = self._get_safe_members(_destination, _members, lambda _m: _m.name)
+              # data filter also rejects links pointing outside destination and special files (Python 3.8.17+)
+              _filter = {"filter": "data"} if hasattr(self.TarFileManager, "data_filter") else {}
+              _tar.extractall(_destination, members=_members, **_filter)
           else:
-            self.SHUTIL.unpack_archive(_source, _destination)
+            self.require("tarfile", "TarFileManager")
+            _filter = {"filter": "data"} if hasattr(self.TarFileManager, "data_filter") else {}
+            self.SHUTIL.unpack_archive(_source, _destination, **_filter)
+          _is_extracted = True
         except Exception as _e:
           # https://stackoverflow.com/a/59327542 ZIP compression 9
           self.log_debug(f'Error occurred: {_e}')
           self.log_debug(f'Trying with 7z')
-          self.require('subprocess', 'SubProcess')
-          self.SubProcess.Popen(["7z", "e", f"{_source}", f"-o{_destination}", "-y"])
+          _is_extracted = self._extract_with_7z(_source, _destination, _pattern)
 
-    if _destination.exists():
+    if _is_extracted and _destination.exists():
       self.log_info(f"Extracted {_source} content in {_destination}.")
     else:
       self.log_error(f'Failed to extract {_source}.')
 
-    return _destination.exists()
+    return _is_extracted and _destination.exists()
 
   extract_zip = _uncompress_archive
   unzip = _uncompress_archive
   uncompress = _uncompress_archive
 
+  _inventory_columns = ("file_dir",
+      "file_name",
+      "file_created",
+      "file_modified",
+      "file_accessed",
+      "file_size")
+
+  def _inventory_dir(self, *args, **kwargs):
+    """Lists one directory for the inventory, runs on the walker threads
+
+    :param dir_path|0:
+    :param depth|1: Depth from DirWalker.map (not used)
+    :param walker|2: DirWalker
+    :param previous|3: {dir: [mtime_ns, sub_dirs]} of the last inventory, unchanged directories are not listed again
+
+    :return: (sub_dirs, (dir_path, mtime_ns, sub_dirs, rows|None)), rows is None for unchanged directories
+    """
+    _dir_path = kwargs.get("dir_path", args[0] if len(args) > 0 else None)
+    _walker = kwargs.get("walker", args[2] if len(args) > 2 else None)
+    _previous = kwargs.get("previous", args[3] if len(args) > 3 else None) or {}
+
+    try:
+      _mtime_ns = self.OS.stat(_dir_path).st_mtime_ns
+    except OSError:
+      return [], (_dir_path, None, [], [])
+
+    _state = _previous.get(_dir_path)
+    if _state and _state[0] == _mtime_ns:
+      _sub_dirs = [self.OS.path.join(_dir_path, _d) for _d in _state[1]]
+      return _sub_dirs, (_dir_path, _mtime_ns, _state[1], None)
+
+    _dirs, _files = _walker.scan(_dir_path)
+    _rows = []
+    for _entry in _files:
+      try:
+        _stat = _entry.stat()
+      except OSError:
+        # Broken symlinks
+        _stat = _entry.stat(follow_symlinks=False)
+      _rows.append((_dir_path, _entry.name, _stat.st_ctime, _stat.st_mtime, _stat.st_atime, _stat.st_size))
+
+    _sub_dirs = _walker.descend(_dirs)
+    return _sub_dirs, (_dir_path, _mtime_ns, [self.OS.path.basename(_d) for _d in _sub_dirs], _rows)
+
   def _recursive_list_dir_items(self, *args, **kwargs):
+    """Yields (dir_path, mtime_ns, sub_dir_names, rows|None) for every directory using a parallel scandir walk
+
+    :param path|0:
+    :param level|1: -1 for all, 0 for items of the path only
+    :param max_workers|2:
+    :param previous|3: {dir: [mtime_ns, sub_dirs]} for incremental listing
+    """
     _path = kwargs.get('path', args[0] if len(args) > 0 else None)
-    _path_details = kwargs.get('path_details', args[1] if len(args) > 1 else self.path_base / f'path-details.{self.timestamp[:10]}.tsv')
+    _level = kwargs.get('level', args[1] if len(args) > 1 else -1)
+    _max_workers = kwargs.get('max_workers', args[2] if len(args) > 2 else self._get_max_workers())
+    _previous = kwargs.get('previous', args[3] if len(args) > 3 else None)
 
-    if not _path or not _path.exists():
-      return
+    _walker = DirWalker(_path, max_depth=_level, max_workers=_max_workers)
+    yield from _walker.map(lambda _dir_path, _depth: self._inventory_dir(_dir_path, _depth, _walker, _previous))
 
-    if not _path_details.exists():
-      _head = ("file_dir",
-          "file_name",
-          "file_created",
-          "file_modified",
-          "file_accessed",
-          "file_size")
-
-      _head = "\t".join(_head)
-      _head = _head + "\n"
-      (_path_details).write_text(_head)
-
-    if _path.is_file():
-      _data = (str(_path.parent().full_path),
-          str(_path.name),
-          str(_path.stats.st_ctime),
-          str(_path.stats.st_mtime),
-          str(_path.stats.st_atime),
-          str(_path.size))
-
-      _data = "\t".join(_data)
-      _data = _data + "\n"
-      (_path_details).write_text(_data)
-
-    elif _path.is_dir():
-      for _item in _path.items:
-        self._recursive_list_dir_items(_item, _path_details)
-    else:
-      self.log_error(f'{_path} is neither a dir or file.')
+    for _dir_path, _e in _walker.errors:
+      self.log_warning(f"Could not list {_dir_path}: {_e}")
+
+  def _read_inventory_state(self, *args, **kwargs):
+    """Directory state {dir: [mtime_ns, sub_dirs]} saved next to TSV inventory"""
+    _path_state = kwargs.get('path_state', args[0] if len(args) > 0 else None)
+    if not _path_state or not self.OS.path.exists(_path_state):
+      return {}
+
+    try:
+      with self.GZip.open(_path_state, "rt") as _fh:
+        return self.JSON.load(_fh).get("dirs", {})
+    except Exception as _e:
+      self.log_warning(f"Ignoring inventory state {_path_state}: {_e}")
+
+    return {}
+
+  def _write_inventory_tsv(self, *args, **kwargs):
+    """Writes inventory to gzip TSV in batches, unchanged directories are copied from the previous inventory"""
+    _path = kwargs.get('path', args[0] if len(args) > 0 else None)
+    _path_gz = kwargs.get('path_gz', args[1] if len(args) > 1 else None)
+    _path_previous = kwargs.get('path_previous', args[2] if len(args) > 2 else None)
+    _level = kwargs.get('level', -1)
+    _max_workers = kwargs.get('max_workers', self._get_max_workers())
+    _batch_size = kwargs.get('batch_size', 100000)
+
+    _previous = self._read_inventory_state(f"{_path_previous}.dirs.gz") if _path_previous else {}
+    _state, _reused, _batch = {}, set(), []
+
+    _path_tmp = f"{_path_gz}.tmp"
+    with self.GZip.open(_path_tmp, "wt", compresslevel=6, encoding="utf-8") as _fh:
+      _fh.write("\t".join(self._inventory_columns) + "\n")
+
+      for _dir_path, _mtime_ns, _sub_dirs, _rows in self._recursive_list_dir_items(_path, _level, _max_workers, _previous):
+        if _mtime_ns is None:
+          continue
+
+        _state[_dir_path] = [_mtime_ns, _sub_dirs]
+        if _rows is None:
+          _reused.add(_dir_path)
+          continue
+
+        _batch.extend("\t".join(map(str, _row)) + "\n" for _row in _rows)
+        if len(_batch) >= _batch_size:
+          _fh.write("".join(_batch))
+          _batch = []
+
+      _fh.write("".join(_batch))
+
+      if _reused:
+        self.log_info(f"Copying {len(_reused)} unchanged directories from {_path_previous}.")
+        with self.GZip.open(_path_previous, "rt", encoding="utf-8") as _fh_prev:
+          next(_fh_prev, None)
+          _batch = []
+          for _line in _fh_prev:
+            if _line.split("\t", 1)[0] in _reused:
+              _batch.append(_line)
+              if len(_batch) >= _batch_size:
+                _fh.write("".join(_batch))
+                _batch = []
+          _fh.write("".join(_batch))
+
+    self.OS.replace(_path_tmp, _path_gz)
+
+    with self.GZip.open(f"{_path_gz}.dirs.gz", "wt") as _fh:
+      self.JSON.dump({"version": 1, "root": str(_path), "dirs": _state}, _fh)
+
+    return _path_gz
+
+  def _write_inventory_sqlite(self, *args, **kwargs):
+    """Writes inventory to SQLite tables items and dirs, incremental mode updates changed directories in place"""
+    _path = kwargs.get('path', args[0] if len(args) > 0 else None)
+    _path_db = kwargs.get('path_db', args[1] if len(args) > 1 else None)
+    _flag_incremental = kwargs.get('flag_incremental', args[2] if len(args) > 2 else False)
+    _level = kwargs.get('level', -1)
+    _max_workers = kwargs.get('max_workers', self._get_max_workers())
+    _batch_size = kwargs.get('batch_size', 100000)
+
+    self.require("sqlite3", "SQLite3")
+    _conn = self.SQLite3.connect(str(_path_db))
+    try:
+      if not _flag_incremental:
+        _conn.executescript("DROP TABLE IF EXISTS items; DROP TABLE IF EXISTS dirs;")
+
+      _conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=OFF;
+        CREATE TABLE IF NOT EXISTS items (file_dir TEXT, file_name TEXT, file_created REAL, file_modified REAL, file_accessed REAL, file_size INTEGER);
+        CREATE INDEX IF NOT EXISTS items_file_dir ON items (file_dir);
+        CREATE TABLE IF NOT EXISTS dirs (dir TEXT PRIMARY KEY, mtime_ns INTEGER, sub_dirs TEXT);
+      """)
+
+      _previous = {}
+      if _flag_incremental:
+        _previous = {_d: [_m, self.JSON.loads(_s)] for _d, _m, _s in _conn.execute("SELECT dir, mtime_ns, sub_dirs FROM dirs")}
+
+      _seen, _batch, _dirs = set(), [], []
+      for _dir_path, _mtime_ns, _sub_dirs, _rows in self._recursive_list_dir_items(_path, _level, _max_workers, _previous):
+        if _mtime_ns is None:
+          continue
+
+        _seen.add(_dir_path)
+        if _rows is None:
+          continue
+
+        if _dir_path in _previous:
+          _conn.execute("DELETE FROM items WHERE file_dir = ?", (_dir_path,))
+
+        _dirs.append((_dir_path, _mtime_ns, self.JSON.dumps(_sub_dirs)))
+        _batch.extend(_rows)
+        if len(_batch) >= _batch_size:
+          _conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)", _batch)
+          _batch = []
+
+      _conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?)", _batch)
+      _conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", _dirs)
+
+      # Directories removed since the last inventory
+      _removed = [(_d,) for _d in _previous if _d not in _seen]
+      _conn.executemany("DELETE FROM items WHERE file_dir = ?", _removed)
+      _conn.executemany("DELETE FROM dirs WHERE dir = ?", _removed)
+      _conn.commit()
+    finally:
+      _conn.close()
+
+    return _path_db
 
   def _dir_file_inventory(self, *args, **kwargs):
+    """Lists all the files with their stats (created, modified, accessed, size) in a directory tree
+
+    Directories are listed in parallel with os.scandir and rows are written in batches to
+    gzip TSV (default) or SQLite.
+
+    :param path|0: Directory
+    :param path_details|1: TSV path (written as .tsv.gz), default <path>.items-<date>.tsv
+    :param level|2: -1 for all, 0 for one recursion
+    :param flag_sqlite|3: Writes <path_details>.db (tables items and dirs) instead of TSV
+    :param flag_incremental: Lists again only the directories whose mtime changed since the last inventory
+      (file content changes without directory changes are not detected)
+    :param path_previous: Previous TSV inventory for incremental mode, default latest <path>.items-*.tsv.gz
+    :param max_workers: Threads for listing directories
+    :param batch_size: Rows per write, default 100000
+    :param flag_df: Returns DataFrame of the inventory (default True)
+
+    :return: (path of the inventory, DataFrame|None)
+    """
     _path = kwargs.get('path', args[0] if len(args) > 0 else None)
 
     _path = EntityPath(_path)
@@ -424,29 +932,49 @@ class FileSystemUtility(DatabaseUtility):
     _path_details = kwargs.get('path_details', args[1] if len(args) > 1 else _path.with_suffix(f'.items-{_ustamp}.tsv'))
     _level = kwargs.get('level', args[2] if len(args) > 2 else -1) # -1 for all, 0 for one recursion
     _flag_sqlite = kwargs.get('flag_sqlite', args[3] if len(args) > 3 else False)
+    _flag_incremental = kwargs.get('flag_incremental', False)
+    _path_previous = kwargs.get('path_previous', None)
+    _max_workers = kwargs.get('max_workers', self._get_max_workers())
+    _batch_size = kwargs.get('batch_size', 100000)
+    _flag_df = kwargs.get('flag_df', True)
 
     if not _path or not _path.exists():
       return
 
-    _path_details_gz = _path.with_suffix(f'.items-{_ustamp}.tsv.gz')
+    _path_root = str(_path.resolve())
+    _path_details = EntityPath(_path_details)
+    _item_details = None
+
+    if _flag_sqlite:
+      _path_db = _path_details.with_suffix('.db')
+      self._write_inventory_sqlite(_path_root, _path_db, _flag_incremental, level=_level, max_workers=_max_workers, batch_size=_batch_size)
 
-    if _path_details.exists():
-      self.log_warning('Deleting existing details file.')
+      if _flag_df and self.require("pandas", "PD"):
+        self.require("sqlite3", "SQLite3")
+        with self.SQLite3.connect(str(_path_db)) as _conn:
+          _item_details = self.PD.read_sql_query("SELECT * FROM items", _conn)
 
-    if _path_details_gz.exists():
-      _path_details_gz.move(_path_details_gz.with_suffix(f".{_path_details_gz.suffix}.bak"))
+      return _path_db, _item_details
+
+    self.require("gzip", "GZip")
+    _path_details_gz = EntityPath(f"{_path_details}.gz" if _path_details.suffix != ".gz" else _path_details)
 
-    self._recursive_list_dir_items(_path, _path_details, level=_level)
+    if _flag_incremental and _path_previous is None:
+      _candidates = [_p for _p in _path_details_gz.parent().glob(_path.with_suffix('.items-*.tsv.gz').name)]
+      _candidates += [_path_details_gz] if _path_details_gz.exists() else []
+      _path_previous = max(_candidates, key=lambda _p: _p.stat().st_mtime, default=None)
 
-    self.gz(_path_details, flag_move=True)
+    if _path_details_gz.exists():
+      _path_details_bak = _path_details_gz.with_suffix(f"{_path_details_gz.suffix}.bak")
+      _path_details_gz.copy(_path_details_bak) if _flag_incremental else _path_details_gz.move(_path_details_bak)
+      if _path_previous is not None and str(_path_previous) == str(_path_details_gz):
+        _path_previous = _path_details_bak
+        self.OS.path.exists(f"{_path_details_gz}.dirs.gz") and self.OS.replace(f"{_path_details_gz}.dirs.gz", f"{_path_details_bak}.dirs.gz")
 
-    # Get dataframe from the
-    _item_details = self.read_tsv(_path_details_gz)
+    self._write_inventory_tsv(_path_root, str(_path_details_gz), _path_previous if _flag_incremental else None, level=_level, max_workers=_max_workers, batch_size=_batch_size)
 
-    """SQLite Takes More Space Than File"""
-    if _flag_sqlite:
-      self.conect_sqlite(self.config.details_file.with_suffix('.db'))
-      _item_details.to_sql(self.config.details_file.stem, self.engine, index=False)
+    if _flag_df:
+      _item_details = self.read_tsv(_path_details_gz)
 
     return _path_details_gz, _item_details
 
@@ -454,19 +982,23 @@ class FileSystemUtility(DatabaseUtility):
   get_item_details = _dir_file_inventory
   file_stats = _dir_file_inventory
 
+  def _get_zip_handle(self, *args, **kwargs):
+    """Pooled zipfile.ZipFile of the archive"""
+    _path_zip = kwargs.get("path_zip", args[0] if len(args) > 0 else None)
+    self.require("zipfile", "ZipHandler")
+    return self.archive_pool.get(_path_zip, self.ZipHandler.ZipFile, "zip")
+
   def list_zip_items(self, *args, **kwargs):
-    self.path_zip = args[0] if len(args) > 0 else kwargs.get("path_zip", getattr(self, "path_zip"))
+    self.path_zip = args[0] if len(args) > 0 else kwargs.get("path_zip", getattr(self, "path_zip", None))
 
     _info_type = args[1] if len(args) > 1 else kwargs.get("info_type", "info") # names|info
     _flag_filter = args[2] if len(args) > 2 else kwargs.get("flag_filter", False)
 
-    self.require("zipfile", "ZipHandler")
-
-    self.zip_obj = self.ZipHandler.ZipFile(self.path_zip)
+    _zip_obj = self._get_zip_handle(self.path_zip)
     if _info_type == "names" and _flag_filter == False:
-      self.zip_items = self.zip_obj.namelist()
+      self.zip_items = _zip_obj.namelist()
     else:
-      self.zip_items = self.zip_obj.infolist()
+      self.zip_items = _zip_obj.infolist()
 
     return self.zip_items
 
@@ -478,9 +1010,8 @@ class FileSystemUtility(DatabaseUtility):
     return self.zip_files
 
   def read_zipfile(self, *args, **kwargs):
-    if not hasattr(self, "zip_files") or not hasattr(self, "zip_obj"):
-      self.list_zip_files(*args, **kwargs)
-    _filename = args[3] if len(args) > 3 else kwargs.get("filename", "utf-8")
+    self.path_zip = args[0] if len(args) > 0 else kwargs.get("path_zip", getattr(self, "path_zip", None))
+    _filename = args[3] if len(args) > 3 else kwargs.get("filename")
     _encoding = args[4] if len(args) > 4 else kwargs.get("encoding", "utf-8")
 
     # Count Lines: https://stackoverflow.com/a/9631635/6213452
@@ -488,13 +1019,15 @@ class FileSystemUtility(DatabaseUtility):
     if not self.path_zip or not _filename:
       return None
 
-    # self.require('io', 'IO')
+    # ZipFile keeps name to member map of the central directory, lookup is O(1)
+    _zip_obj = self._get_zip_handle(self.path_zip)
+    _zip_info = _zip_obj.NameToInfo.get(_filename)
 
     _content = None
-    if _filename in self.zip_files:
-      _content = self.zip_obj.read(_filename)
+    if _zip_info is not None and not _zip_info.is_dir():
+      _content = _zip_obj.read(_zip_info)
       try:
-        _content = _content.decode()
+        _content = _content.decode(_encoding)
       except:
         self.log_error("Could not decode the content, returning as it is.")
         pass
@@ -504,9 +1037,68 @@ class FileSystemUtility(DatabaseUtility):
     return _content
 
   def parse_jsonl_gz(self, *args, **kwargs):
-    kwargs.update({"processor_line": self.JSON.loads})
+    """Parses lines of a gzipped JSONL file (see read_gz_file), use iter_jsonl/jsonl_to_df for batches"""
+    kwargs.update({"processor_line": self._get_json_loads()})
     return self.read_gz_file(*args, **kwargs)
 
+  def _iter_jsonl_batches(self, *args, **kwargs):
+    """Yields lists of decoded records from a plain or compressed JSONL file, batch_size lines at a time
+
+    The file is read in large blocks and split into lines at C speed (no per line readline calls),
+    lines are decoded by the fastest available parser (orjson > ujson > json). Blank lines are skipped.
+
+    :param file_path|0:
+    :param batch_size|1: Lines per batch (Default 50000)
+    :param skip_rows|2: Lines to skip (Default 0)
+    :param max_rows: Stops after max_rows lines
+    :param block_size: Bytes read at a time (Default 8MiB)
+    """
+    _file_path = kwargs.get("file_path", args[0] if len(args) > 0 else None)
+    _batch_size = kwargs.get("batch_size", args[1] if len(args) > 1 else 50000)
+    _skip_rows = kwargs.get("skip_rows", args[2] if len(args) > 2 else 0)
+    _max_rows = kwargs.get("max_rows")
+    _block_size = kwargs.get("block_size", 8 * 1024 * 1024)
+
+    _loads = self._get_json_loads()
+
+    def _decode(lines):
+      return [_loads(_line) for _line in lines if _line and not _line.isspace()]
+
+    _remaining = float("inf") if _max_rows is None else _max_rows
+    _lines, _rest = [], b""
+    with self._open_file(_file_path, "rb") as _fh:
+      while _remaining > 0:
+        _data = _fh.read(_block_size)
+        if _data:
+          _block = (_rest + _data).split(b"\n")
+          _rest = _block.pop()
+        else:
+          # Last line without newline
+          _block, _rest = [_rest] if _rest else [], b""
+
+        if _skip_rows:
+          _skipped = min(_skip_rows, len(_block))
+          _block, _skip_rows = _block[_skipped:], _skip_rows - _skipped
+
+        _lines.extend(_block[:_remaining] if _remaining < len(_block) else _block)
+        _remaining -= len(_block)
+
+        while len(_lines) >= _batch_size:
+          _records = _decode(_lines[:_batch_size])
+          del _lines[:_batch_size]
+          if _records:
+            yield _records
+
+        if not _data:
+          break
+
+    _records = _decode(_lines) if _lines else None
+    if _records:
+      yield _records
+
+  iter_jsonl = _iter_jsonl_batches
+  parse_jsonl_batches = _iter_jsonl_batches
+
   def parse_latex(self, *args, **kwargs):
     _text = args[0] if len(args) > 0 else kwargs.get("text")
     try:
@@ -531,7 +1123,7 @@ class FileSystemUtility(DatabaseUtility):
       @params
       0|source (str|path): File path
       1|default (any): default value to return if file not found
-      2|flag_compressed (boolean): If file is gz compressed (other compressions are not implemented)
+      2|flag_compressed (boolean): Deprecated, codec (none, gzip, bz2, xz, lz4, zstd) is detected from magic bytes
 
       @return
       None: if some error occurs
@@ -539,17 +1131,18 @@ class FileSystemUtility(DatabaseUtility):
     """
     _source = args[0] if len(args) > 0 else kwargs.get("source")
     _default = args[1] if len(args) > 1 else kwargs.get("default", None)
-    _flag_compressed = args[2] if len(args) > 2 else kwargs.get("flag_compressed", True)
 
     _source = EntityPath(_source)
 
     if _source.exists() and self.require('pickle', "PICKLE"):
-      if _flag_compressed and self.require("gzip", "GZip"):
-        with self.GZip.open(str(_source.resolve()), 'rb') as _fh:
+      self.require("io", "IO")
+      _source = str(_source.resolve())
+      with self._open_codec(_source, "rb", self._guess_codec(_source)) as _fc, self.IO.BufferedReader(_fc, 1024 * 1024) as _fh:
+        if _fh.peek(len(self._pickle_oob_magic))[:len(self._pickle_oob_magic)] == self._pickle_oob_magic:
+          _fh.read(len(self._pickle_oob_magic))
+          _default = self._load_pickle_oob(_fh)
+        else:
           _default = self.PICKLE.load(_fh)
-      else:
-        with open(str(_source.resolve()), 'rb+') as _fp:
-          _default = self.PICKLE.load(_fp)
     else:
       self.log_error(f"Either path {_source} doesn't exists or required module or pickle path is not found!")
 
@@ -593,32 +1186,212 @@ class FileSystemUtility(DatabaseUtility):
     """
     return self.read_text(*args, **kwargs)
 
-  def read_text(self, *args, **kwargs):
+  _codec_magic = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "lzma",
+    b"\x04\x22\x4d\x18": "lz4",
+    b"\x28\xb5\x2f\xfd": "zstd",
+  }
+
+  _codec_ext = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+    ".lz4": "lz4",
+    ".zst": "zstd",
+  }
+
+  _codec_alias = {
+    "gzip": ("gzip", "GZip"),
+    "bz2": ("bz2", "BZ2"),
+    "lzma": ("lzma", "LZMA"),
+    "lz4": ("lz4.frame", "LZ4Frame"), # Optional
+    "zstd": ("zstandard", "ZStd"), # Optional
+  }
+
+  _codec_names = {
+    "gz": "gzip",
+    "xz": "lzma",
+    "zst": "zstd",
+    "zstandard": "zstd",
+    "none": None,
+  }
+
+  def _parse_codec(self, *args, **kwargs):
+    """Parses codec specification like gzip, gzip-1, xz-6, zstd-3, none into (codec, level)
+
+    :param codec|0:
+    :param level|1: Default level if not in the specification
+    """
+    _codec = kwargs.get("codec", args[0] if len(args) > 0 else None)
+    _level = kwargs.get("level", args[1] if len(args) > 1 else None)
+
+    if _codec is None or _codec is False:
+      return None, None
+
+    _codec = str(_codec).lower()
+    if "-" in _codec:
+      _codec, _level = _codec.rsplit("-", 1)
+      _level = int(_level)
+
+    _codec = self._codec_names.get(_codec, _codec)
+    if _codec is not None and _codec not in self._codec_alias:
+      raise ValueError(f"Unknown codec {_codec}, expected one of none, {', '.join(self._codec_alias)}.")
+
+    return _codec, _level
+
+  def _guess_codec(self, *args, **kwargs):
+    """Guesses compression (gzip|bz2|lzma|lz4|zstd|None) of a file
+
+    :param path|0:
+    :param mode|1: Magic bytes are checked for existing files in read mode, extension otherwise
+    """
+    _path = kwargs.get("path", args[0] if len(args) > 0 else None)
+    _mode = kwargs.get("mode", args[1] if len(args) > 1 else "r")
+
+    if "r" in _mode and self.OS.path.isfile(_path):
+      with open(_path, "rb") as _fh:
+        _magic = _fh.read(6)
+      return next((_codec for _m, _codec in self._codec_magic.items() if _magic.startswith(_m)), None)
+
+    return self._codec_ext.get(self.OS.path.splitext(str(_path))[1].lower())
+
+  def _open_codec(self, *args, **kwargs):
+    """Opens file with the given codec
+
+    :param path|0:
+    :param mode|1: Binary or text mode
+    :param codec|2: None|gzip|bz2|lzma|lz4|zstd
+    :param level|3: Compression level (codec default if None)
+    :param encoding|4:
+    """
+    _path = kwargs.pop("path", args[0] if len(args) > 0 else None)
+    _mode = kwargs.pop("mode", args[1] if len(args) > 1 else "rb")
+    _codec = kwargs.pop("codec", args[2] if len(args) > 2 else None)
+    _level = kwargs.pop("level", args[3] if len(args) > 3 else None)
+    _encoding = kwargs.pop("encoding", args[4] if len(args) > 4 else None)
+
+    if _codec is None:
+      return open(_path, _mode.replace("t", ""), encoding=_encoding, **kwargs)
+
+    _module, _alias = self._codec_alias[_codec]
+    if not self.require(_module, _alias):
+      raise ImportError(f"{_module} is required to open {_codec} compressed files.")
+
+    _handler = getattr(self, _alias)
+    _is_write = any(_m in _mode for _m in "wax")
+
+    if _is_write and _level is not None:
+      if _codec in ("gzip", "bz2"):
+        kwargs["compresslevel"] = _level
+      elif _codec == "lzma":
+        kwargs["preset"] = _level
+      elif _codec == "lz4":
+        kwargs["compression_level"] = _level
+      elif _codec == "zstd":
+        kwargs["cctx"] = _handler.ZstdCompressor(level=_level)
+
+    return _handler.open(_path, _mode, encoding=_encoding, **kwargs)
+
+  def _open_file(self, *args, **kwargs):
+    """Opens plain or compressed (.gz, .bz2, .xz, .lz4, .zst) files through one method
+
+    Codec is detected using magic bytes for reading and file extension for writing.
+
+    :param path|0:
+    :param mode|1: Default rt
+    :param encoding|2: Default UTF8 for text modes
+    :param codec: Overrides detected codec (e.g., none, gzip, xz-6)
+    :param level: Compression level for writing
+    """
+    _path = kwargs.pop("path", args[0] if len(args) > 0 else None)
+    _mode = kwargs.pop("mode", args[1] if len(args) > 1 else "rt")
+    _encoding = kwargs.pop("encoding", args[2] if len(args) > 2 else "UTF8")
+    _level = kwargs.pop("level", None)
+
+    if "b" in _mode:
+      _encoding = None
+    elif "t" not in _mode:
+      _mode = f"{_mode}t"
+
+    if "codec" in kwargs:
+      _codec, _level = self._parse_codec(kwargs.pop("codec"), _level)
+    else:
+      _codec = self._guess_codec(_path, _mode)
+
+    return self._open_codec(_path, _mode, _codec, _level, _encoding, **kwargs)
+
+  open_file = _open_file
+
+  def _iter_text_lines(self, *args, **kwargs):
+    """Generator of lines from plain or compressed text file
+
+    :param file_path|0:
+    :param callback|1: Applied on every line
+    :param flag_mmap|2: Reads uncompressed file through mmap (No newline translation)
+    :param encoding|3:
     """
+    _file_path = kwargs.get("file_path", args[0] if len(args) > 0 else None)
+    _callback = kwargs.get("callback", args[1] if len(args) > 1 else None)
+    _flag_mmap = kwargs.get("flag_mmap", args[2] if len(args) > 2 else False)
+    _encoding = kwargs.get("encoding", args[3] if len(args) > 3 else "UTF8")
+
+    if _flag_mmap and self._guess_codec(_file_path) is None:
+      if self.OS.path.getsize(_file_path) == 0:
+        return
+
+      self.require("mmap", "MMap")
+      with open(_file_path, "rb") as _fh, self.MMap.mmap(_fh.fileno(), 0, access=self.MMap.ACCESS_READ) as _mm:
+        for _line in iter(_mm.readline, b""):
+          _line = _line.decode(_encoding)
+          yield _callback(_line) if _callback else _line
+    else:
+      with self._open_file(_file_path, "rt", _encoding) as _fh:
+        for _line in _fh:
+          yield _callback(_line) if _callback else _line
+
+  def read_text(self, *args, **kwargs):
+    """Reads plain or compressed (.gz, .bz2, .xz) text file
+
+    :param file_path|0:
+    :param return_type|1: list (default), tuple, set or str
+    :param callback|2: Applied on the content (default strip), on every line with flag_lazy
+    :param flag_lazy: Returns generator of lines, memory grows with line length instead of file size
+    :param flag_mmap: Reads uncompressed files through mmap in lazy mode
+    :param encoding: Default UTF8
+
     @ToDo
-      * implement yield|generator to handle larger files
-      * check if file extension is gz, try reading it as gz
       * `str.splitlines(keepends=False)`
     """
 
     _file_path = args[0] if len(args) > 0 else kwargs.get("file_path")
     _return_type = args[1] if len(args) > 1 else kwargs.get("return_type", list) # tuple, set
-    _callback = args[2] if len(args) > 2 else kwargs.get("callback", self.strip) # "".join
+    _callback = args[2] if len(args) > 2 else kwargs.get("callback", getattr(self, "strip", None)) # "".join
+    _flag_lazy = kwargs.get("flag_lazy", False)
+    _flag_mmap = kwargs.get("flag_mmap", False)
+    _encoding = kwargs.get("encoding", "UTF8")
     _content = None
 
     if self.OS.path.isdir(_file_path):
       self.log_error(f"{_file_path} is a directory not a file.")
       return None
 
-    if self.ext(_file_path) == "gz":
-      _content = self.read_gz_file(_file_path, None, row_size=None)
-    else:
-      with open(_file_path, 'r', encoding='UTF8') as _fh:
+    if _flag_lazy:
+      return self._iter_text_lines(_file_path, _callback, _flag_mmap, _encoding)
+
+    _is_str = isinstance(_return_type, (str)) or _return_type == str
+    with self._open_file(_file_path, "rt", _encoding) as _fh:
+      if _is_str:
+        _content = _fh.read()
+      elif _callback is not None and _callback is getattr(self, "strip", None):
+        # Strip while reading instead of copying the list of lines again
+        _content = [_line.strip() for _line in _fh]
+        _callback = None
+      else:
         _content = _fh.readlines()
 
-    if not isinstance(_content, (str)) and (isinstance(_return_type, (str)) or _return_type == str):
-      _content = "".join(_content)
-    else:
+    if not _is_str and _return_type is not list:
       _content = _return_type(_content)
 
     if _callback is not None:
@@ -630,17 +1403,119 @@ class FileSystemUtility(DatabaseUtility):
   text = read_text
   from_text = read_text
 
+  _json_modules = ("orjson", "ujson", "json")
+
+  def _get_json_loads(self):
+    """Fastest available JSON parser (orjson > ujson > json), loads accepts bytes or str"""
+    if getattr(self, "_json_loads", None) is None:
+      for _module in self._json_modules:
+        try:
+          self._json_loads = __import__(_module).loads
+          break
+        except ImportError:
+          continue
+
+    return self._json_loads
+
+  def _iter_json_array(self, *args, **kwargs):
+    """Yields the elements of a top level JSON array one at a time without loading the whole document
+
+    Elements are decoded by the C scanner of the json module (JSONDecoder.raw_decode) on a sliding text buffer,
+    so the memory is bounded by chunk_size and the largest element. Compressed files (.gz, .bz2, .xz...) are supported.
+    A top level object (or any other value) is yielded as a single element.
+
+    :param file_path|0:
+    :param chunk_size|1: Characters read at a time (Default 4MiB)
+    :param encoding|2: Default UTF8
+    """
+    _file_path = kwargs.get("file_path", args[0] if len(args) > 0 else None)
+    _chunk_size = kwargs.get("chunk_size", args[1] if len(args) > 1 else 4 * 1024 * 1024)
+    _encoding = kwargs.get("encoding", args[2] if len(args) > 2 else "UTF8")
+
+    self.require("re", "RegEx")
+    _skip = self.RegEx.compile(r"[\s,]*").match
+    _skip_space = self.RegEx.compile(r"\s*").match
+    _decode = self.JSON.JSONDecoder().raw_decode
+
+    with self._open_file(_file_path, "rt", _encoding) as _fh:
+      _buffer, _eof = _fh.read(_chunk_size), False
+      while _buffer and not _buffer.strip("\ufeff \t\r\n"):
+        _buffer = _fh.read(_chunk_size)
+      _buffer = _buffer[1:] if _buffer.startswith("\ufeff") else _buffer
+      _pos = len(_buffer) - len(_buffer.lstrip())
+
+      if not _buffer[_pos:_pos + 1] == "[":
+        # Not an array, parsed as one document
+        _buffer = _buffer[_pos:] + _fh.read()
+        if _buffer.strip():
+          yield self._get_json_loads()(_buffer)
+        return
+
+      _pos += 1
+      _read_size = _chunk_size
+      while True:
+        _pos = _skip(_buffer, _pos).end()
+        if _pos < len(_buffer) and _buffer[_pos] == "]":
+          return
+
+        _value, _end, _next = None, -1, -1
+        if _pos < len(_buffer):
+          try:
+            _value, _end = _decode(_buffer, _pos)
+            _next = _skip_space(_buffer, _end).end()
+          except self.JSON.JSONDecodeError:
+            if _eof:
+              raise
+
+        # Element is complete only when followed by a separator, e.g., "1.5e" of "1.5e10" decodes as 1.5
+        if _next >= 0 and _next < len(_buffer) and _buffer[_next] not in ",]":
+          if _eof:
+            raise self.JSON.JSONDecodeError("Expecting ',' delimiter", _buffer, _next)
+          _end = -1
+
+        if _end < 0 or (_next == len(_buffer) and not _eof):
+          if _eof:
+            raise self.JSON.JSONDecodeError("Unterminated array", _buffer, _pos)
+          _data = _fh.read(_read_size)
+          _eof = not _data
+          # Larger reads for elements bigger than the buffer
+          _read_size = _read_size * 2 if _pos == 0 else _chunk_size
+          _buffer, _pos = _buffer[_pos:] + _data, 0
+          continue
+
+        yield _value
+        _pos = _end
+
+  iter_json = _iter_json_array
+  iter_json_array = _iter_json_array
+
   def read_json(self, *args, **kwargs):
+    """Reads a JSON file using the fastest available parser (orjson, ujson or json), falls back to ast.literal_eval
+
+    :param file_path|0:
+    :param flag_lazy: Returns a generator over the elements of the top level array (see iter_json)
+    :param chunk_size: Read size for flag_lazy
+    """
     _file_path = args[0] if len(args) > 0 else kwargs.get("file_path")
+    _flag_lazy = kwargs.get("flag_lazy", False)
     _res_dict = {}
 
     if self.check_path(_file_path):
-      _content = self.read_text(_file_path, str)
-      self.require("ast", "AbsSynTree")
+      if _flag_lazy:
+        return self._iter_json_array(_file_path, **{_k: kwargs[_k] for _k in ("chunk_size", "encoding") if _k in kwargs})
+
+      with self._open_file(_file_path, "rb") as _fh:
+        _content = _fh.read()
+
       try:
-        _res_dict = self.JSON.loads(_content)
+        _res_dict = self._get_json_loads()(_content)
       except:
-        _res_dict = self.AbsSynTree.literal_eval(_content)
+        _content = _content.decode(kwargs.get("encoding", "UTF8"))
+        try:
+          _res_dict = self.JSON.loads(_content)
+        except:
+          self.require("ast", "AbsSynTree")
+          _res_dict = self.AbsSynTree.literal_eval(_content)
 
     return _res_dict
 
@@ -648,6 +1523,35 @@ class FileSystemUtility(DatabaseUtility):
   from_json = read_json
   from_JSON = read_json
 
+  def get_writer(self, *args, **kwargs):
+    """Buffered writer session to write many times without reopening the file
+
+    :param destination|0:
+    :param append|1: Default False
+    :param encoding|2: Default utf-8
+    :param flag_atomic|3: Writes to temporary file in the same directory and replaces destination on close
+    :param buffer_size: Bytes to collect before a (vectored) write, default 1MiB
+
+    @example
+    with self.get_writer("out.tsv", flag_atomic=True) as _fw:
+      _fw.write("a\tb\n")
+      _fw.write_lines(_lines)
+    """
+    _destination = kwargs.get("destination", args[0] if len(args) > 0 else None)
+    _append = kwargs.get("append", args[1] if len(args) > 1 else False)
+    _encoding = kwargs.get("encoding", args[2] if len(args) > 2 else "utf-8")
+    _flag_atomic = kwargs.get("flag_atomic", args[3] if len(args) > 3 else False)
+    _buffer_size = kwargs.get("buffer_size", 1024 * 1024)
+
+    if self.OS.path.isdir(_destination):
+      raise Exception(f"{_destination} already exists as a directory. Cannot write as a file.")
+
+    self.log_debug(f"FILE_06: Opening writer for {_destination}.")
+    return FileWriter(_destination, append=_append, encoding=_encoding, flag_atomic=_flag_atomic, buffer_size=_buffer_size)
+
+  writer = get_writer
+  open_writer = get_writer
+
   def write(self, *args, **kwargs):
     """
       @params
@@ -657,9 +1561,13 @@ class FileSystemUtility(DatabaseUtility):
         3|encoding
         4|mode
         5|position: Write position by moving cursor
+        flag_atomic: Readers never see partially written file (ignores position)
 
       @return
         check_path(destination)
+
+      @note
+        Use get_writer for many small writes to the same file
     """
     _destination = args[0] if len(args) > 0 else kwargs.get("destination")
     _content = args[1] if len(args) > 1 else kwargs.get("content", "")
@@ -667,6 +1575,7 @@ class FileSystemUtility(DatabaseUtility):
     _encoding = args[3] if len(args) > 3 else kwargs.get("encoding", "utf-8")
     _mode = args[4] if len(args) > 4 else kwargs.get("mode", "w+")
     _position = args[5] if len(args) > 5 else kwargs.get("position", 0)
+    _flag_atomic = kwargs.get("flag_atomic", False)
 
     if _append is True:
       # Change any mode to a
@@ -676,14 +1585,27 @@ class FileSystemUtility(DatabaseUtility):
     if self.OS.path.isdir(_destination):
       raise Exception(f"{_destination} already exists as a directory. Cannot write as a file.")
 
-    _parent_path = self.validate_dir(self.OS.path.dirname(_destination))
-    _file_name = self.filename(_destination, True)
-    self.log_info(f"Writing {_file_name} to {_parent_path}.")
+    _parent_path = self.OS.path.dirname(_destination)
+    if _parent_path and not self.OS.path.isdir(_parent_path):
+      _parent_path = self.validate_dir(_parent_path)
+
+    self.log_debug(f"FILE_07: Writing {_destination}.")
 
     if isinstance(_content, (bytes, bytearray)):
       _encoding = None
       _mode = "wb" if "b" not in _mode else _mode
 
+    if _flag_atomic or isinstance(_content, (list, tuple, set)):
+      # Lists are written as a vectored write without joining them in memory
+      with FileWriter(_destination, append=_mode.startswith("a"), encoding=_encoding or "utf-8", flag_atomic=_flag_atomic) as _fw:
+        if isinstance(_content, (bytes, bytearray, str)):
+          _fw.write(_content)
+        elif isinstance(_content, (list, tuple, set)):
+          _fw.write_lines(_content, flag_last_newline=False)
+
+      StatCache.discard(_destination)
+      return self.check_path(_destination)
+
     _write_args = {
       "encoding": _encoding
     }
@@ -694,11 +1616,12 @@ class FileSystemUtility(DatabaseUtility):
 
       if isinstance(_content, (bytes, bytearray, str)):
         _fh.write(_content)
-      elif isinstance(_content, (list, tuple, set)):
-        _fh.write("\n".join(_content))
 
+    StatCache.discard(_destination)
     return self.check_path(_destination)
 
+  _pickle_oob_magic = b"ULPKLOOB"
+
   def write_pickle(self, *args, **kwargs):
     """
       @function
@@ -707,6 +1630,11 @@ class FileSystemUtility(DatabaseUtility):
       @params
       0|destination (str|path)
       1|content (any): Python object for pickling
+      2|codec (str): none, gzip (default), gzip-1..9, bz2, xz, lz4, zstd (lz4/zstd if installed)
+      3|protocol (int): Pickle protocol, default pickle.DEFAULT_PROTOCOL
+      flag_out_of_band (bool): With protocol 5, large buffers (NumPy/pandas) are written raw after the pickle stream without in-band copies (default False),
+        the file can only be read with read_pickle
+      level (int): Compression level if not given in codec (default 9 for gzip)
 
       @returns
       True|False if file path exists
@@ -714,22 +1642,73 @@ class FileSystemUtility(DatabaseUtility):
       @update
         Uses GZip for compression
         File extension pkl.gz used against df.gz|pd.gz pickled files
+        Codec is detected by read_pickle using magic bytes
     """
 
     _destination = kwargs.get("destination", args[0] if len(args) > 0 else None)
     _content = kwargs.get("content", args[1] if len(args) > 1 else None)
+    _codec = kwargs.get("codec", args[2] if len(args) > 2 else "gzip")
+    _protocol = kwargs.get("protocol", args[3] if len(args) > 3 else None)
+    _flag_out_of_band = kwargs.get("flag_out_of_band", False)
+    _level = kwargs.get("level", None)
 
     self.require('pickle', "PICKLE", "pickle")
-    self.require("gzip", "GZip")
+
+    _codec, _level = self._parse_codec(_codec, _level)
+    if _codec == "gzip" and _level is None:
+      _level = 9
+
+    _protocol = self.PICKLE.DEFAULT_PROTOCOL if _protocol is None else _protocol
+    if _protocol < 0:
+      _protocol = self.PICKLE.HIGHEST_PROTOCOL
 
     try:
-      with self.GZip.open(_destination,'wb') as _fh:
-        self.PICKLE.dump(_content, _fh)
+      with self._open_codec(_destination, "wb", _codec, _level) as _fh:
+        if _protocol >= 5 and _flag_out_of_band:
+          self._dump_pickle_oob(_content, _fh, _protocol)
+        else:
+          self.PICKLE.dump(_content, _fh, protocol=_protocol)
     except Exception as _e:
       self.log_error(f"Error: {_e}")
 
     return self.exists(_destination)
 
+  def _dump_pickle_oob(self, content, fh, protocol=5):
+    """Writes magic, number of buffers, pickle stream and raw buffers
+
+    Layout: magic | Q num_buffers | Q pickle_size | pickle | (Q buffer_size | buffer)*
+    """
+    self.require("struct", "Struct")
+    _buffers = []
+    _pickled = self.PICKLE.dumps(content, protocol=protocol, buffer_callback=_buffers.append)
+
+    fh.write(self._pickle_oob_magic)
+    fh.write(self.Struct.pack("<QQ", len(_buffers), len(_pickled)))
+    fh.write(_pickled)
+    for _buffer in _buffers:
+      _raw = _buffer.raw()
+      fh.write(self.Struct.pack("<Q", _raw.nbytes))
+      fh.write(_raw)
+
+  def _load_pickle_oob(self, fh):
+    """Reads file written by _dump_pickle_oob (after the magic)"""
+    self.require("struct", "Struct")
+    _num_buffers, _size = self.Struct.unpack("<QQ", fh.read(16))
+    _pickled = fh.read(_size)
+
+    _buffers = []
+    for _ in range(_num_buffers):
+      _buffer = bytearray(self.Struct.unpack("<Q", fh.read(8))[0])
+      _view, _pos = memoryview(_buffer), 0
+      while _pos < len(_buffer):
+        _read = fh.readinto(_view[_pos:])
+        if not _read:
+          raise EOFError("Pickle buffer ended unexpectedly.")
+        _pos += _read
+      _buffers.append(_buffer)
+
+    return self.PICKLE.loads(_pickled, buffers=_buffers)
+
   save_pickle = write_pickle
   pickle = write_pickle
   to_pickle = write_pickle
@@ -792,31 +1771,217 @@ class FileSystemUtility(DatabaseUtility):
   conv_xml_to_dict = xml_to_dict
   convert_xml_to_dict = xml_to_dict
 
+  def _columnar_to_csv(self, destination, data, columns, codec, level, delimiter):
+    """Vectorized writers for DataFrames, pyarrow tables and dict of columns, compression by open_codec"""
+    if type(data).__module__.startswith("pyarrow"):
+      if not self.require("pyarrow.csv", "PACSV"):
+        return False
+      if columns:
+        data = data.select(list(columns))
+      with self._open_codec(str(destination), "wb", codec, level) as _ofh:
+        self.PACSV.write_csv(data, _ofh, self.PACSV.WriteOptions(delimiter=delimiter))
+      return True
+
+    if not self.require("pandas", "PD"):
+      return False
+
+    if isinstance(data, dict):
+      data = self.PD.DataFrame(data, copy=False)
+
+    with self._open_codec(str(destination), "wt", codec, level, "utf8", newline="") as _ofh:
+      data.to_csv(_ofh, sep=delimiter, columns=columns, index=False, chunksize=100000)
+    return True
+
   def dict_to_csv(self, *args, **kwargs):
+    """Writes dicts (list, generator or any iterable) as CSV in batches without materializing the rows
+
+    Columnar data (pandas.DataFrame, pyarrow.Table, or dict of equal length lists/arrays) is written with
+    the vectorized pandas/pyarrow writers.
+
+    @example
+    UL.dict_to_csv("out.csv.gz", ({"id": _i, "name": _n} for _i, _n in _pairs), ["id", "name"], missing="raise")
+
+    :param destination|0: Path (.gz, .bz2, .xz, .zst are compressed, see open_file)
+    :param data|1: Iterable of dicts or columnar data
+    :param columns|2: Column order (Default: keys of the first dict)
+    :param missing: fill (Default)|raise for the missing keys
+    :param fill_value: Value for the missing keys (Default "")
+    :param extra: raise (Default)|ignore for keys not in columns
+    :param codec: Overrides the codec guessed from the extension (e.g., gzip-6)
+    :param delimiter: Default ,
+    :param batch_size: Rows per write (Default 10000)
+
+    :return: True if the destination exists
+    """
     _destination = args[0] if len(args) > 0 else kwargs.get("destination")
     _data = args[1] if len(args) > 1 else kwargs.get("data")
+    _columns = kwargs.get("columns", args[2] if len(args) > 2 else None)
+    _missing = kwargs.get("missing", "fill")
+    _fill_value = kwargs.get("fill_value", "")
+    _extra = kwargs.get("extra", "raise")
+    _delimiter = kwargs.get("delimiter", ",")
+    _batch_size = kwargs.get("batch_size", 10000)
+
+    if "codec" in kwargs:
+      _codec, _level = self._parse_codec(kwargs.get("codec"), kwargs.get("level"))
+    else:
+      _codec, _level = self._guess_codec(_destination, "wt"), kwargs.get("level")
+
+    if _data is None:
+      return False
+
+    _is_columnar = isinstance(_data, dict) or hasattr(_data, "to_csv") or type(_data).__module__.startswith("pyarrow")
+    if _is_columnar:
+      return self._columnar_to_csv(_destination, _data, _columns, _codec, _level, _delimiter) and self.check_path(_destination)
+
+    _data = iter(_data)
+    _first = next(_data, None)
+    if not isinstance(_first, dict):
+      return False
+
+    _columns = list(_columns or _first.keys())
+    _column_set = set(_columns)
+    _num_columns = len(_columns)
+    self.require("operator", "Operator")
+    _get_row = self.Operator.itemgetter(*_columns)
+    if _num_columns == 1:
+      _get_row = lambda _record, _get=_get_row: (_get(_record),)
+
+    def _to_row(record):
+      if len(record) == _num_columns:
+        # Same keys as columns in the common case
+        try:
+          return _get_row(record)
+        except KeyError:
+          pass
+
+      if _extra == "raise":
+        _keys = [_k for _k in record if _k not in _column_set]
+        if _keys:
+          raise ValueError(f"dict contains fields not in columns: {_keys}")
+
+      if _missing == "raise":
+        _keys = [_c for _c in _columns if _c not in record]
+        if _keys:
+          raise KeyError(f"dict does not contain the columns: {_keys}")
+
+      return [record.get(_c, _fill_value) for _c in _columns]
+
+    self.require("csv", "CSV")
+    self.require("itertools", "IterTools")
+    _records = self.IterTools.chain((_first,), _data)
+    with self._open_codec(str(_destination), "wt", _codec, _level, "utf8", newline="") as _ofh:
+      _writer = self.CSV.writer(_ofh, delimiter=_delimiter)
+      _writer.writerow(_columns)
+      while True:
+        _batch = [_to_row(_record) for _record in self.IterTools.islice(_records, _batch_size)]
+        if not _batch:
+          break
+        _writer.writerows(_batch)
 
-    if isinstance(_data, list) and isinstance(_data[0], dict):
-      _keys = _data[0].keys()
-      self.require("csv", "CSV")
-      with open(_destination, 'w+', newline='', encoding="utf8") as _ofh:
-        _dict_writer = self.CSV.DictWriter(_ofh, _keys)
-        _dict_writer.writeheader()
-        _dict_writer.writerows(_data)
     return self.check_path(_destination)
 
   def move(self, *args, **kwargs):
-    """Copies source and deletes using .delete_path
+    """Moves source to destination
+
+    Renames (os.replace) when source and destination are on the same device,
+    otherwise copies (see copy) and deletes the source using .delete_path
+
+    @params
+    0|source: File or directory
+    1|destination: Target path (not the parent directory)
+    flag_rename_only: Returns False instead of copying when rename is not possible
+
+    @returns
+    True if source does not exist anymore
     """
     _source = args[0] if len(args) > 0 else kwargs.get("source")
-    # _destination = args[1] if len(args) > 1 else kwargs.get("destination")
+    _destination = args[1] if len(args) > 1 else kwargs.get("destination")
+    _flag_rename_only = kwargs.pop("flag_rename_only", False)
+
+    if not all([_source, _destination]):
+      self.log_debug("FILE_01: Source or Destination is not specified.")
+      return False
+
+    _source, _destination = str(_source), str(_destination)
+    _parent = self.OS.path.dirname(self.OS.path.abspath(_destination))
+    if not self.OS.path.isdir(_parent):
+      self.OS.makedirs(_parent, exist_ok=True)
+
+    try:
+      _is_same_device = self.OS.stat(_source).st_dev == self.OS.stat(_parent).st_dev
+    except OSError as _e:
+      self.log_debug(f"FILE_08: Cannot move {_source} ({_e}).")
+      return False
+
+    if _is_same_device:
+      try:
+        self.log_debug(f"FILE_08: Renaming {_source} to {_destination}.")
+        self.OS.replace(_source, _destination)
+        StatCache.discard(_source, _destination, flag_recursive=True)
+        return not self.check_path(_source)
+      except OSError as _e:
+        # e.g., EXDEV for bind mounts, non-empty destination directory
+        self.log_debug(f"FILE_08: Rename failed ({_e}), copying instead.")
+
+    if _flag_rename_only:
+      return False
+
     if self.copy(*args, **kwargs):
       return self.delete_path(_source)
     else:
       return False
 
+  _copy_block_size = 64 * 1024 * 1024
+
+  def _copy_file_data(self, *args, **kwargs):
+    """Copies file content in kernel space using os.copy_file_range (reflinks/server side copies where supported)
+    or os.sendfile, falls back to buffered copy
+
+    :param source|0:
+    :param destination|1:
+    :return: Number of bytes copied
+    """
+    _source = args[0] if len(args) > 0 else kwargs.get("source")
+    _destination = args[1] if len(args) > 1 else kwargs.get("destination")
+
+    self.require("errno", "ErrNo")
+    _unsupported = {self.ErrNo.EXDEV, self.ErrNo.ENOSYS, self.ErrNo.EINVAL, self.ErrNo.EOPNOTSUPP, self.ErrNo.EBADF, getattr(self.ErrNo, "ENOTSUP", None)}
+
+    _copied = 0
+    with open(_source, "rb") as _fh_src, open(_destination, "wb") as _fh_dst:
+      _fd_src, _fd_dst = _fh_src.fileno(), _fh_dst.fileno()
+
+      _methods = []
+      if hasattr(self.OS, "copy_file_range"):
+        _methods.append(lambda _offset: self.OS.copy_file_range(_fd_src, _fd_dst, self._copy_block_size, _offset, _offset))
+      if hasattr(self.OS, "sendfile") and self.OS.name != "nt":
+        _methods.append(lambda _offset: self.OS.sendfile(_fd_dst, _fd_src, _offset, self._copy_block_size))
+
+      for _method in _methods:
+        try:
+          while True:
+            _num = _method(_copied)
+            if not _num:
+              break
+            _copied += _num
+          if _copied:
+            return _copied
+          # Nothing at offset 0: empty file or a file system where the call copies nothing (procfs, some FUSE mounts)
+        except OSError as _e:
+          if _e.errno not in _unsupported or _copied:
+            raise
+
+      _fh_dst.seek(_copied)
+      _fh_src.seek(_copied)
+      while _block := _fh_src.read(1024 * 1024):
+        _fh_dst.write(_block)
+        _copied += len(_block)
+
+    return _copied
+
   def _copy_from_to(self, *args, **kwargs):
-    """Copy file from source to destination
+    """Copy file (or directory tree) from source to destination
     @params
     0|source: path or string
     1|destination: path or string
@@ -832,10 +1997,17 @@ class FileSystemUtility(DatabaseUtility):
       self.log_debug(f"FILE_01: Source or Destination is not specified.")
       return False
 
-    self.validate_dir(self.OS.path.dirname(_destination))
+    _parent = self.OS.path.dirname(str(_destination))
+    if _parent and not self.OS.path.isdir(_parent):
+      self.validate_dir(_parent)
 
     self.log_debug(f"FILE_02: Copying... {_source} to {_destination}.")
-    self.SHUTIL.copyfile(_source, _destination)
+    if self.OS.path.isdir(_source):
+      self.SHUTIL.copytree(_source, _destination, copy_function=lambda _s, _d: self._copy_file_data(_s, _d), dirs_exist_ok=True)
+    else:
+      self._copy_file_data(_source, _destination)
+
+    StatCache.discard(_destination, flag_recursive=True)
     return self.check_path(_destination)
 
   # Alias Added: 20240330
@@ -844,38 +2016,182 @@ class FileSystemUtility(DatabaseUtility):
   copy_to = _copy_from_to
   create_copy = _copy_from_to
 
+  def _get_copy_targets(self, *args, **kwargs):
+    """{source: target} for list of sources copied into destination directory (dict is returned as is)"""
+    _sources = kwargs.get("sources", args[0] if len(args) > 0 else None)
+    _destination = kwargs.get("destination", args[1] if len(args) > 1 else None)
+
+    if isinstance(_sources, (str, EntityPath)):
+      _sources = [_sources]
+
+    if isinstance(_sources, dict):
+      return _sources
+
+    return {_s: self.OS.path.join(str(_destination), self.OS.path.basename(str(_s).rstrip("/" + self.OS.sep))) for _s in _sources}
+
+  def _plan_copies(self, *args, **kwargs):
+    """Expands sources into (source_file, destination_file, size) tasks and creates destination directories
+
+    :param sources|0: list of files/directories (copied into destination) or dict {source: destination}
+    :param destination|1: Destination directory for list of sources
+    """
+    _sources = self._get_copy_targets(*args, **kwargs)
+    _tasks = []
+    for _source, _target in _sources.items():
+      _source, _target = str(_source), str(_target)
+      if self.OS.path.isdir(_source):
+        for _dir_path, _depth, _dirs, _files in DirWalker(_source, max_workers=1).walk():
+          _target_dir = self.OS.path.join(_target, self.OS.path.relpath(_dir_path, _source))
+          self.OS.makedirs(_target_dir, exist_ok=True)
+          _tasks.extend((_f.path, self.OS.path.join(_target_dir, _f.name), _f.stat().st_size) for _f in _files)
+      else:
+        self.OS.makedirs(self.OS.path.dirname(self.OS.path.abspath(_target)), exist_ok=True)
+        try:
+          _size = self.OS.path.getsize(_source)
+        except OSError:
+          # Missing source, the copy task reports the error
+          _size = 0
+        _tasks.append((_source, _target, _size))
+
+    return _sources, _tasks
+
+  def copy_many(self, *args, **kwargs):
+    """Copies files and directory trees in parallel with bounded concurrency
+
+    @params
+    0|sources: list of files/directories (copied into destination) or dict {source: destination}
+    1|destination: Destination directory for list of sources
+    2|max_workers: Number of files copied at the same time
+    flag_move: Moves sources (renames on the same device, otherwise copies and deletes the sources if all the copies succeed)
+    callback: Called with (copied_bytes, total_bytes) after every file
+
+    @returns
+    dict: files, bytes, seconds, bytes_per_sec, failed [(source, error)]
+    """
+    _sources = kwargs.get("sources", args[0] if len(args) > 0 else None)
+    _destination = kwargs.get("destination", args[1] if len(args) > 1 else None)
+    _max_workers = kwargs.get("max_workers", args[2] if len(args) > 2 else self._get_max_workers())
+    _flag_move = kwargs.get("flag_move", False)
+    _callback = kwargs.get("callback", None)
+
+    self.require("concurrent.futures", "ConcurrentFutures")
+    self.require("time", "TIME")
+
+    _start = self.TIME.perf_counter()
+    _stats = {"files": 0, "bytes": 0, "seconds": 0, "bytes_per_sec": 0, "failed": []}
+
+    if _flag_move:
+      _pending = {}
+      for _source, _target in self._get_copy_targets(_sources, _destination).items():
+        if not self.move(_source, _target, flag_rename_only=True):
+          _pending[_source] = _target
+        else:
+          _stats["files"] += 1
+      _sources = _pending
+
+    if _sources:
+      _sources, _tasks = self._plan_copies(_sources, _destination)
+      _total = sum(_t[2] for _t in _tasks)
+
+      with self.ConcurrentFutures.ThreadPoolExecutor(max_workers=max(1, _max_workers)) as _executor:
+        _futures = {_executor.submit(self._copy_file_data, _s, _d): _s for _s, _d, _ in _tasks}
+        for _future in self.ConcurrentFutures.as_completed(_futures):
+          try:
+            _stats["bytes"] += _future.result()
+            _stats["files"] += 1
+          except Exception as _e:
+            _stats["failed"].append((_futures[_future], _e))
+            self.log_error(f"Could not copy {_futures[_future]}: {_e}")
+
+          if _callback is not None:
+            _callback(_stats["bytes"], _total)
+
+      if _flag_move and not _stats["failed"]:
+        for _source in _sources:
+          self.delete_path(_source)
+
+    _stats["seconds"] = self.TIME.perf_counter() - _start
+    _stats["bytes_per_sec"] = _stats["bytes"] / _stats["seconds"] if _stats["seconds"] else 0
+    self.log_info(f"{'Moved' if _flag_move else 'Copied'} {_stats['files']} files, {_stats['bytes'] / 2**20:.1f} MiB at {_stats['bytes_per_sec'] / 2**20:.1f} MiB/s.")
+
+    return _stats
+
+  def move_many(self, *args, **kwargs):
+    """Moves files and directory trees, renames on the same device and copies in parallel otherwise
+
+    @extends copy_many
+    """
+    kwargs["flag_move"] = True
+    return self.copy_many(*args, **kwargs)
+
   def delete_path(self, *args, **kwargs):
     """Deletes a file or directory
 
       @params
       0|path (str): File path
-      1|flag_files_only (boolean): To keep directory structure but delete all the files
+      1|flag_files_only (boolean): Deletes files only, directories are skipped
+      2|flag_trash (boolean): Renames the path into a staging directory (.utl-trash in the parent) and deletes it
+        on a background thread, returns without waiting (see wait_trash)
+      flag_clear_tree (boolean): Deletes all the files of a directory tree but keeps the directory structure (default False)
+      max_workers (int): Threads to delete files of a directory tree
 
-      @ToDo:
-      Instead of deletion, move the entity to temporary directory to avoid any accidental loss of data
+      @returns
+      True if path does not exist anymore
     """
     _path = args[0] if len(args) > 0 else kwargs.get("path")
     _flag_files_only = args[1] if len(args) > 1 else kwargs.get("flag_files_only", False)
+    _flag_trash = args[2] if len(args) > 2 else kwargs.get("flag_trash", False)
+    _flag_clear_tree = kwargs.get("flag_clear_tree", False)
+    _max_workers = kwargs.get("max_workers", self._get_max_workers())
 
-    if _path is None or not self.check_path(_path):
+    if _path is None or not self.OS.path.lexists(_path):
       return True
 
-    if self.OS.path.isfile(_path):
-      self.OS.remove(_path)
+    _is_dir = self.OS.path.isdir(_path) and not self.OS.path.islink(_path)
+    if _flag_files_only and _is_dir and not _flag_clear_tree:
+      return False
+
+    StatCache.discard(_path, flag_recursive=True)
+    if _flag_clear_tree and _is_dir:
+      Trash.remove_tree(_path, _max_workers, flag_files_only=True)
+      return True
+
+    if _flag_trash:
+      try:
+        Trash.get().put(_path)
+        return True
+      except OSError as _e:
+        self.log_debug(f"FILE_09: Could not move {_path} to trash ({_e}), deleting.")
 
-    elif self.OS.path.isdir(_path) and not _flag_files_only:
-      self.SHUTIL.rmtree(_path)
+    if _is_dir:
+      Trash.remove_tree(_path, _max_workers)
+    else:
+      self.OS.remove(_path)
 
-    return not self.check_path(_path)
+    return not self.OS.path.lexists(_path)
 
   # Alias Added: 20240330
   delete_file = delete_path
 
   def delete_files(self, *args, **kwargs):
-    """Deletes multiple files or paths"""
+    """Deletes multiple files or paths in parallel
+
+      @params
+      0|paths: List of paths
+      1|flag_files_only (boolean): Skips directories (default True)
+      2|flag_trash (boolean): See delete_path
+      flag_clear_tree (boolean): See delete_path
+      max_workers (int): Number of paths deleted at the same time
+
+      @returns
+      list of delete_path results in the order of paths
+    """
 
     _paths = args[0] if len(args) > 0 else kwargs.get("paths")
-    _deleted_files = []
+    _flag_files_only = args[1] if len(args) > 1 else kwargs.get("flag_files_only", True)
+    _flag_trash = args[2] if len(args) > 2 else kwargs.get("flag_trash", False)
+    _flag_clear_tree = kwargs.get("flag_clear_tree", False)
+    _max_workers = kwargs.get("max_workers", self._get_max_workers())
 
     if isinstance(_paths, (str)) and self.exists(_paths):
       _paths = [_paths]
@@ -883,11 +2199,48 @@ class FileSystemUtility(DatabaseUtility):
     if not isinstance(_paths, (list, tuple, set, dict)):
       return True
 
-    for _path in _paths:
-      _deleted_files.append(self.delete_path(_path, True))
+    self.require("concurrent.futures", "ConcurrentFutures")
+    with self.ConcurrentFutures.ThreadPoolExecutor(max_workers=max(1, _max_workers)) as _executor:
+      _deleted_files = list(_executor.map(lambda _p: self.delete_path(_p, _flag_files_only, _flag_trash, flag_clear_tree=_flag_clear_tree, max_workers=1), _paths))
 
     return _deleted_files
 
+  def find_duplicates(self, *args, **kwargs):
+    """Finds files with identical content (size, partial hash, then full hash) and optionally hardlinks or deletes them
+
+      @params
+      0|paths: Files/directories
+      1|action: None|hardlink|delete
+      keep: oldest (default)|newest|shortest|callable
+      max_workers, cache, min_size, flag_dry_run: See EntityPath.find_duplicates
+
+      @returns
+      [[EntityPath]] groups with the kept file first, [(action, kept, duplicate, size)] with action
+    """
+    _paths = args[0] if len(args) > 0 else kwargs.pop("paths", None)
+    _action = args[1] if len(args) > 1 else kwargs.pop("action", None)
+
+    if isinstance(_paths, (str, EntityPath)):
+      _paths = [_paths]
+
+    if not _paths:
+      return []
+
+    _paths = list(_paths)
+    return EntityPath(_paths[0]).find_duplicates(_paths[1:], _action, **kwargs)
+
+  find_duplicate_files = find_duplicates
+
+  def wait_trash(self, *args, **kwargs):
+    """Waits until the paths deleted with flag_trash are purged
+
+      @returns
+      True if there were no errors while purging
+    """
+    return Trash.get().wait()
+
+  purge_trash = wait_trash
+
   def get_file_content(self, *args, **kwargs):
     """@extends get_file
 
@@ -970,6 +2323,8 @@ class FileSystemUtility(DatabaseUtility):
       :param form_values|4: (None|dict)= values to be submitted while downloading file from url USING GET METHOD
       :param headers|5: headers to set for downloading files
       :param method|6: ("get"|"post")= method of downloading file
+      :param flag_resume: (True|bool)= resumes partial download (<destination>.part) using HTTP Range
+      :param http_client: (None|HTTPClient)= client to use instead of http_client
 
       @returns
       :return: bool
@@ -987,9 +2342,8 @@ class FileSystemUtility(DatabaseUtility):
     _form_values = kwargs.get("form_values", args[4] if len(args) > 4 else None)
     _headers = kwargs.get("headers", args[5] if len(args) > 5 else {})
     _method = kwargs.get("method", args[6] if len(args) > 6 else "get")
-
-    _default_headers = {'User-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'}
-    _default_headers.update(_headers)
+    _flag_resume = kwargs.get("flag_resume", True)
+    _http_client = kwargs.get("http_client") or self.http_client
 
     if not _overwrite and self.check_path(_destination):
       self.log_warning(f"{_url} exists at {_destination}.")
@@ -1001,20 +2355,22 @@ class FileSystemUtility(DatabaseUtility):
 
     try:
       self.require("requests", "REQUESTS")
-      _session = self.REQUESTS.Session()
-      _session.headers.update(_default_headers)
       self.log_info(f"Downloading content from {_url}.")
 
+      _request_args = {"headers": _headers}
       if _method == "post":
-        _response = _session.post(_url, stream=True, json=_form_values, allow_redirects=True)
+        _request_args["json"] = _form_values
       else:
-        _response = _session.get(_url, stream=True, data=_form_values, allow_redirects=True)
+        _request_args["data"] = _form_values
 
       if _destination:
-        kwargs.pop("content", None)
-        kwargs.pop("destination", None)
-        self.write(_destination, _response.content, **kwargs)
-      if _return_text:
+        # Streamed to disk in chunks on a pooled connection, resumes partial downloads
+        _, _response = _http_client.download(_url, _destination, _method, _flag_resume, **_request_args)
+        if _return_text:
+          with open(_destination, "r", encoding=_response.encoding or "utf-8", errors="replace") as _fh:
+            return _fh.read()
+      else:
+        _response = _http_client.request(_method, _url, **_request_args)
         return _response.text
     except:
       self.log_warning(f"Normal procedure failed. Trying alternate method 'urlretrieve'.")
@@ -1026,54 +2382,241 @@ class FileSystemUtility(DatabaseUtility):
   get_url_file = _GET_URL_CONTENT
   get_url = _GET_URL_CONTENT
 
+  _http_client = None
+
+  @property
+  def http_client(self):
+    """HTTPClient of this instance, the process wide client (one pooled requests.Session per host) unless set_http_cache is used"""
+    if self._http_client is None:
+      self._http_client = HTTPClient.get()
+    return self._http_client
+
+  def get_files(self, *args, **kwargs):
+    """Downloads many URLs concurrently
+
+      @params
+      :param urls|0: list of URLs or dict {url: destination}
+      :param destinations|1: list of destinations (same order as urls) or a directory
+      :param max_concurrency|2: Total concurrent downloads (default 8)
+      :param per_host: Concurrent downloads per host for this call (default: per_host of the client, 4)
+      :param overwrite: Downloads again if destination exists
+      Other options (method, headers, form_values, flag_resume) are passed to get_file
+
+      @returns
+      :return: dict {url: True|False}
+    """
+    _urls = kwargs.pop("urls", args[0] if len(args) > 0 else None)
+    _destinations = kwargs.pop("destinations", args[1] if len(args) > 1 else None)
+    _max_concurrency = kwargs.pop("max_concurrency", args[2] if len(args) > 2 else 8)
+    _per_host = kwargs.pop("per_host", None)
+
+    if isinstance(_urls, str):
+      _urls = [_urls]
+
+    if isinstance(_urls, dict):
+      _tasks = list(_urls.items())
+    elif isinstance(_destinations, (list, tuple)):
+      _tasks = list(zip(_urls, _destinations))
+    else:
+      self.require("urllib.parse", "URLParse")
+      _dir = str(_destinations or self.OS.getcwd())
+      _tasks = [(_url, self.OS.path.join(_dir, self.OS.path.basename(self.URLParse.urlsplit(_url).path) or "index.html")) for _url in _urls]
+
+    _http_client = None
+    if _per_host is not None and _per_host != self.http_client.per_host:
+      # Dedicated client for this call, the shared one keeps its limit
+      _http_client = HTTPClient(per_host=_per_host, cache=self.http_client.cache)
+      kwargs["http_client"] = _http_client
+
+    self.require("concurrent.futures", "ConcurrentFutures")
+    _results = {}
+    try:
+      with self.ConcurrentFutures.ThreadPoolExecutor(max_workers=max(1, _max_concurrency)) as _executor:
+        _futures = {_executor.submit(self._GET_URL_CONTENT, _url, _destination, **kwargs): _url for _url, _destination in _tasks}
+        for _future in self.ConcurrentFutures.as_completed(_futures):
+          _results[_futures[_future]] = _future.result()
+    finally:
+      if _http_client is not None:
+        _http_client.close()
+
+    return _results
+
+  download_files = get_files
+
+  def set_http_cache(self, *args, **kwargs):
+    """Enables on-disk cache for get_file/get_url/get_html/get_files of this instance
+
+      The cache is held by a dedicated HTTPClient, other instances keep using the shared client.
+
+      @params
+      :param path|0: Cache directory (default ~/.cache/UtilityLib/http), False to disable the cache
+      :param max_size|1: Disk budget in bytes, least recently used entries are evicted (default 1GiB)
+      :param ttl|2: Seconds an entry is served without revalidation if server does not send max-age (default 1 day)
+      :param methods|3: HTTP methods to cache (default GET and HEAD), e.g., ("GET", "POST") for idempotent POST APIs
+
+      @returns
+      :return: HTTPCache|None
+    """
+    _path = kwargs.get("path", args[0] if len(args) > 0 else None)
+    _max_size = kwargs.get("max_size", args[1] if len(args) > 1 else 1024**3)
+    _ttl = kwargs.get("ttl", args[2] if len(args) > 2 else 86400)
+    _methods = kwargs.get("methods", args[3] if len(args) > 3 else None)
+
+    if self._http_client is not None and self._http_client is not HTTPClient.get():
+      self._http_client.close()
+
+    if _path is False:
+      self._http_client = None
+      return None
+
+    self._http_client = HTTPClient(cache=HTTPCache(_path, _max_size, _ttl, _methods))
+    return self._http_client.cache
+
+  enable_http_cache = set_http_cache
+
+  def get_http_cache_stats(self, *args, **kwargs):
+    """hits, misses, revalidated, bytes_saved, evicted, hit_rate and size of the HTTP cache"""
+    _cache = self.http_client.cache
+    return _cache.stats() if _cache is not None else {}
+
+  http_cache_stats = get_http_cache_stats
+
+  def set_stat_cache(self, *args, **kwargs):
+    """Enables process wide file metadata cache (see StatCache) used by EntityPath (stat, exists, size, hash) and check_path
+
+      @params
+      :param ttl|0: Seconds a stat result is served without a system call (default 30), False to disable the cache
+      :param max_entries|1: Paths kept, least recently used paths are dropped (default 100000)
+
+      @returns
+      :return: StatCache|None
+    """
+    _ttl = kwargs.get("ttl", args[0] if len(args) > 0 else 30)
+    _max_entries = kwargs.get("max_entries", args[1] if len(args) > 1 else 100000)
+
+    if _ttl is False:
+      StatCache.disable()
+      return None
+
+    return StatCache.enable(_ttl, _max_entries)
+
+  enable_stat_cache = set_stat_cache
+
+  def get_stat_cache_stats(self, *args, **kwargs):
+    """hits, misses, revalidated, invalidated, evicted, hit_rate and entries of the file metadata cache"""
+    _cache = StatCache.active()
+    return _cache.stats() if _cache is not None else {}
+
+  stat_cache_stats = get_stat_cache_stats
+
   def _search_dir_filter(self, *args, **kwargs):
     """Search directories using pattern
 
+    Options (flag_lazy, max_depth, prune, symlinks, max_workers) as in find_paths
     """
-    _source = args[0] if len(args) > 0 else kwargs.get("dir", getattr(self, "dir"))
-    _pattern = args[1] if len(args) > 1 else kwargs.get("pattern", "/*/")
-    return self._search_path_pattern(_source, _pattern)
+    _source = args[0] if len(args) > 0 else kwargs.pop("dir", getattr(self, "dir"))
+    _pattern = args[1] if len(args) > 1 else kwargs.pop("pattern", "/*/")
+    kwargs.pop("dir", None)
+    kwargs.setdefault("file_type", "dir")
+    return self._search_path_pattern(_source, _pattern, **kwargs)
 
   search_dirs = _search_dir_filter
   find_dirs = _search_dir_filter
 
   def _search_file_filter(self, *args, **kwargs):
-    """Search files using pattern
+    """Search files using pattern(s), all the patterns are matched in one traversal
 
+    Options (flag_lazy, max_depth, prune, symlinks, max_workers, file_type) as in find_paths
     """
-    _source = args[0] if len(args) > 0 else kwargs.get("dir", getattr(self, "dir"))
-    _pattern = args[1] if len(args) > 1 else kwargs.get("pattern", ["*"])
+    _source = args[0] if len(args) > 0 else kwargs.pop("dir", getattr(self, "dir"))
+    _pattern = args[1] if len(args) > 1 else kwargs.pop("pattern", ["*"])
+    kwargs.pop("dir", None)
+    kwargs.pop("pattern", None)
 
-    return self._search_path_pattern(_source, _pattern)
+    return self._search_path_pattern(_source, _pattern, **kwargs)
 
   # added v2.8
   search_files = _search_file_filter
   find_files = _search_file_filter
   search = _search_file_filter
 
+  _default_prune = (".git", ".svn", ".hg", "node_modules", "__pycache__", ".ipynb_checkpoints")
+
+  def _find_paths(self, *args, **kwargs):
+    """Finds paths matching many glob, extension and regex patterns in a single os.scandir traversal
+
+    @params
+    0|source
+    1|pattern: glob pattern(s) relative to source (*.txt, **/*.py, data/*/), trailing / for directories only
+    2|ext: extension(s) as suffix
+    3|regex: regular expression(s) searched in the relative path
+    max_depth: -1 for all (default), 0 for the source only
+    prune: Directory names (or callable(DirEntry)) to skip, True for .git, node_modules, __pycache__ ...
+    symlinks: list (default, symlinked directories are not walked into)|follow|skip
+    file_type: any (default)|file|dir
+    max_workers: >1 to scan subdirectories in parallel (results are yielded in completion order)
+    flag_entity: Yields EntityPath instead of str
+
+    @returns
+    generator of matching paths
+    """
+    _source = kwargs.get("source", args[0] if len(args) > 0 else getattr(self, "source", self.OS.getcwd()))
+    _pattern = kwargs.get("pattern", args[1] if len(args) > 1 else None)
+    _ext = kwargs.get("ext", args[2] if len(args) > 2 else None)
+    _regex = kwargs.get("regex", args[3] if len(args) > 3 else None)
+    _max_depth = kwargs.get("max_depth", -1)
+    _prune = kwargs.get("prune", None)
+    _symlinks = kwargs.get("symlinks", "list")
+    _file_type = kwargs.get("file_type", "any")
+    _max_workers = kwargs.get("max_workers", 1)
+    _flag_entity = kwargs.get("flag_entity", False)
+
+    if not _source or not any((_pattern, _ext, _regex)):
+      return
+
+    _matcher = PathMatcher(glob=_pattern, ext=_ext, regex=_regex)
+
+    # Do not walk deeper than the patterns can match
+    if _matcher.max_depth >= 0 and (_max_depth is None or _max_depth < 0 or _matcher.max_depth < _max_depth):
+      _max_depth = _matcher.max_depth
+
+    _walker = DirWalker(str(_source),
+        max_depth=_max_depth,
+        max_workers=_max_workers,
+        follow_symlinks=_symlinks == "follow",
+        prune=self._default_prune if _prune is True else _prune)
+
+    for _path in _walker.find(_matcher, _file_type, skip_symlinks=_symlinks == "skip"):
+      yield EntityPath(_path) if _flag_entity else _path
+
+  find_paths = _find_paths
+  iter_paths = _find_paths
+
   def _walk_files_by_extension(self, *args, **kwargs):
     """Search files using extension(s) as suffix
 
     @params
     0|source
     1|ext: string, tuple, list or set containing extensions
+    flag_lazy: Returns generator instead of list
+    Other options (max_depth, prune, symlinks, max_workers) as in find_paths
 
     @returns
-    files matches  as list found using os.walk
+    files matches as list found in a single scandir walk
     """
-    _source = kwargs.get("source", args[0] if len(args) > 0 else getattr(self, "source", self.OS.getcwd()))
-    _ext = kwargs.get("ext", args[1] if len(args) > 1 else getattr(self, "ext", ()))
-    _matches = []
+    _source = kwargs.pop("source", args[0] if len(args) > 0 else getattr(self, "source", self.OS.getcwd()))
+    _ext = kwargs.pop("ext", args[1] if len(args) > 1 else getattr(self, "ext", ()))
+    _flag_lazy = kwargs.pop("flag_lazy", False)
 
-    if not all((_source, len(_ext) > 0)):
-      return _matches
+    if isinstance(_ext, str):
+      _ext = (_ext,)
 
-    for _root, _dir_names, _file_names in self.OS.walk(_source):
-      for filename in _file_names:
-        if filename.endswith(_ext):
-          _matches.append(self.OS.path.join(_root, filename))
+    if not all((_source, len(_ext) > 0)):
+      return iter(()) if _flag_lazy else []
 
-    return _matches
+    kwargs["file_type"] = "file"
+    _matches = self._find_paths(_source, ext=tuple(_ext), **kwargs)
+    return _matches if _flag_lazy else list(_matches)
 
   get_file_types = _walk_files_by_extension
   find_file_types = _walk_files_by_extension
@@ -1081,27 +2624,31 @@ class FileSystemUtility(DatabaseUtility):
   ext_files = _walk_files_by_extension
 
   def _search_path_pattern(self, *args, **kwargs) -> list:
-    """Internal Function to Search Paths based on pattern
+    """Internal Function to Search Paths based on pattern(s)
 
+    All the patterns are evaluated in one traversal (see find_paths), patterns without * match as substring.
+
+    :param source|0:
+    :param pattern|1: str or list of glob patterns
+    :param flag_lazy: Returns generator instead of list
     """
-    _results = []
-    _source = args[0] if len(args) > 0 else kwargs.get("source", getattr(self, "source"))
-    _pattern = args[1] if len(args) > 1 else kwargs.get("pattern", "*")
+    _source = args[0] if len(args) > 0 else kwargs.pop("source", getattr(self, "source"))
+    _pattern = args[1] if len(args) > 1 else kwargs.pop("pattern", "*")
+    _flag_lazy = kwargs.pop("flag_lazy", False)
+    kwargs.pop("source", None)
+    kwargs.pop("pattern", None)
 
     if not _source or not _pattern:
-      return _results
-
-    _source = EntityPath(_source)
+      return iter(()) if _flag_lazy else []
 
     if isinstance(_pattern, (str)):
       _pattern = [_pattern]
 
-    for _p in _pattern:
-      if "*" not in _p:
-        _p = f"*{_p}*"
-      _results.extend(list(_source.search(_p)))
+    _pattern = [_p if "*" in _p else f"*{_p}*" for _p in _pattern]
+    kwargs.setdefault("flag_entity", True)
 
-    return _results
+    _results = self._find_paths(_source, _pattern, **kwargs)
+    return _results if _flag_lazy else list(_results)
 
   def create_dir(self, *args, **kwargs) -> dict:
     _path = kwargs.get("path", args[0] if len(args) > 0 else None)
@@ -1158,6 +2705,11 @@ class FileSystemUtility(DatabaseUtility):
       for _p in _path:
         _r = _p if self.check_path(_p) else False
         _result.append(_r)
+    elif _path and StatCache.active() is not None:
+      try:
+        _result = StatCache.active().exists(_path)
+      except (OSError, ValueError):
+        _result = False
     else:
       _result = self.OS.path.exists(_path) if _path else _result
 
@@ -1246,10 +2798,11 @@ class FileSystemUtility(DatabaseUtility):
       return None
 
     _file_path = EntityPath(_file_path)
-    _result = _file_path.resolve()
 
     if _with_dir is False:
       _result = _file_path.name
+    else:
+      _result = _file_path.resolve()
 
     _result = str(_result)
 
@@ -1286,7 +2839,45 @@ class FileSystemUtility(DatabaseUtility):
   file_extension = file_ext
   ext = file_ext
 
+  _split_delimiters = {
+    ".fasta": ">", ".fa": ">", ".fna": ">", ".faa": ">", ".ffn": ">", ".fas": ">",
+    ".sdf": "$$$$", ".sd": "$$$$", ".mol2": "@<TRIPOS>MOLECULE",
+  }
+
   def split_file(self, *args, **kwargs):
-    """WIP: Split file in smaller files"""
+    """Splits a large plain or gzip file into shards at record boundaries (see FileSplitter)
+
+    @example
+    _manifest = UL.split_file("ligands.sdf.gz", 16, flag_gz=True)
+    _manifest = UL.split_file("genes.tsv", shard_size=512 * 1024 * 1024, header_lines=1)
+
+    :param file_path|0:
+    :param num_parts|1: Number of shards (Default 2)
+    :param id_delimiter|2: Record marker at the start of a line, ">" for FASTA, "$$$$" for SDF (Default: by extension, lines otherwise)
+    :param shard_size: Approximate uncompressed bytes per shard, overrides num_parts
+    :param header_lines: Lines copied from the top of the file into every shard (Default 0)
+    :param destination: Directory of the shards (Default: directory of the file)
+    :param flag_gz: gzip compress the shards (Default False)
+    :param level: gzip compression level (Default 6)
+    :param max_workers: Threads writing the shards
+
+    :return: Manifest [{"path", "start", "end", "records"}]
+    """
     _file_path = args[0] if len(args) > 0 else kwargs.get("file_path")
+    _num_parts = args[1] if len(args) > 1 else kwargs.get("num_parts")
     _sdf_id_delimiter = args[2] if len(args) > 2 else kwargs.get("id_delimiter")
+    _shard_size = kwargs.get("shard_size")
+    _flag_gz = kwargs.get("flag_gz", False)
+    _level = kwargs.get("level", 6)
+
+    if not self.check_path(_file_path):
+      self.log_error(f"File {_file_path} does not exist.")
+      return []
+
+    if _sdf_id_delimiter is None:
+      _name = str(_file_path).lower()
+      _name = _name[:-3] if _name.endswith(".gz") else _name
+      _sdf_id_delimiter = self._split_delimiters.get(self.OS.path.splitext(_name)[1])
+
+    _splitter = FileSplitter(_file_path, _sdf_id_delimiter, kwargs.get("header_lines", 0))
+    return _splitter.split(kwargs.get("destination"), _num_parts, _shard_size, _level if _flag_gz else None, kwargs.get("max_workers"))
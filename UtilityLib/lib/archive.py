@@ -0,0 +1,238 @@
+import os as OS, json as JSON, tarfile as TarFile, threading as Threading
+from collections import OrderedDict
+from .gzindex import GzipIndex
+
+class ArchivePool:
+  """
+  Small LRU pool of open archive handles (TarIndex, zipfile.ZipFile, ...).
+
+  Handles are keyed by (kind, path, mtime, size), so a modified archive is reopened
+  and the least recently used handles are closed when the pool is full.
+
+  @example
+  with ArchivePool(max_size=4) as _pool:
+    _zip = _pool.get("archive.zip", zipfile.ZipFile, "zip")
+    _zip.read("member.txt")
+  """
+
+  def __init__(self, max_size=8):
+    self.max_size = max_size
+    self._handles = OrderedDict()
+    self._lock = Threading.RLock()
+
+  def get(self, path, opener, kind=None):
+    """Returns open handle of the path, `opener(path)` is called if not in the pool"""
+    _path = OS.path.abspath(str(path))
+    _stat = OS.stat(_path)
+    _key = (kind, _path, _stat.st_mtime_ns, _stat.st_size)
+
+    with self._lock:
+      if _key in self._handles:
+        self._handles.move_to_end(_key)
+        return self._handles[_key]
+
+      # Drop handles of older versions of the same archive
+      for _old_key in [_k for _k in self._handles if _k[:2] == _key[:2]]:
+        self._close(_old_key)
+
+      _handle = opener(_path)
+      self._handles[_key] = _handle
+
+      while len(self._handles) > self.max_size:
+        self._close(next(iter(self._handles)))
+
+      return _handle
+
+  def _close(self, key):
+    _handle = self._handles.pop(key, None)
+    if _handle is not None and hasattr(_handle, "close"):
+      _handle.close()
+
+  def close(self):
+    """Closes all the handles"""
+    with self._lock:
+      for _key in list(self._handles):
+        self._close(_key)
+
+  def __len__(self):
+    return len(self._handles)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+class TarIndex:
+  """
+  Member index of a tar archive for O(1) member lookup and reads.
+
+  Member names, header/data offsets and sizes are read once and saved as `<archive>.taridx`
+  (thrown away when mtime or size of the archive changes).
+  Data offsets are positions in the uncompressed tar stream:
+    * .tar: members are read with a seek
+    * .tar.gz|.tgz: members are read through GzipIndex access points (decompressor checkpoints),
+      reads in archive order continue on the same decompression stream
+    * other compressions (bz2, xz) fall back to tarfile
+
+  @example
+  _idx = TarIndex("archive.tgz").load_or_build()
+  _idx.read("dir/member.txt")
+  """
+
+  suffix = ".taridx"
+  version = 1
+  spacing = 1024 * 1024
+
+  def __init__(self, path):
+    self.path = str(path)
+    self.path_index = f"{self.path}{self.suffix}"
+    _stat = OS.stat(self.path)
+    self.signature = [_stat.st_mtime_ns, _stat.st_size]
+    self.members = {} # {name: [offset, offset_data, size, type, mode, mtime, linkname]}
+
+    with open(self.path, "rb") as _fh:
+      _magic = _fh.read(3)
+
+    self.is_gz = _magic[:2] == b"\x1f\x8b"
+    self.is_plain = not self.is_gz and _magic[:3] not in (b"BZh", b"\xfd7z")
+
+    self._stream = None
+    self._stream_pos = 0
+    self._tar = None
+
+  def load(self):
+    """Loads saved index, discards it if the archive has changed"""
+    if not OS.path.exists(self.path_index):
+      return False
+
+    try:
+      with open(self.path_index, "r") as _fh:
+        _data = JSON.load(_fh)
+    except Exception:
+      self.discard()
+      return False
+
+    if _data.get("version") != self.version or _data.get("signature") != self.signature:
+      self.discard()
+      return False
+
+    self.members = _data["members"]
+    return True
+
+  def save(self):
+    """Writes index next to the archive (silently skipped for read-only locations)"""
+    _data = {
+      "version": self.version,
+      "signature": self.signature,
+      "members": self.members,
+    }
+
+    _path_tmp = f"{self.path_index}.{OS.getpid()}.tmp"
+    try:
+      with open(_path_tmp, "w") as _fh:
+        JSON.dump(_data, _fh)
+      OS.replace(_path_tmp, self.path_index)
+    except OSError:
+      return False
+
+    return True
+
+  def discard(self):
+    self.members = {}
+    try:
+      OS.remove(self.path_index)
+    except OSError:
+      pass
+
+  def _open_stream(self, offset=0):
+    """Binary handle of uncompressed tar stream positioned at offset"""
+    if self.is_gz:
+      return GzipIndex.get(self.path, spacing=self.spacing).open(offset=offset, mode="rb")
+
+    _fh = open(self.path, "rb")
+    _fh.seek(offset)
+    return _fh
+
+  def build(self):
+    """Reads all the member headers in one pass"""
+    self.members = {}
+
+    if self.is_gz or self.is_plain:
+      _fh = self._open_stream()
+      _tar = TarFile.open(fileobj=_fh, mode="r|" if self.is_gz else "r:")
+    else:
+      _fh = None
+      _tar = TarFile.open(self.path, "r:*")
+
+    try:
+      for _mem in _tar:
+        self.members[_mem.name] = [_mem.offset, _mem.offset_data, _mem.size, _mem.type.decode(), _mem.mode, _mem.mtime, _mem.linkname]
+    finally:
+      _tar.close()
+      _fh and _fh.close()
+
+    self.save()
+    return self
+
+  def load_or_build(self):
+    if not self.load():
+      self.build()
+    return self
+
+  def names(self, files_only=False):
+    if files_only:
+      return [_n for _n, _m in self.members.items() if _m[3].encode() in TarFile.REGULAR_TYPES]
+    return list(self.members.keys())
+
+  def get_member(self, name):
+    """tarfile.TarInfo of the member from index"""
+    _mem = self.members.get(name)
+    if _mem is None:
+      return None
+
+    _info = TarFile.TarInfo(name)
+    _info.offset, _info.offset_data, _info.size, _type, _info.mode, _info.mtime, _info.linkname = _mem
+    _info.type = _type.encode()
+    return _info
+
+  def members_info(self, files_only=False):
+    return [self.get_member(_n) for _n in self.names(files_only)]
+
+  def read(self, name):
+    """Returns bytes of a regular file member or None"""
+    _mem = self.members.get(name)
+    if _mem is None or _mem[3].encode() not in TarFile.REGULAR_TYPES:
+      return None
+
+    _offset_data, _size, _type = _mem[1], _mem[2], _mem[3].encode()
+
+    if _type == TarFile.GNUTYPE_SPARSE or not (self.is_gz or self.is_plain):
+      if self._tar is None:
+        self._tar = TarFile.open(self.path, "r:*")
+      return self._tar.extractfile(name).read()
+
+    if self.is_gz and self._stream is not None and 0 <= _offset_data - self._stream_pos <= self.spacing:
+      # Continue on the open decompression stream instead of restarting from a checkpoint
+      _to_skip = _offset_data - self._stream_pos
+      while _to_skip > 0:
+        _skipped = len(self._stream.read(min(_to_skip, 1024 * 1024)))
+        if not _skipped:
+          break
+        _to_skip -= _skipped
+    elif self.is_gz:
+      self._stream and self._stream.close()
+      self._stream = self._open_stream(_offset_data)
+    else:
+      if self._stream is None:
+        self._stream = self._open_stream(_offset_data)
+      self._stream.seek(_offset_data)
+
+    _content = self._stream.read(_size)
+    self._stream_pos = _offset_data + len(_content)
+    return _content
+
+  def close(self):
+    self._stream and self._stream.close()
+    self._tar and self._tar.close()
+    self._stream, self._tar = None, None
@@ -0,0 +1,109 @@
+import os as OS, threading as Threading
+from .walk import DirWalker
+
+class DiskUsage:
+  """
+  du style size of directory trees.
+
+    * Directories are listed with os.scandir on a thread pool (DirWalker), file sizes come from DirEntry.stat
+    * Hardlinked files (st_nlink > 1) are counted once per (st_dev, st_ino)
+    * Symlinks are not followed, the link itself is counted
+    * Sizes of the files directly in a directory are cached with the mtime of the directory,
+      unchanged directories are not listed again (one stat per directory)
+
+  The mtime of a directory changes when entries are added, removed or renamed but not when a file is
+  modified in place, use `refresh()` (or flag_cache=False) after rewriting files.
+
+  @example
+  _du = DiskUsage.get()
+  _du.size("/data/project") # Apparent size in bytes
+  _du.size("/data/project", flag_blocks=True) # Allocated bytes like du
+  """
+
+  max_entries = 1000000
+
+  _default = None
+  _default_lock = Threading.Lock()
+
+  def __init__(self, max_workers=None):
+    self.max_workers = max_workers
+    self._cache = {} # {dir_path: (mtime_ns, [sub_dir_path], size, blocks, [(st_dev, st_ino, size, blocks)])}
+    self.counters = {"listed": 0, "cached": 0}
+
+  @classmethod
+  def get(cls, **kwargs):
+    """Process wide instance (shares the directory cache)"""
+    with cls._default_lock:
+      if cls._default is None:
+        cls._default = cls(**kwargs)
+    return cls._default
+
+  def _scan_dir(self, dir_path, flag_cache=True):
+    """(sub_dirs, (size, blocks, hardlinks)) of the files directly in dir_path, kept in the cache only with flag_cache"""
+    _mtime_ns = OS.stat(dir_path, follow_symlinks=False).st_mtime_ns
+    _cached = self._cache.get(dir_path) if flag_cache else None
+    if _cached is not None and _cached[0] == _mtime_ns:
+      self.counters["cached"] += 1
+      return _cached[1], _cached[2:]
+
+    _sub_dirs, _size, _blocks, _links = [], 0, 0, []
+    with OS.scandir(dir_path) as _entries:
+      for _entry in _entries:
+        try:
+          if _entry.is_dir(follow_symlinks=False):
+            _sub_dirs.append(_entry.path)
+            continue
+
+          _stat = _entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+          # Deleted while listing
+          continue
+
+        _entry_blocks = getattr(_stat, "st_blocks", 0) * 512
+        if _stat.st_nlink > 1:
+          _links.append((_stat.st_dev, _stat.st_ino, _stat.st_size, _entry_blocks))
+        else:
+          _size += _stat.st_size
+          _blocks += _entry_blocks
+
+    self.counters["listed"] += 1
+    if flag_cache:
+      if len(self._cache) >= self.max_entries:
+        self._cache.clear()
+      self._cache[dir_path] = (_mtime_ns, _sub_dirs, _size, _blocks, _links)
+    return _sub_dirs, (_size, _blocks, _links)
+
+  def size(self, path, flag_blocks=False, flag_cache=True, max_workers=None):
+    """Total size of the files in a directory tree (or size of a file)
+
+    :param flag_blocks: Allocated bytes (st_blocks * 512) instead of the apparent size
+    :param flag_cache: Reuses totals of the directories with unchanged mtime
+    :param max_workers: Threads listing directories
+    """
+    _path = OS.path.abspath(str(path))
+    if not OS.path.isdir(_path) or OS.path.islink(_path):
+      _stat = OS.stat(_path)
+      return getattr(_stat, "st_blocks", 0) * 512 if flag_blocks else _stat.st_size
+
+    _max_workers = max_workers if max_workers is not None else self.max_workers
+    _walker = DirWalker(_path, max_workers=_max_workers)
+    _total, _inodes = 0, set()
+    for _size, _blocks, _links in _walker.map(lambda _dir_path, _depth: self._scan_dir(_dir_path, flag_cache)):
+      _total += _blocks if flag_blocks else _size
+      for _dev, _ino, _link_size, _link_blocks in _links:
+        if (_dev, _ino) not in _inodes:
+          _inodes.add((_dev, _ino))
+          _total += _link_blocks if flag_blocks else _link_size
+
+    return _total
+
+  def refresh(self, path=None):
+    """Drops cached totals of path and the directories below it (all if None)"""
+    if path is None:
+      self._cache.clear()
+      return
+
+    _path = OS.path.abspath(str(path))
+    _prefix = _path.rstrip(OS.sep) + OS.sep
+    for _dir_path in [_d for _d in self._cache if _d == _path or _d.startswith(_prefix)]:
+      self._cache.pop(_dir_path, None)
@@ -0,0 +1,458 @@
+import os as OS, threading as Threading, time as TIME, json as JSON, hashlib as HashLib, shutil as SHUTIL
+from urllib.parse import urlsplit as URLSplit
+
+class HTTPClient:
+  """
+  Connection-pooled HTTP client for downloads.
+
+    * One requests.Session per host (scheme://netloc), connections are kept alive and reused
+    * Responses are streamed to disk in chunks (`<destination>.part` until complete)
+    * Partial downloads resume with an HTTP Range request, If-Range (ETag or Last-Modified of the first response)
+      makes the server send the whole file again if it has changed
+    * At most `per_host` concurrent requests to the same host
+
+  requests is imported only when the first session is created.
+
+  @example
+  _client = HTTPClient.get()
+  _client.download("https://example.org/data.tsv.gz", "data/data.tsv.gz")
+  _client.request("get", "https://example.org/").text
+  """
+
+  chunk_size = 1024 * 1024
+  default_headers = {'User-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'}
+
+  _default = None
+  _default_lock = Threading.Lock()
+
+  def __init__(self, per_host=4, timeout=60, headers=None, cache=None):
+    self.per_host = int(per_host)
+    self.timeout = timeout
+    self.headers = dict(self.default_headers, **(headers or {}))
+    self.cache = cache # HTTPCache
+
+    self._sessions = {} # {host: requests.Session}
+    self._limits = {} # {host: Semaphore}
+    self._lock = Threading.Lock()
+
+  @classmethod
+  def get(cls, **kwargs):
+    """Process wide client so that connections are shared"""
+    with cls._default_lock:
+      if cls._default is None:
+        cls._default = cls(**kwargs)
+    return cls._default
+
+  @staticmethod
+  def get_host(url):
+    _parts = URLSplit(str(url))
+    return f"{_parts.scheme}://{_parts.netloc}"
+
+  def _create_session(self):
+    import requests as _Requests
+    from requests.adapters import HTTPAdapter as _HTTPAdapter
+
+    _session = _Requests.Session()
+    _session.headers.update(self.headers)
+    _adapter = _HTTPAdapter(pool_connections=1, pool_maxsize=max(self.per_host, 1))
+    _session.mount("http://", _adapter)
+    _session.mount("https://", _adapter)
+    return _session
+
+  def get_session(self, url):
+    """Shared session of the host of url"""
+    _host = self.get_host(url)
+    with self._lock:
+      if _host not in self._sessions:
+        self._sessions[_host] = self._create_session()
+        self._limits[_host] = Threading.BoundedSemaphore(max(self.per_host, 1))
+      return self._sessions[_host]
+
+  def get_limit(self, url):
+    """Semaphore limiting concurrent requests to the host of url"""
+    self.get_session(url)
+    return self._limits[self.get_host(url)]
+
+  def _get_cache_entry(self, method, url, kwargs):
+    """(key, entry) if the request is cacheable, adds conditional headers for stale entries"""
+    if self.cache is None or method.upper() not in self.cache.methods or kwargs.get("stream"):
+      return None, None
+
+    _key = self.cache.get_key(method, url, kwargs)
+    _entry = self.cache.lookup(_key)
+    if _entry is not None and not self.cache.is_fresh(_entry):
+      kwargs["headers"] = dict(kwargs.get("headers") or {}, **self.cache.get_validators(_entry))
+    return _key, _entry
+
+  def request(self, method, url, **kwargs):
+    """requests.Session.request on the host session (body is read before the host slot is released unless stream=True)
+
+    GET/HEAD responses (HTTPCache.methods) are served from and stored to the cache if set.
+    """
+    kwargs.setdefault("timeout", self.timeout)
+    kwargs.setdefault("allow_redirects", True)
+
+    _key, _entry = self._get_cache_entry(method, url, kwargs)
+    if _entry is not None and self.cache.is_fresh(_entry):
+      return self.cache.get_response(_key, _entry, url)
+
+    _session = self.get_session(url)
+    with self.get_limit(url):
+      _response = _session.request(method.upper(), url, **kwargs)
+      if not kwargs.get("stream"):
+        _response.content
+
+    if _key is not None:
+      if _response.status_code == 304 and _entry is not None:
+        _entry = self.cache.revalidated(_key, _entry, _response.headers)
+        return self.cache.get_response(_key, _entry, url)
+      if _response.status_code == 200:
+        self.cache.store(_key, url, _response, content=_response.content)
+      else:
+        self.cache.count("misses")
+
+    return _response
+
+  @staticmethod
+  def get_range_validator(headers):
+    """Strong ETag or Last-Modified of a response, weak ETags can not be used with If-Range"""
+    _etag = headers.get("ETag")
+    if _etag and not _etag.startswith("W/"):
+      return _etag
+    return headers.get("Last-Modified")
+
+  def download(self, url, destination, method="get", flag_resume=True, **kwargs):
+    """Streams response body to destination, resumes from `<destination>.part` using Range and If-Range
+
+    The validator of the response is kept in `<destination>.part.validator`, part files without it are downloaded again.
+    A 304 Not Modified for conditional headers passed by the caller (without a cache entry) leaves destination untouched.
+
+    :param kwargs: Passed to requests (data, json, headers, params, timeout)
+    :return: (destination, response)
+    :raises requests.HTTPError: for error status codes
+    """
+    _destination = str(destination)
+    _path_part = f"{_destination}.part"
+    _dir = OS.path.dirname(OS.path.abspath(_destination))
+    OS.makedirs(_dir, exist_ok=True)
+
+    _key, _entry = self._get_cache_entry(method, url, kwargs)
+    if _entry is not None and self.cache.is_fresh(_entry):
+      return self.cache.copy_to(_key, _entry, _destination), self.cache.get_response(_key, _entry, url, flag_content=False)
+
+    _headers = dict(kwargs.pop("headers", None) or {})
+    _path_validator = f"{_path_part}.validator"
+    _validator = None
+    if flag_resume and _entry is None and OS.path.exists(_path_part) and OS.path.exists(_path_validator):
+      with open(_path_validator, "r", encoding="utf-8") as _fh:
+        _validator = _fh.read().strip() or None
+
+    _offset = OS.path.getsize(_path_part) if _validator else 0
+    if _offset:
+      # Offsets of the part file are in decoded bytes, ask for the identity representation
+      _headers.update({"Range": f"bytes={_offset}-", "If-Range": _validator, "Accept-Encoding": "identity"})
+
+    kwargs.setdefault("timeout", self.timeout)
+    _session = self.get_session(url)
+    _flag_restart = False
+
+    with self.get_limit(url):
+      with _session.request(method.upper(), url, headers=_headers, stream=True, allow_redirects=True, **kwargs) as _response:
+        if _response.status_code == 304 and _entry is not None:
+          _entry = self.cache.revalidated(_key, _entry, _response.headers)
+          return self.cache.copy_to(_key, _entry, _destination), _response
+        elif _response.status_code == 304:
+          # Conditional headers of the caller matched, destination is left as it is
+          return _destination, _response
+        elif _response.status_code == 416 and _offset:
+          # Part file is already complete, or the file changed on the server
+          _total = _response.headers.get("Content-Range", "").rpartition("/")[2]
+          if _total.isdigit() and int(_total) == _offset:
+            OS.replace(_path_part, _destination)
+            OS.remove(_path_validator)
+            return _destination, _response
+          _flag_restart = True
+        else:
+          _response.raise_for_status()
+
+          _is_partial = _offset and _response.status_code == 206
+          if _is_partial and not _response.headers.get("Content-Range", "").startswith(f"bytes {_offset}-"):
+            # Range other than the one requested, can not be appended
+            _flag_restart = True
+          else:
+            if not _is_partial:
+              _validator = self.get_range_validator(_response.headers)
+              if _validator:
+                with open(_path_validator, "w", encoding="utf-8") as _fh:
+                  _fh.write(_validator)
+              elif OS.path.exists(_path_validator):
+                OS.remove(_path_validator)
+
+            with open(_path_part, "ab" if _is_partial else "wb") as _fh:
+              for _chunk in _response.iter_content(chunk_size=self.chunk_size):
+                _fh.write(_chunk)
+
+    if _flag_restart:
+      for _path in (_path_part, _path_validator):
+        if OS.path.exists(_path):
+          OS.remove(_path)
+      for _name in ("Range", "If-Range", "Accept-Encoding"):
+        _headers.pop(_name, None)
+      return self.download(url, destination, method, False, headers=_headers, **kwargs)
+
+    if _key is not None and _response.status_code in (200, 206):
+      self.cache.store(_key, url, _response, path=_path_part)
+
+    OS.replace(_path_part, _destination)
+    if OS.path.exists(_path_validator):
+      OS.remove(_path_validator)
+    return _destination, _response
+
+  def close(self):
+    with self._lock:
+      for _session in self._sessions.values():
+        _session.close()
+      self._sessions, self._limits = {}, {}
+
+class HTTPCache:
+  """
+  On-disk HTTP response cache.
+
+    * Only GET and HEAD responses are cached unless other methods are given (e.g., methods=("GET", "POST"))
+    * Entries are addressed by sha256 of method, URL and request body/params: `<dir>/<key[:2]>/<key>.body|.meta`
+    * Fresh entries (younger than ttl or Cache-Control max-age) are served without a request
+    * Stale entries are revalidated with If-None-Match/If-Modified-Since, a 304 refreshes them
+    * Least recently used entries are evicted when the total size exceeds max_size
+    * `stats()` returns hits, misses, revalidated and bytes_saved
+
+  @example
+  _cache = HTTPCache("~/.cache/UtilityLib/http", max_size=2 * 1024**3, ttl=86400)
+  _client = HTTPClient(cache=_cache)
+  """
+
+  methods = ("GET", "HEAD")
+
+  def __init__(self, path=None, max_size=1024**3, ttl=86400, methods=None):
+    self.path = OS.path.abspath(OS.path.expanduser(str(path or OS.path.join("~", ".cache", "UtilityLib", "http"))))
+    if methods is not None:
+      self.methods = tuple(_m.upper() for _m in methods)
+    self.max_size = int(max_size)
+    self.ttl = ttl
+    self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "bytes_saved": 0, "evicted": 0}
+    self._size = None
+    self._lock = Threading.RLock()
+    OS.makedirs(self.path, exist_ok=True)
+
+  @staticmethod
+  def get_key(method, url, kwargs=None):
+    """sha256 of method, url and body (data, json, params)"""
+    kwargs = kwargs or {}
+    _hash = HashLib.sha256(f"{method.upper()}\n{url}\n".encode())
+    for _name in ("params", "data", "json"):
+      _value = kwargs.get(_name)
+      if _value is None:
+        continue
+      if not isinstance(_value, (bytes, str)):
+        _value = JSON.dumps(_value, sort_keys=True, default=str)
+      _hash.update(f"{_name}\n".encode())
+      _hash.update(_value if isinstance(_value, bytes) else _value.encode())
+    return _hash.hexdigest()
+
+  def _get_paths(self, key):
+    _dir = OS.path.join(self.path, key[:2])
+    return OS.path.join(_dir, f"{key}.body"), OS.path.join(_dir, f"{key}.meta")
+
+  def count(self, name, value=1):
+    with self._lock:
+      self.counters[name] += value
+
+  def stats(self):
+    with self._lock:
+      _stats = dict(self.counters)
+    _total = _stats["hits"] + _stats["misses"]
+    _stats["hit_rate"] = _stats["hits"] / _total if _total else 0
+    _stats["size"] = self.size
+    return _stats
+
+  def lookup(self, key):
+    _path_body, _path_meta = self._get_paths(key)
+    try:
+      with open(_path_meta, "r") as _fh:
+        _entry = JSON.load(_fh)
+      if not OS.path.exists(_path_body):
+        return None
+    except (OSError, ValueError):
+      return None
+    return _entry
+
+  def is_fresh(self, entry):
+    return TIME.time() - entry["stored_at"] < entry.get("ttl", self.ttl)
+
+  def get_validators(self, entry):
+    _headers = {}
+    if entry.get("etag"):
+      _headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+      _headers["If-Modified-Since"] = entry["last_modified"]
+    return _headers
+
+  def _get_ttl(self, headers):
+    """Seconds the response is fresh, None for no-store, 0 for no-cache (stored but revalidated every time)"""
+    _control = next((_v for _k, _v in headers.items() if _k.lower() == "cache-control"), "").lower()
+    _directives = {}
+    for _part in _control.split(","):
+      _name, _, _value = _part.strip().partition("=")
+      _directives[_name] = _value.strip('"')
+
+    if "no-store" in _directives:
+      return None
+    if "no-cache" in _directives:
+      return 0
+    if _directives.get("max-age", "").isdigit():
+      return int(_directives["max-age"])
+    return self.ttl
+
+  def _write_meta(self, key, entry):
+    _path_body, _path_meta = self._get_paths(key)
+    _path_tmp = f"{_path_meta}.{OS.getpid()}.{Threading.get_ident()}.tmp"
+    with open(_path_tmp, "w") as _fh:
+      JSON.dump(entry, _fh)
+    OS.replace(_path_tmp, _path_meta)
+
+  def _touch(self, key):
+    """Access time marks recently used entries (set explicitly, file systems may be mounted with noatime)"""
+    _path_body, _path_meta = self._get_paths(key)
+    try:
+      OS.utime(_path_meta, (TIME.time(), OS.stat(_path_meta).st_mtime))
+    except OSError:
+      pass
+
+  def store(self, key, url, response, content=None, path=None):
+    """Stores response body from content (bytes) or a file path, evicts LRU entries when over budget"""
+    _ttl = self._get_ttl(response.headers)
+    self.count("misses")
+    if _ttl is None:
+      return None
+
+    _path_body, _path_meta = self._get_paths(key)
+    OS.makedirs(OS.path.dirname(_path_body), exist_ok=True)
+    _path_tmp = f"{_path_body}.{OS.getpid()}.{Threading.get_ident()}.tmp"
+    if path is not None:
+      SHUTIL.copyfile(path, _path_tmp)
+    else:
+      with open(_path_tmp, "wb") as _fh:
+        _fh.write(content)
+
+    _old = self.lookup(key)
+    OS.replace(_path_tmp, _path_body)
+
+    _entry = {
+      "url": url,
+      "status": 200,
+      "headers": {_k: _v for _k, _v in response.headers.items() if _k.lower() in ("content-type", "etag", "last-modified", "cache-control")},
+      "encoding": response.encoding,
+      "etag": response.headers.get("ETag"),
+      "last_modified": response.headers.get("Last-Modified"),
+      "stored_at": TIME.time(),
+      "ttl": _ttl,
+      "size": OS.path.getsize(_path_body),
+    }
+    self._write_meta(key, _entry)
+    self._touch(key)
+
+    with self._lock:
+      if self._size is not None:
+        self._size += _entry["size"] - (_old["size"] if _old else 0)
+    self.evict()
+    return _entry
+
+  def revalidated(self, key, entry, headers):
+    """Refreshes entry after 304 Not Modified"""
+    entry["stored_at"] = TIME.time()
+    # 304 without Cache-Control keeps the policy of the stored response
+    _has_control = any(_k.lower() == "cache-control" for _k in headers)
+    _ttl = self._get_ttl(headers if _has_control else entry.get("headers", {}))
+    entry["ttl"] = 0 if _ttl is None else _ttl
+    entry["etag"] = headers.get("ETag", entry.get("etag"))
+    self._write_meta(key, entry)
+    self.count("revalidated")
+    return entry
+
+  def get_response(self, key, entry, url, flag_content=True):
+    """requests.Response built from the cached entry"""
+    import requests as _Requests
+
+    self.count("hits")
+    self.count("bytes_saved", entry["size"])
+    self._touch(key)
+
+    _response = _Requests.models.Response()
+    _response.status_code = entry["status"]
+    _response.url = url
+    _response.encoding = entry.get("encoding")
+    _response.headers = _Requests.structures.CaseInsensitiveDict(entry["headers"])
+    _response.headers["X-UtilityLib-Cache"] = "hit"
+    if flag_content:
+      with open(self._get_paths(key)[0], "rb") as _fh:
+        _response._content = _fh.read()
+    return _response
+
+  def copy_to(self, key, entry, destination):
+    """Copies cached body to destination"""
+    SHUTIL.copyfile(self._get_paths(key)[0], destination)
+    self.count("hits")
+    self.count("bytes_saved", entry["size"])
+    self._touch(key)
+    return destination
+
+  def _scan(self):
+    """[(last_access, size, key)] of all the entries"""
+    _entries = []
+    for _dir_entry in OS.scandir(self.path):
+      if not _dir_entry.is_dir():
+        continue
+      for _entry in OS.scandir(_dir_entry.path):
+        if _entry.name.endswith(".meta"):
+          _key = _entry.name[:-5]
+          _path_body = self._get_paths(_key)[0]
+          try:
+            _entries.append((_entry.stat().st_atime, OS.path.getsize(_path_body), _key))
+          except OSError:
+            pass
+    return _entries
+
+  @property
+  def size(self):
+    with self._lock:
+      if self._size is None:
+        self._size = sum(_e[1] for _e in self._scan())
+      return self._size
+
+  def evict(self):
+    """Deletes least recently used entries until the cache is below 90% of max_size"""
+    with self._lock:
+      if self.size <= self.max_size:
+        return 0
+
+      _evicted = 0
+      _entries = sorted(self._scan())
+      self._size = sum(_e[1] for _e in _entries)
+      for _atime, _size, _key in _entries:
+        if self._size <= self.max_size * 0.9:
+          break
+        for _path in self._get_paths(_key):
+          try:
+            OS.remove(_path)
+          except OSError:
+            pass
+        self._size -= _size
+        _evicted += 1
+
+      self.counters["evicted"] += _evicted
+      return _evicted
+
+  def clear(self):
+    with self._lock:
+      SHUTIL.rmtree(self.path, ignore_errors=True)
+      OS.makedirs(self.path, exist_ok=True)
+      self._size = 0
@@ -0,0 +1,328 @@
+import io as IO, os as OS, json as JSON, zlib as ZLib, threading as Threading
+from bisect import bisect_right as BisectRight
+
+class GzipIndex:
+  """
+  Random access index for gzip files to jump near any line or uncompressed byte offset.
+
+  Index is built lazily while the file is being read and is complete after the first full pass:
+    * `lines`: [line_no, offset] at every `interval` lines, offset is the uncompressed start of the line
+    * `members`: [compressed_offset, uncompressed_offset] of the gzip members (e.g., output of gz(flag_parallel=True), bgzip)
+    * `line_count`, `size`: Number of lines and uncompressed size once the whole file is read
+
+  The index is saved as `<file>.gzidx` and thrown away when mtime or size of the file changes.
+  Instances are shared (see `get`), readers on several threads update and save the index under a lock.
+
+  Python's zlib cannot restore a decompressor from a saved window, so the access points saved on disk
+  are the member boundaries. Within a process, decompressor snapshots are additionally kept every
+  `spacing` uncompressed bytes so that single member files are not decompressed from the start again.
+
+  @example
+  _idx = GzipIndex.get("data.tsv.gz")
+  _idx.count_lines()
+  with _idx.open(line=5000000) as _fh:
+    _fh.readline()
+  """
+
+  suffix = ".gzidx"
+  version = 1
+  chunk_size = 1024 * 1024
+  max_cached = 16
+  max_snapshots = 1024
+
+  _cached = {} # {path: GzipIndex}
+  _cached_lock = Threading.Lock()
+
+  def __init__(self, path, interval=100000, spacing=32 * 1024 * 1024):
+    self.path = str(path)
+    self.path_index = f"{self.path}{self.suffix}"
+    self.interval = int(interval)
+    self.spacing = int(spacing)
+    self.signature = self._get_signature()
+
+    self.lines = [[0, 0]]
+    self.members = []
+    self.covered = [0, 0] # [offset, lines] read so far
+    self.line_count = None
+    self.size = None
+
+    self._snapshots = {} # {offset // spacing: (offset, compressed_offset, decompressor)}
+    self._is_dirty = False
+    self._lock = Threading.RLock()
+
+  @classmethod
+  def get(cls, path, **kwargs):
+    """Returns cached/saved index of the file if still valid, otherwise a fresh one"""
+    _path = OS.path.abspath(str(path))
+    with cls._cached_lock:
+      _index = cls._cached.get(_path)
+
+      if _index is None or _index.signature != _index._get_signature():
+        _index = cls(_path, **kwargs)
+        _index.load()
+
+      cls._cached.pop(_path, None)
+      cls._cached[_path] = _index
+      while len(cls._cached) > cls.max_cached:
+        cls._cached.pop(next(iter(cls._cached)))
+
+    return _index
+
+  def _get_signature(self):
+    _stat = OS.stat(self.path)
+    return [_stat.st_mtime_ns, _stat.st_size]
+
+  @property
+  def is_complete(self):
+    return self.line_count is not None
+
+  def load(self):
+    """Loads saved index, discards it if the file has changed"""
+    if not OS.path.exists(self.path_index):
+      return False
+
+    try:
+      with open(self.path_index, "r") as _fh:
+        _data = JSON.load(_fh)
+    except Exception:
+      self.discard()
+      return False
+
+    if _data.get("version") != self.version or _data.get("signature") != self.signature or _data.get("interval") != self.interval:
+      self.discard()
+      return False
+
+    with self._lock:
+      self.lines = _data["lines"]
+      self.members = _data["members"]
+      self.covered = _data["covered"]
+      self.line_count = _data["line_count"]
+      self.size = _data["size"]
+    return True
+
+  def save(self):
+    """Writes index next to the file (silently skipped for read-only locations)"""
+    with self._lock:
+      _data = {
+        "version": self.version,
+        "signature": self.signature,
+        "interval": self.interval,
+        "lines": self.lines,
+        "members": self.members,
+        "covered": self.covered,
+        "line_count": self.line_count,
+        "size": self.size,
+      }
+
+      _path_tmp = f"{self.path_index}.{OS.getpid()}.tmp"
+      try:
+        with open(_path_tmp, "w") as _fh:
+          JSON.dump(_data, _fh)
+        OS.replace(_path_tmp, self.path_index)
+        self._is_dirty = False
+      except OSError:
+        return False
+
+    return True
+
+  def discard(self):
+    """Deletes saved index and in-memory access points"""
+    with self._lock:
+      self.lines, self.members, self.covered = [[0, 0]], [], [0, 0]
+      self.line_count, self.size = None, None
+      self._snapshots = {}
+      try:
+        OS.remove(self.path_index)
+      except OSError:
+        pass
+
+  def _observe(self, offset, block):
+    """Counts lines of a decompressed block beyond the covered part and records line access points"""
+    with self._lock:
+      self._observe_block(offset, block)
+
+  def _observe_block(self, offset, block):
+    _cov_offset, _cov_lines = self.covered
+    _end = offset + len(block)
+
+    if _end <= _cov_offset or offset > _cov_offset:
+      return
+
+    _start = _cov_offset - offset
+    _num_lines = block.count(b"\n", _start)
+    _next = (_cov_lines // self.interval + 1) * self.interval
+
+    _pos, _lines_at_pos = _start - 1, _cov_lines
+    while _cov_lines + _num_lines >= _next:
+      _pos = self._find_nth_newline(block, _pos + 1, _next - _lines_at_pos)
+      _lines_at_pos = _next
+      self.lines.append([_next, offset + _pos + 1])
+      self._is_dirty = True
+      _next += self.interval
+
+    self.covered = [_end, _cov_lines + _num_lines]
+
+  @staticmethod
+  def _find_nth_newline(block, start, nth):
+    """Position of the nth (1 based) b"\\n" at or after start, narrows down the range using bytes.count"""
+    _low, _high = start, len(block)
+    while _high - _low > 4096:
+      _mid = (_low + _high) // 2
+      _count = block.count(b"\n", _low, _mid)
+      if _count >= nth:
+        _high = _mid
+      else:
+        _low, nth = _mid, nth - _count
+
+    _pos = _low - 1
+    for _ in range(nth):
+      _pos = block.find(b"\n", _pos + 1)
+
+    return _pos
+
+  def _start_point(self, offset):
+    """Closest (compressed_offset, offset, decompressor) to resume decompression at or before offset"""
+    _point = (0, 0, None)
+    with self._lock:
+      _idx = BisectRight([_m[1] for _m in self.members], offset) - 1
+      if _idx >= 0:
+        _point = (self.members[_idx][0], self.members[_idx][1], None)
+
+      _snapshot = max((_s for _s in self._snapshots.values() if _s[0] <= offset), default=None, key=lambda _s: _s[0])
+      if _snapshot and _snapshot[0] > _point[1]:
+        _point = (_snapshot[1], _snapshot[0], _snapshot[2].copy())
+
+    return _point
+
+  def _iter_blocks(self, offset=0):
+    """Yields (offset, block) of decompressed data starting from the closest access point before offset"""
+    _c_offset, _offset, _dobj = self._start_point(offset)
+    _is_member_start = _dobj is None
+
+    with open(self.path, "rb") as _fh:
+      _fh.seek(_c_offset)
+      _data = b""
+
+      while True:
+        if not _data:
+          _data = _fh.read(self.chunk_size)
+          if not _data:
+            break
+          _c_offset += len(_data)
+
+        if _is_member_start:
+          # Gzip files can be padded with zeroes after the last member
+          _data = _data.lstrip(b"\x00")
+          if not _data:
+            continue
+
+          _member = [_c_offset - len(_data), _offset]
+          with self._lock:
+            if not self.members or _member[1] > self.members[-1][1]:
+              self.members.append(_member)
+          _dobj = ZLib.decompressobj(31)
+          _is_member_start = False
+
+        # Bounded output keeps memory flat for highly compressed data
+        _block = _dobj.decompress(_data, self.chunk_size)
+        _data = _dobj.unconsumed_tail
+
+        if _block:
+          self._observe(_offset, _block)
+          yield _offset, _block
+          _offset += len(_block)
+
+        if _dobj.eof:
+          _data = _dobj.unused_data
+          _is_member_start = True
+        elif _offset >= self.spacing and _offset // self.spacing not in self._snapshots:
+          with self._lock:
+            self._snapshots[_offset // self.spacing] = (_offset, _c_offset - len(_data), _dobj.copy())
+            if len(self._snapshots) > self.max_snapshots:
+              self._coarsen_snapshots()
+
+    if not _is_member_start:
+      raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+    with self._lock:
+      if self.covered[0] == _offset and not self.is_complete:
+        self.line_count, self.size = self.covered[1], _offset
+        self._is_dirty = True
+
+  def _coarsen_snapshots(self):
+    """Doubles the spacing and keeps one snapshot per interval to bound the memory (~40KB per snapshot)"""
+    self.spacing *= 2
+    _snapshots = {}
+    for _snapshot in sorted(self._snapshots.values(), key=lambda _s: _s[0]):
+      _snapshots.setdefault(_snapshot[0] // self.spacing, _snapshot)
+    self._snapshots = _snapshots
+
+  def count_lines(self):
+    """Returns number of lines, completes the index if required"""
+    if not self.is_complete:
+      for _ in self._iter_blocks(self.covered[0]):
+        pass
+      self._is_dirty and self.save()
+
+    return self.line_count
+
+  def open(self, line=None, offset=None, mode="rt", **kwargs):
+    """Returns file handle positioned at the start of line number or uncompressed byte offset
+
+    :param line: Line number (0 based)
+    :param offset: Uncompressed byte offset
+    :param mode: rt|rb
+    :param kwargs: Passed to io.TextIOWrapper (encoding, errors, newline)
+    """
+    _skip_lines = 0
+    if line is not None:
+      with self._lock:
+        _idx = BisectRight([_l[0] for _l in self.lines], int(line)) - 1
+        _line_no, offset = self.lines[_idx]
+      _skip_lines = int(line) - _line_no
+
+    _fh = IO.BufferedReader(_GzipRangeReader(self, offset or 0), buffer_size=self.chunk_size)
+    for _ in range(_skip_lines):
+      if not _fh.readline():
+        break
+
+    if "b" in mode:
+      return _fh
+
+    return IO.TextIOWrapper(_fh, **kwargs)
+
+class _GzipRangeReader(IO.RawIOBase):
+  """Raw binary stream over GzipIndex._iter_blocks starting at an uncompressed offset"""
+
+  def __init__(self, index, offset=0):
+    self._index = index
+    self._blocks = index._iter_blocks(offset)
+    self._offset = offset
+    self._pending = memoryview(b"")
+
+  def readable(self):
+    return True
+
+  def readinto(self, buffer):
+    while not len(self._pending):
+      try:
+        _block_offset, _block = next(self._blocks)
+      except StopIteration:
+        return 0
+
+      if _block_offset + len(_block) <= self._offset:
+        continue
+
+      self._pending = memoryview(_block)[max(self._offset - _block_offset, 0):]
+
+    _n = min(len(buffer), len(self._pending))
+    buffer[:_n] = self._pending[:_n]
+    self._pending = self._pending[_n:]
+    self._offset += _n
+    return _n
+
+  def close(self):
+    if not self.closed:
+      self._blocks.close()
+      self._index._is_dirty and self._index.save()
+    super().close()
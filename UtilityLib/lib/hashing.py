@@ -0,0 +1,359 @@
+import os as OS, hashlib as HashLib, sqlite3 as SQLite3, threading as Threading, stat as StatModule
+from concurrent import futures as ConcurrentFutures
+from .walk import DirWalker
+
+class HashCache:
+  """
+  Persistent per-file digests in SQLite, an entry is valid while (size, mtime_ns) of the file are unchanged.
+
+  @example
+  _cache = HashCache() # ~/.cache/UtilityLib/hashes.sqlite
+  _cache.get_many("sha256", [(path, size, mtime_ns)])
+  """
+
+  def __init__(self, path=None):
+    self.path = OS.path.abspath(OS.path.expanduser(str(path or OS.path.join("~", ".cache", "UtilityLib", "hashes.sqlite"))))
+    OS.makedirs(OS.path.dirname(self.path), exist_ok=True)
+    self._lock = Threading.Lock()
+    with self._connect() as _conn:
+      _conn.execute("CREATE TABLE IF NOT EXISTS digests (path TEXT, algorithm TEXT, size INTEGER, mtime_ns INTEGER, digest TEXT, PRIMARY KEY (path, algorithm))")
+
+  def _connect(self):
+    return SQLite3.connect(self.path, timeout=60)
+
+  def get_many(self, algorithm, files):
+    """{path: digest} of the files [(path, size, mtime_ns)] with an up to date digest"""
+    _files = {_p: (_s, _m) for _p, _s, _m in files}
+    _digests = {}
+    with self._lock, self._connect() as _conn:
+      _paths = list(_files)
+      for _idx in range(0, len(_paths), 900):
+        _batch = _paths[_idx:_idx + 900]
+        _query = f"SELECT path, size, mtime_ns, digest FROM digests WHERE algorithm = ? AND path IN ({','.join('?' * len(_batch))})"
+        for _path, _size, _mtime_ns, _digest in _conn.execute(_query, [algorithm, *_batch]):
+          if _files[_path] == (_size, _mtime_ns):
+            _digests[_path] = _digest
+
+    return _digests
+
+  def put_many(self, algorithm, rows):
+    """rows: [(path, size, mtime_ns, digest)]"""
+    with self._lock, self._connect() as _conn:
+      _conn.executemany("INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?)", [(_p, algorithm, _s, _m, _d) for _p, _s, _m, _d in rows])
+
+class FileHasher:
+  """
+  File and directory digests with large buffered reads and a thread pool (hashlib releases the GIL).
+
+  Directory digest is a Merkle tree: digest of a directory covers the sorted names and digests of its
+  files and sub-directories, so with a HashCache only new or modified files are read again.
+  Symlinks to files are hashed by the content of their target, dangling symlinks and special files are skipped.
+
+  @example
+  _hasher = FileHasher("sha256", max_workers=8, cache=HashCache())
+  _hasher.hash_dir("/data/run_01")
+  _hasher.write_manifest("/data/run_01", "/data/run_01.sha256")
+  _hasher.verify_manifest("/data/run_01.sha256")
+  """
+
+  buffer_size = 1024 * 1024
+
+  def __init__(self, algorithm="sha256", max_workers=None, cache=None):
+    self.algorithm = algorithm
+    self.max_workers = max_workers if max_workers is not None else min(32, (OS.cpu_count() or 1) + 4)
+    self.cache = cache
+    self.stats = {"hashed": 0, "cached": 0, "bytes": 0}
+
+  @classmethod
+  def hash_file(cls, path, algorithm="sha256", buffer_size=None):
+    """Hex digest of a file, read with readinto into one reused buffer"""
+    _hash = HashLib.new(algorithm)
+    _buffer = bytearray(buffer_size or cls.buffer_size)
+    _view = memoryview(_buffer)
+    with open(path, "rb", buffering=0) as _fh:
+      while True:
+        _num = _fh.readinto(_buffer)
+        if not _num:
+          break
+        _hash.update(_view[:_num])
+
+    return _hash.hexdigest()
+
+  def hash_files(self, files):
+    """{path: digest} for [(path, size, mtime_ns)], digests are taken from the cache when files are unchanged"""
+    _files = list(files)
+    _digests = self.cache.get_many(self.algorithm, _files) if self.cache is not None else {}
+    self.stats["cached"] += len(_digests)
+
+    _pending = [_f for _f in _files if _f[0] not in _digests]
+    if not _pending:
+      return _digests
+
+    _rows = []
+    if self.max_workers <= 1 or len(_pending) == 1:
+      _results = map(lambda _f: self.hash_file(_f[0], self.algorithm), _pending)
+      for _file, _digest in zip(_pending, _results):
+        _rows.append((*_file, _digest))
+    else:
+      with ConcurrentFutures.ThreadPoolExecutor(max_workers=self.max_workers) as _executor:
+        # Large files first to keep the threads busy till the end
+        _pending.sort(key=lambda _f: -_f[1])
+        for _file, _digest in zip(_pending, _executor.map(lambda _f: self.hash_file(_f[0], self.algorithm), _pending)):
+          _rows.append((*_file, _digest))
+
+    self.stats["hashed"] += len(_rows)
+    self.stats["bytes"] += sum(_r[1] for _r in _rows)
+    _digests.update((_r[0], _r[3]) for _r in _rows)
+    if self.cache is not None:
+      self.cache.put_many(self.algorithm, _rows)
+
+    return _digests
+
+  def list_files(self, path):
+    """(dir_path -> [sub_dir_path], dir_path -> [(file_path, size, mtime_ns)]) of the tree"""
+    _dirs, _files = {}, {}
+    _walker = DirWalker(path, max_workers=self.max_workers)
+    for _dir_path, _depth, _dir_entries, _file_entries in _walker.walk():
+      _dirs[_dir_path] = [_d.path for _d in _dir_entries]
+      _files[_dir_path] = []
+      for _entry in _file_entries:
+        try:
+          _stat = _entry.stat()
+        except OSError:
+          # Dangling symlink or removed while listing
+          continue
+        if StatModule.S_ISREG(_stat.st_mode):
+          _files[_dir_path].append((OS.path.abspath(_entry.path), _stat.st_size, _stat.st_mtime_ns))
+
+    if _walker.errors:
+      raise _walker.errors[0][1]
+
+    return _dirs, _files
+
+  def hash_dir(self, path, flag_tree=False):
+    """Merkle digest of a directory
+
+    :param flag_tree: Returns {dir_path: digest} of all the directories instead of the root digest
+    """
+    _path = str(path)
+    _dirs, _files = self.list_files(_path)
+    _digests = self.hash_files(_f for _dir_files in _files.values() for _f in _dir_files)
+
+    _tree = {}
+    # Deepest directories first so that sub-directory digests are available
+    for _dir_path in sorted(_dirs, key=lambda _d: _d.count(OS.sep), reverse=True):
+      _hash = HashLib.new(self.algorithm)
+      _entries = [(OS.path.basename(_f[0]), "f", _digests[_f[0]]) for _f in _files[_dir_path]]
+      _entries.extend((OS.path.basename(_d), "d", _tree.get(_d, "")) for _d in _dirs[_dir_path])
+      for _name, _type, _digest in sorted(_entries):
+        _hash.update(f"{_type} {_name}\0{_digest}\n".encode("utf-8", "surrogateescape"))
+      _tree[_dir_path] = _hash.hexdigest()
+
+    return _tree if flag_tree else _tree[_path]
+
+  def write_manifest(self, path, manifest_path=None):
+    """Writes sha256sum style manifest `<digest>  <relative path>` of the files in a directory (or a file)
+
+    :return: Path of the manifest (Default `<path>.<algorithm>`)
+    """
+    _path = OS.path.abspath(str(path)).rstrip(OS.sep)
+    _manifest_path = str(manifest_path or f"{_path}.{self.algorithm}")
+
+    if OS.path.isdir(_path):
+      _dirs, _files = self.list_files(_path)
+      _files = [_f for _dir_files in _files.values() for _f in _dir_files]
+      _base = _path
+    else:
+      _stat = OS.stat(_path)
+      _files = [(_path, _stat.st_size, _stat.st_mtime_ns)]
+      _base = OS.path.dirname(_path)
+
+    _digests = self.hash_files(_files)
+    _manifest_abs = OS.path.abspath(_manifest_path)
+    _lines = sorted((OS.path.relpath(_p, _base).replace(OS.sep, "/"), _d) for _p, _d in _digests.items() if _p != _manifest_abs)
+
+    with open(_manifest_path, "w", encoding="utf-8", errors="surrogateescape") as _fh:
+      _fh.writelines(f"{_digest}  {_rel_path}\n" for _rel_path, _digest in _lines)
+
+    return _manifest_path
+
+  def verify_manifest(self, manifest_path, base_path=None):
+    """Verifies files listed in a sha256sum style manifest (relative paths are relative to base_path or the manifest)
+
+    :return: {"ok": [paths], "failed": [paths], "missing": [paths]}
+    """
+    _base = str(base_path or OS.path.dirname(OS.path.abspath(str(manifest_path))))
+    _expected = {}
+    with open(manifest_path, "r", encoding="utf-8", errors="surrogateescape") as _fh:
+      for _line in _fh:
+        _line = _line.rstrip("\n")
+        if not _line or _line.startswith("#"):
+          continue
+        _digest, _rel_path = _line.split(" ", 1)
+        # Binary mode marker of sha256sum (`*name`) or text mode (` name`)
+        _rel_path = _rel_path[1:] if _rel_path[:1] in (" ", "*") else _rel_path
+        _expected[OS.path.abspath(OS.path.join(_base, _rel_path))] = _digest.lower()
+
+    _result = {"ok": [], "failed": [], "missing": []}
+    _files = []
+    for _path in _expected:
+      try:
+        _stat = OS.stat(_path)
+        _files.append((_path, _stat.st_size, _stat.st_mtime_ns))
+      except OSError:
+        _result["missing"].append(_path)
+
+    for _path, _digest in self.hash_files(_files).items():
+      _result["ok" if _digest == _expected[_path] else "failed"].append(_path)
+
+    for _key in _result:
+      _result[_key].sort()
+
+    return _result
+
+class DuplicateFinder:
+  """
+  Finds files with identical content in size -> partial hash -> full hash stages so that most files are never read in full.
+
+    1. Files are grouped by size (files sharing an inode, i.e. hardlinks, are one file)
+    2. Same sized files are grouped by a digest of their first and last `partial_size` bytes
+    3. Remaining candidates are hashed in full on a thread pool (FileHasher, optional HashCache)
+
+  @example
+  _finder = DuplicateFinder(max_workers=8)
+  _groups = _finder.find(["/data/downloads", "/backup"])
+  _finder.resolve(_groups, action="hardlink", keep="oldest")
+  """
+
+  partial_size = 16 * 1024
+
+  def __init__(self, algorithm="sha256", max_workers=None, cache=None, min_size=1):
+    """
+    :param algorithm: hashlib algorithm of the full hash
+    :param max_workers: Threads to read files
+    :param cache: HashCache to reuse full digests of unchanged files
+    :param min_size: Smaller files are ignored (Default 1, skips empty files)
+    """
+    self.hasher = FileHasher(algorithm, max_workers, cache)
+    self.min_size = min_size
+    self.links = {} # {path: [paths of the same inode]} for hardlinked files found by collect
+    self.stats = {"files": 0, "same_size": 0, "same_partial": 0, "duplicates": 0, "bytes_read": 0}
+
+  def collect(self, paths):
+    """{(st_dev, st_ino): (path, size, mtime_ns)} of the regular files in paths (files or directories), symlinks are skipped"""
+    _files = {}
+    self.links = {}
+
+    def _add(path, stat):
+      if stat.st_size >= self.min_size:
+        _file = _files.setdefault((stat.st_dev, stat.st_ino), (OS.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+        if stat.st_nlink > 1:
+          self.links.setdefault(_file[0], []).append(OS.path.abspath(path))
+
+    for _path in ([paths] if isinstance(paths, (str, OS.PathLike)) else paths):
+      _path = str(_path)
+      if OS.path.islink(_path):
+        continue
+      if not OS.path.isdir(_path):
+        _add(_path, OS.stat(_path))
+        continue
+
+      for _entry in DirWalker(_path, max_workers=self.hasher.max_workers).files():
+        if not _entry.is_symlink() and _entry.is_file(follow_symlinks=False):
+          _add(_entry.path, _entry.stat(follow_symlinks=False))
+
+    self.stats["files"] = len(_files)
+    return _files
+
+  def get_partial_hash(self, path, size):
+    """Digest of the first and last partial_size bytes (whole content for small files)"""
+    _hash = HashLib.new(self.hasher.algorithm)
+    with open(path, "rb") as _fh:
+      _hash.update(_fh.read(self.partial_size))
+      if size > self.partial_size:
+        _fh.seek(max(size - self.partial_size, self.partial_size))
+        _hash.update(_fh.read(self.partial_size))
+
+    return _hash.hexdigest()
+
+  def _group(self, files, key):
+    _groups = {}
+    for _file in files:
+      _groups.setdefault(key(_file), []).append(_file)
+    return [_g for _g in _groups.values() if len(_g) > 1]
+
+  def find(self, paths):
+    """Groups of duplicate files [[(path, size, mtime_ns)]], largest files first"""
+    _files = list(self.collect(paths).values())
+
+    _groups = self._group(_files, lambda _f: _f[1])
+    self.stats["same_size"] = sum(len(_g) for _g in _groups)
+
+    _candidates = [_f for _g in _groups for _f in _g]
+    _max_workers = self.hasher.max_workers
+    if _max_workers > 1 and len(_candidates) > 1:
+      with ConcurrentFutures.ThreadPoolExecutor(max_workers=_max_workers) as _executor:
+        _partials = dict(zip(_candidates, _executor.map(lambda _f: self.get_partial_hash(_f[0], _f[1]), _candidates)))
+    else:
+      _partials = {_f: self.get_partial_hash(_f[0], _f[1]) for _f in _candidates}
+    self.stats["bytes_read"] += sum(min(_f[1], 2 * self.partial_size) for _f in _candidates)
+
+    _groups = self._group(_candidates, lambda _f: (_f[1], _partials[_f]))
+    self.stats["same_partial"] = sum(len(_g) for _g in _groups)
+
+    # Partial hash covers the whole content of small files
+    _full = [_f for _g in _groups if _g[0][1] > 2 * self.partial_size for _f in _g]
+    _digests = self.hasher.hash_files(_full)
+    self.stats["bytes_read"] += self.hasher.stats["bytes"]
+    self.hasher.stats["bytes"] = 0
+
+    _duplicates = []
+    for _group in _groups:
+      _duplicates.extend(self._group(_group, lambda _f: _digests.get(_f[0])))
+    self.stats["duplicates"] = sum(len(_g) - 1 for _g in _duplicates)
+    return sorted(_duplicates, key=lambda _g: -_g[0][1])
+
+  keep_rules = {
+    "oldest": lambda _f: (_f[2], _f[0]),
+    "newest": lambda _f: (-_f[2], _f[0]),
+    "shortest": lambda _f: (len(_f[0]), _f[0]),
+  }
+
+  def resolve(self, groups, action=None, keep="oldest", flag_dry_run=False):
+    """Keeps one file of every group and hardlinks or deletes the others
+
+    :param groups: Output of find
+    :param action: None (report only)|hardlink|delete
+    :param keep: oldest|newest|shortest (path)|callable((path, size, mtime_ns)) sort key, first file is kept
+    :param flag_dry_run: Only reports what would be done
+
+    :return: [(action, kept_path, duplicate_path, size)], actions that failed are reported as error:<message>
+    """
+    _key = self.keep_rules.get(keep, keep)
+    _actions = []
+    for _group in groups:
+      _kept, *_others = sorted(_group, key=_key)
+      # Every name of a hardlinked duplicate has to go to free its space
+      _others = [(_link, _size) for _path, _size, _mtime_ns in _others for _link in self.links.get(_path, [_path])]
+      for _path, _size in _others:
+        _done = action or "report"
+        if action and not flag_dry_run:
+          try:
+            if action == "hardlink":
+              # Link next to the duplicate and rename over it so that the path never disappears
+              _tmp_path = f"{_path}.utl-link.{OS.getpid()}"
+              OS.link(_kept[0], _tmp_path)
+              try:
+                OS.replace(_tmp_path, _path)
+              except OSError:
+                OS.remove(_tmp_path)
+                raise
+            elif action == "delete":
+              OS.remove(_path)
+            else:
+              raise ValueError(f"Unknown action {action}, expected hardlink or delete.")
+          except OSError as _e:
+            _done = f"error:{_e}"
+        _actions.append((_done, _kept[0], _path, _size))
+
+    return _actions
@@ -1,5 +1,6 @@
 from pathlib import Path
-import os as OS, time as TIME
+import os as OS, time as TIME, errno as ErrNo
+from .statcache import StatCache
 
 class EntityPath(Path):
   """
@@ -120,73 +121,125 @@ class EntityPath(Path):
 
   @property
   def hash(self):
-    if self._hash is None:
+    if self._hash is None or StatCache.active() is not None:
       self._hash = self.get_hash()
     return self._hash
 
-  def get_hash(self, algorithm='sha256'):
+  def get_hash(self, algorithm='sha256', max_workers=None, cache=None):
     """Compute the hash of the file or directory using the specified algorithm.
 
+    Directory hash is a Merkle tree of the digests of all the files and sub-directories (see FileHasher),
+    files are hashed on a thread pool.
+
     :param algorithm: Hash algorithm to use ('md5', 'sha256', etc.)
+    :param max_workers: Threads to hash files of a directory
+    :param cache: True, path or HashCache to reuse digests of unchanged files (size and mtime) across runs
     :return: The computed hash as a hexadecimal string
     """
 
-    if self.is_file():
+    _cache = StatCache.active()
+    if self.is_file() and _cache is not None:
+      # Reused until the file changes
+      _stat = self.stat()
+      self._hash = _cache.get_value(self, f"hash:{algorithm}")
+      if self._hash is None:
+        self._hash = _cache.set_value(self, f"hash:{algorithm}", self._compute_file_hash(algorithm), _stat)
+    elif self.is_file():
       self._hash = self._compute_file_hash(algorithm)
     elif self.is_dir():
-      self._hash = self._compute_directory_hash(algorithm)
+      self._hash = self._compute_directory_hash(algorithm, max_workers, cache)
     else:
       self._hash = None
       raise ValueError(f"{self} is neither a file nor a directory.")
 
     return self._hash
 
-  def _compute_file_hash(self, algorithm):
-    """Helper method to compute the hash of a single file."""
-    import hashlib as _HL
-    _fn_hash = _HL.new(algorithm)
+  def _get_hasher(self, algorithm='sha256', max_workers=None, cache=None):
+    from .hashing import FileHasher, HashCache
+    if cache is True or isinstance(cache, (str, Path)):
+      cache = HashCache(None if cache is True else cache)
 
-    # Read the file in _chunks to avoid memory issues with large files
-    with self.open('rb') as _fh:
-      for _chunk in iter(lambda: _fh.read(4096), b""):
-        _fn_hash.update(_chunk)
+    return FileHasher(algorithm, max_workers, cache or None)
 
-    self._hash = _fn_hash.hexdigest()
+  def _compute_file_hash(self, algorithm):
+    """Helper method to compute the hash of a single file."""
+    from .hashing import FileHasher
+    self._hash = FileHasher.hash_file(str(self), algorithm)
     return self._hash
 
-  def _compute_directory_hash(self, algorithm):
+  def _compute_directory_hash(self, algorithm, max_workers=None, cache=None):
     """Helper method to compute the hash of a directory."""
-    import hashlib as _HL
-    _fn_hash = _HL.new(algorithm)
+    self._hash = self._get_hasher(algorithm, max_workers, cache).hash_dir(str(self))
+    return self._hash
+
+  def write_hash_manifest(self, manifest_path=None, algorithm='sha256', max_workers=None, cache=None):
+    """Writes `<digest>  <relative path>` lines (sha256sum -c compatible) for the files of the directory (or the file)
 
-    for _file_path in sorted(self.files):
-      # Update the hash with the file path relative to the directory
-      _rel_path = str(_file_path.relative_to(self)).encode()
-      _fn_hash.update(_rel_path)
+    :return: EntityPath of the manifest (Default `<path>.<algorithm>`)
+    """
+    return EntityPath(self._get_hasher(algorithm, max_workers, cache).write_manifest(str(self), manifest_path))
+
+  def verify_hash_manifest(self, manifest_path=None, algorithm='sha256', max_workers=None):
+    """Verifies the files listed in the manifest written by write_hash_manifest
 
-      # Update the hash with the file content
-      with _file_path.open('rb') as _fh:
-        for _chunk in iter(lambda: _fh.read(4096), b""):
-          _fn_hash.update(_chunk)
+    :return: {"ok": [paths], "failed": [paths], "missing": [paths]}
+    """
+    _manifest_path = manifest_path or f"{OS.path.abspath(str(self)).rstrip(OS.sep)}.{algorithm}"
+    _base = str(self) if self.is_dir() else OS.path.dirname(OS.path.abspath(str(self)))
+    return self._get_hasher(algorithm, max_workers).verify_manifest(_manifest_path, _base)
 
-    # Update hash with directory names
-    for _dir in sorted(self.dirs):
-      _fn_hash.update(_dir.name.encode())
+  def find_duplicates(self, paths=None, action=None, keep="oldest", algorithm='sha256', max_workers=None, cache=None, min_size=1, flag_dry_run=False):
+    """Files with identical content in this path (and other paths), see DuplicateFinder
 
-    self._hash = _fn_hash.hexdigest()
-    return self._hash
+    Files are grouped by size, then by a hash of their first and last 16KiB, only the remaining candidates are hashed in full.
+
+    :param paths: Additional files/directories to compare with
+    :param action: None|hardlink|delete the duplicates, the file selected by keep stays
+    :param keep: oldest|newest|shortest|callable sort key of (path, size, mtime_ns)
+    :param cache: True, path or HashCache to reuse full digests
+    :param min_size: Smaller files are ignored (Default 1, skips empty files)
+    :param flag_dry_run: Reports the actions without changing files
+
+    :return: [[EntityPath]] with the file to keep first (largest files first) or [(action, kept, duplicate, size)] with action
+    """
+    from .hashing import DuplicateFinder
+
+    _paths = [self] + ([paths] if isinstance(paths, (str, Path)) else list(paths or []))
+    _finder = DuplicateFinder(algorithm, max_workers, self._get_hasher(algorithm, max_workers, cache).cache, min_size)
+    _groups = _finder.find(_paths)
 
-  def _read_lines(self, num_lines=None, strip_nl=False):
+    if action:
+      _actions = _finder.resolve(_groups, action, keep, flag_dry_run)
+      StatCache.discard(*[_a[2] for _a in _actions if _a[0] == action])
+      return _actions
+
+    _key = _finder.keep_rules.get(keep, keep)
+    return [[EntityPath(_f[0]) for _f in sorted(_group, key=_key)] for _group in _groups]
+
+  def _open_text(self, start=0):
+    """Opens file in text mode, gz files are decompressed and jump to `start` line using GzipIndex."""
+    if self.is_gz:
+      from .gzindex import GzipIndex
+      return GzipIndex.get(self).open(line=start)
+
+    _fh = self.open()
+    for _ in range(int(start)):
+      if not _fh.readline():
+        break
+
+    return _fh
+
+  def _read_lines(self, num_lines=None, strip_nl=False, start=0):
     if not self.is_file():
       raise ValueError(f"{self} is not a file.")
 
     try:
       if num_lines is None:
-        with self.open() as _f:
+        with self._open_text(start) as _f:
           for _line in _f:
             yield _line.strip('\n') if strip_nl else _line
       else:
-        with self.open() as _f:
+        with self._open_text(start) as _f:
           for _ in range(int(num_lines)):
             yield next(_f)
 
@@ -199,32 +252,101 @@ class EntityPath(Path):
   readlines = _read_lines
   readline = _read_lines
 
-  def head(self, lines=1):
-    """Return first few lines of a file"""
-    return list(self._read_lines(lines))
-
-  def tail(self, lines=1, buffer_size=4098):
-    """Tail a file and get X lines from the end
-    Source: https://stackoverflow.com/a/13790289
+  def head(self, lines=1, start=0):
+    """Return first few lines of a file (or from `start` line)"""
+    return list(self._read_lines(lines, start=start))
+
+  def _read_last_lines(self, lines=1, buffer_size=65536):
+    """Last lines (bytes) of an uncompressed file, reads blocks backwards only as far as required"""
+    with open(str(self), "rb") as _fh:
+      _position = _fh.seek(0, OS.SEEK_END)
+      _blocks, _num_newlines = [], 0
+      while _position > 0 and _num_newlines <= lines:
+        _size = min(buffer_size, _position)
+        _position -= _size
+        _fh.seek(_position)
+        _block = _fh.read(_size)
+        _blocks.append(_block)
+        _num_newlines += _block.count(b"\n")
+
+    _data = b"".join(reversed(_blocks))
+    _lines = _data.splitlines(keepends=True)
+    # First line is partial unless the start of the file was reached
+    if _position > 0 and len(_lines) > lines:
+      _lines = _lines[1:]
+
+    return _lines[-lines:] if lines > 0 else [], _position + len(_data)
+
+  def tail(self, lines=1, buffer_size=65536, follow=False, interval=1.0, encoding="utf-8"):
+    """Last lines of a file (with line endings), gz files are read from the line found using GzipIndex
+
+    :param lines: Number of lines
+    :param buffer_size: Bytes read at a time from the end
+    :param follow: Returns a generator like `tail -F`, yields the last lines and then the lines appended to the file;
+      truncated files are read from the start and rotated files (new inode at the path) are reopened
+    :param interval: Seconds between polls for follow
+    :param encoding: Lines are decoded after reading
     """
-
-    _fh = self.open()
-    _res_lines = []
-    _block_counter = -1
-
-    import os as OS
-    while len(_res_lines) < lines:
-      try:
-        _fh.seek(_block_counter * buffer_size, OS.SEEK_END)
-      except IOError:
-        # either file is too small, or too many lines requested
-        _fh.seek(0)
-        break
-
-      _block_counter -= 1
-
-    _res_lines = _fh._read_lines()
-    return _res_lines[-lines:]
+    if self.is_gz:
+      from .gzindex import GzipIndex
+      _index = GzipIndex.get(self)
+      _start = max(_index.count_lines() - int(lines), 0)
+      with _index.open(line=_start, mode="rt", encoding=encoding) as _fh:
+        _lines = _fh.readlines()
+      # count_lines counts line ends, an unterminated last line is one more
+      _lines = _lines[len(_lines) - int(lines):] if len(_lines) > int(lines) else _lines
+      return iter(_lines) if follow else _lines
+
+    _lines, _position = self._read_last_lines(int(lines), buffer_size)
+    _lines = [_l.decode(encoding, errors="replace") for _l in _lines]
+
+    if follow:
+      return self._follow(_lines, _position, interval, encoding)
+
+    return _lines
+
+  def _follow(self, lines, position, interval=1.0, encoding="utf-8"):
+    """Generator for tail(follow=True)"""
+    yield from lines
+
+    _path = str(self)
+    _fh = open(_path, "rb")
+    _fh.seek(position)
+    _inode = OS.fstat(_fh.fileno()).st_ino
+    _partial = b""
+    try:
+      while True:
+        _data = _fh.read(1024 * 1024)
+        if _data:
+          _data = _partial + _data
+          _end = _data.rfind(b"\n") + 1
+          _partial = _data[_end:]
+          for _line in _data[:_end].splitlines(keepends=True):
+            yield _line.decode(encoding, errors="replace")
+          continue
+
+        TIME.sleep(interval)
+
+        try:
+          _stat = OS.stat(_path)
+        except FileNotFoundError:
+          # Rotated, new file not created yet
+          continue
+
+        if _stat.st_ino != _inode:
+          # Rotated, drains the old file before switching to the new one
+          for _line in (_partial + _fh.read()).splitlines(keepends=True):
+            yield _line.decode(encoding, errors="replace")
+          _fh.close()
+          _fh = open(_path, "rb")
+          _inode = OS.fstat(_fh.fileno()).st_ino
+          _partial = b""
+        elif _stat.st_size < _fh.tell():
+          # Truncated (copytruncate)
+          _fh.seek(0)
+          _partial = b""
+    finally:
+      _fh.close()
 
   def _read_file(self, method=None):
     """Read the text from the file.
@@ -253,24 +375,86 @@ class EntityPath(Path):
     with self.open(mode) as _f:
       _f.write(data)
 
+    StatCache.discard(self)
     return self.exists()
 
   write = write_text
 
-  def list_files(self, relative=True):
-    """List all files in the directory."""
+  _sort_keys = {
+    "name": lambda _e: _e.name,
+    "size": lambda _e: _e.stat().st_size,
+    "mtime": lambda _e: _e.stat().st_mtime_ns,
+  }
+
+  def scan(self, file_type="any", pattern=None, filter=None, sort=None, reverse=False):
+    """Yields os.DirEntry objects of the directory (not recursive)
+
+    File types come from the directory listing (no stat per entry except for symlinks), sorting by size/mtime
+    uses the stat cached on the DirEntry.
+
+    :param file_type: any|file|dir
+    :param pattern: fnmatch pattern for the name (e.g., *.tsv)
+    :param filter: callable(DirEntry) -> bool
+    :param sort: None (directory order)|name|size|mtime|callable(DirEntry)
+    :param reverse: Reverse sort order
+    """
     if not self.is_dir():
       raise ValueError(f"{self} is not a directory.")
 
-    _files = []
-    for _f in self.iterdir():
-      if _f.is_file():
-        _fp = EntityPath(_f)
-        if relative == True:
-          _fp = _fp.rel_path() # Relative to cwd
-        _files.append(_fp)
+    if pattern:
+      from fnmatch import fnmatchcase as _fnmatch
+
+    def _entries():
+      with OS.scandir(self) as _scandir:
+        for _entry in _scandir:
+          if file_type == "file" and not _entry.is_file():
+            continue
+          if file_type == "dir" and not _entry.is_dir():
+            continue
+          if pattern and not _fnmatch(_entry.name, pattern):
+            continue
+          if filter and not filter(_entry):
+            continue
+          yield _entry
+
+    if sort is None:
+      yield from _entries()
+    else:
+      yield from sorted(_entries(), key=self._sort_keys.get(sort, sort), reverse=reverse)
+
+  def _get_child_method(self):
+    """Joins a name without parsing it again (pathlib internal, / on other versions)"""
+    return getattr(self, "_make_child_relpath", None) or self.__truediv__
+
+  def iter_files(self, pattern=None, filter=None, sort=None, reverse=False):
+    """Generator of files in the directory as EntityPath (see scan for the options)"""
+    _child = self._get_child_method()
+    for _entry in self.scan("file", pattern, filter, sort, reverse):
+      yield _child(_entry.name)
+
+  def iter_dirs(self, pattern=None, filter=None, sort=None, reverse=False):
+    """Generator of sub-directories as EntityPath (see scan for the options)"""
+    _child = self._get_child_method()
+    for _entry in self.scan("dir", pattern, filter, sort, reverse):
+      yield _child(_entry.name)
+
+  def iter_items(self, pattern=None, filter=None, sort=None, reverse=False):
+    """Generator of files and directories as EntityPath (see scan for the options)"""
+    _child = self._get_child_method()
+    for _entry in self.scan("any", pattern, filter, sort, reverse):
+      yield _child(_entry.name)
+
+  def list_files(self, relative=True, **kwargs):
+    """List all files in the directory.
+
+    :param relative: Paths relative to this path (as joined), False for absolute paths
+    :param kwargs: pattern, filter, sort, reverse (see scan)
+    """
+    _files = self.iter_files(**kwargs)
+    if relative != True:
+      return [EntityPath(OS.path.abspath(_f)) for _f in _files]
 
-    return _files
+    return list(_files)
 
   @property
   def files(self):
@@ -284,20 +468,15 @@ class EntityPath(Path):
 
   _dirs = dirs
 
-  def list_dirs(self):
-    """List all directories in the directory."""
-    if not self.is_dir():
-      raise ValueError(f"{self} is not a directory.")
-    return [EntityPath(_d) for _d in self.iterdir() if _d.is_dir()]
+  def list_dirs(self, **kwargs):
+    """List all directories in the directory (kwargs: pattern, filter, sort, reverse, see scan)."""
+    return list(self.iter_dirs(**kwargs))
 
   folders = list_dirs
 
-  def list_items(self):
-    """List all items (files and directories) in the directory."""
-    if not self.is_dir():
-      raise ValueError(f"{self} is not a directory.")
-
-    return [EntityPath(_i) for _i in self.iterdir()]
+  def list_items(self, **kwargs):
+    """List all items (files and directories) in the directory (kwargs: pattern, filter, sort, reverse, see scan)."""
+    return list(self.iter_items(**kwargs))
 
   @property
   def items(self):
@@ -307,26 +486,38 @@ class EntityPath(Path):
   _all = items
 
   is_protected = True
-  def delete(self, is_protected=None):
+  def delete(self, is_protected=None, flag_trash=False, max_workers=None):
     self.is_protected = is_protected if not is_protected is None else self.is_protected
 
-    """Delete the file or directory."""
+    """Delete the file or directory.
+
+    :param flag_trash: Renames into a staging directory and deletes on a background thread
+    :param max_workers: Threads to delete files of a directory tree (parallel scandir)
+    """
     if self.is_protected:
       raise ValueError(f"{self} is not safe to delete. pass is_protected=False enable accidental deletion.")
 
-    if self.is_file():
+    from .trash import Trash
+
+    if not OS.path.lexists(self):
+      # Already deleted or didn't exist
+      return self.exists()
+
+    if flag_trash:
+      try:
+        Trash.get().put(self)
+        StatCache.discard(self, flag_recursive=True)
+        return self.exists()
+      except OSError:
+        pass
+
+    if self.is_file() or self.is_symlink():
       self.unlink()
+      StatCache.discard(self)
       return self.exists()
     elif self.is_dir():
-      for _item in self.iterdir():
-        if _item.is_dir():
-          EntityPath(_item).delete(is_protected=self.is_protected)
-        else:
-          _item.unlink()
-      self.rmdir()
-      return self.exists()
-    elif not self.exists():
-      # Already deleted or didn't exist
+      Trash.remove_tree(self, max_workers)
+      StatCache.discard(self, flag_recursive=True)
       return self.exists()
     else:
       raise ValueError(f"{self} is neither a file nor a directory.")
@@ -341,6 +532,7 @@ class EntityPath(Path):
     else:
       Path(str(self)).mkdir(parents=True, exist_ok=True)
 
+    StatCache.discard(self)
     return self
 
   def move(self, destination):
@@ -356,6 +548,7 @@ class EntityPath(Path):
 
     import shutil as _SHUTIL
     _SHUTIL.move(str(self), str(destination))
+    StatCache.discard(self, destination, flag_recursive=True)
     return EntityPath(destination)
 
   def copy(self, destination):
@@ -372,6 +565,7 @@ class EntityPath(Path):
     elif self.is_dir():
       _SHUTIL.copytree(str(self), str(destination))
 
+    StatCache.discard(destination, flag_recursive=True)
     return destination
 
   def get_match(self, pattern="*txt"):
@@ -400,13 +594,25 @@ class EntityPath(Path):
   ext_type = search
   file_type = search
 
-  def get_size(self, converter=None):
-    """Return the size of the file or directory."""
+  def get_size(self, converter=None, flag_blocks=False, max_workers=None, flag_cache=False):
+    """Return the size of the file or directory.
+
+    Directory size is the total of the files in the tree (see DiskUsage): listed in parallel,
+    hardlinked files counted once and symlinks not followed.
+
+    :param converter: Callable applied on the size (e.g., convert_bytes)
+    :param flag_blocks: Allocated bytes (like du) instead of the apparent size
+    :param max_workers: Threads listing directories
+    :param flag_cache: Reuses totals of directories with unchanged mtime (Default False),
+      files rewritten in place do not change the mtime of their directory and are missed
+    """
 
     if self.is_file():
-      self._size = self.stat().st_size
+      _stat = self.stat()
+      self._size = _stat.st_blocks * 512 if flag_blocks else _stat.st_size
     elif self.is_dir():
-      self._size = sum(f.stat().st_size for f in self.rglob('*') if f.is_file())
+      from .du import DiskUsage
+      self._size = DiskUsage.get().size(self, flag_blocks, flag_cache, max_workers)
     else:
       raise ValueError(f"{self} is neither a file nor a directory.")
 
@@ -419,7 +625,7 @@ class EntityPath(Path):
 
   @property
   def size(self):
-    if self._size is None:
+    if self._size is None or StatCache.active() is not None:
       self._size = self.get_size()
 
     return self._size
@@ -467,14 +673,26 @@ class EntityPath(Path):
 
   @property
   def stats(self):
-    if self._stats is None:
+    if self._stats is None or StatCache.active() is not None:
       self.get_stats()
     return self._stats
 
   def get_stats(self):
-    self._stats = OS.stat(str(self))
+    self._stats = self.stat()
     return self._stats
 
+  def stat(self, *, follow_symlinks=True):
+    """os.stat result, served from the process wide StatCache when enabled (also used by exists, is_file, is_dir)"""
+    _cache = StatCache.active()
+    if _cache is None or not follow_symlinks:
+      return super().stat(follow_symlinks=follow_symlinks)
+
+    _stat = _cache.stat(self)
+    if _stat is None:
+      raise FileNotFoundError(ErrNo.ENOENT, OS.strerror(ErrNo.ENOENT), str(self))
+
+    return _stat
+
   @property
   def permission(self):
     return oct(self.stats.st_mode)
@@ -0,0 +1,194 @@
+import os as OS, gzip as GZip
+from concurrent import futures as ConcurrentFutures
+from .gzindex import GzipIndex
+
+class FileSplitter:
+  """
+  Splits large text files into shards at record boundaries without reading the whole file into Python.
+
+  Cut points are placed every `size / num_parts` (or `shard_size`) bytes and moved forward to the next record boundary
+  by reading a few KB around them, then the byte ranges are copied into the shards on a thread pool.
+  File reads/writes and zlib compression release the GIL.
+
+  Records are
+    * lines (delimiter None)
+    * start marker at the beginning of a line, e.g., ">" for FASTA
+    * end marker at the beginning of a line with `flag_end=True`, e.g., "$$$$" for SDF
+
+  gzip input is read through GzipIndex (uncompressed offsets), the first pass completes the index.
+
+  @example
+  _splitter = FileSplitter("proteins.fasta", ">")
+  _manifest = _splitter.split("shards/", num_parts=8, compresslevel=6)
+  # [{"path": "shards/proteins.part001.fasta.gz", "start": 0, "end": 1048576, "records": 5012}, ...]
+  """
+
+  block_size = 16 * 1024 * 1024
+  end_markers = {"$$$$"}
+
+  def __init__(self, path, delimiter=None, header_lines=0, flag_end=None):
+    """
+    :param path: Plain or gzip file
+    :param delimiter: None for lines, record marker at the start of a line otherwise (">" or "$$$$")
+    :param header_lines: Lines at the start of the file copied to every shard (e.g., 1 for TSV with header)
+    :param flag_end: Marker ends a record (Default True for $$$$)
+    """
+    self.path = str(path)
+    self.delimiter = delimiter
+    _marker = (delimiter or "").encode() if isinstance(delimiter, (str, type(None))) else delimiter
+    self.pattern = b"\n" + _marker
+    self.flag_end = (delimiter in self.end_markers) if flag_end is None else flag_end
+    self.header_lines = int(header_lines or 0)
+
+    with open(self.path, "rb") as _fh:
+      self.is_gz = _fh.read(2) == b"\x1f\x8b"
+
+    self.size = self._get_size()
+    self.header = self._read_header()
+
+  def _get_size(self):
+    if not self.is_gz:
+      return OS.path.getsize(self.path)
+
+    # Complete index also keeps decompressor snapshots to start the shards from
+    self.index = GzipIndex.get(self.path)
+    self.index.count_lines()
+    return self.index.size
+
+  def open_at(self, offset):
+    """Binary file handle at the (uncompressed) offset"""
+    if self.is_gz:
+      return self.index.open(offset=offset, mode="rb")
+
+    _fh = open(self.path, "rb")
+    _fh.seek(offset)
+    return _fh
+
+  def _read_header(self):
+    if not self.header_lines:
+      return b""
+
+    with self.open_at(0) as _fh:
+      return b"".join(_fh.readline() for _ in range(self.header_lines))
+
+  def find_boundary(self, offset):
+    """First record boundary at or after offset (file size if none)"""
+    _start = len(self.header)
+    if offset <= _start:
+      return _start
+
+    # One byte before offset to see a newline right in front of it
+    _pos = offset - 1
+    _carry = b""
+    with self.open_at(_pos) as _fh:
+      while True:
+        _block = _fh.read(1024 * 1024)
+        if not _block:
+          return self.size
+
+        _data = _carry + _block
+        _idx = _data.find(self.pattern)
+        if _idx >= 0:
+          _boundary = _pos - len(_carry) + _idx + 1
+          if not self.flag_end:
+            return _boundary
+
+          # Record ends with the line holding the marker
+          return self._next_line(_boundary)
+
+        _carry = _data[-(len(self.pattern) - 1):] if len(self.pattern) > 1 else b""
+        _pos += len(_block)
+
+  def _next_line(self, offset):
+    with self.open_at(offset) as _fh:
+      _line = _fh.readline()
+    return min(offset + len(_line), self.size)
+
+  def plan(self, num_parts=None, shard_size=None):
+    """[(start, end)] byte ranges of the shards, empty ranges are dropped"""
+    _start = len(self.header)
+    _length = self.size - _start
+    if shard_size:
+      _step = int(shard_size)
+    else:
+      _step = -(-_length // max(int(num_parts or 1), 1)) or 1
+
+    _cuts = [_start]
+    _offset = _start + _step
+    while _offset < self.size:
+      _boundary = self.find_boundary(max(_offset, _cuts[-1] + 1))
+      if _boundary >= self.size:
+        break
+      _cuts.append(_boundary)
+      # Next cut is relative to the boundary so that shards stay close to shard_size
+      _offset = (_boundary + _step) if shard_size else max(_offset + _step, _boundary + 1)
+
+    _cuts.append(self.size)
+    return [(_s, _e) for _s, _e in zip(_cuts, _cuts[1:]) if _e > _s]
+
+  def count_records(self, data, previous=b"\n"):
+    """Records starting (or ending for end markers) in data, previous is the byte(s) in front of data"""
+    _carry = len(self.pattern) - 1
+    _count = data.count(self.pattern)
+    if _carry:
+      # Matches across previous and data
+      _count += (previous[-_carry:] + data[:_carry]).count(self.pattern)
+    return _count
+
+  def write_range(self, start, end, destination, compresslevel=None):
+    """Copies [start, end) with the header into destination
+
+    :return: Number of records
+    """
+    _records, _previous = 0, b"\n"
+    _open = (lambda _p: GZip.open(_p, "wb", compresslevel=compresslevel)) if compresslevel is not None else (lambda _p: open(_p, "wb"))
+    with self.open_at(start) as _ifh, _open(destination) as _ofh:
+      _ofh.write(self.header)
+      _remaining = end - start
+      while _remaining > 0:
+        _block = _ifh.read(min(self.block_size, _remaining))
+        if not _block:
+          break
+        _remaining -= len(_block)
+        _records += self.count_records(_block, _previous)
+        _previous = _block[-len(self.pattern):]
+        _ofh.write(_block)
+
+    if self.pattern == b"\n" and _previous != b"\n":
+      # Last line without newline
+      _records += 1
+
+    return _records
+
+  def get_shard_path(self, destination, num, compresslevel=None):
+    _name = OS.path.basename(self.path)
+    if _name.endswith(".gz"):
+      _name = _name[:-3]
+    _stem, _ext = OS.path.splitext(_name)
+    _ext = f"{_ext}.gz" if compresslevel is not None else _ext
+    return OS.path.join(destination, f"{_stem}.part{num:03d}{_ext}")
+
+  def split(self, destination=None, num_parts=None, shard_size=None, compresslevel=None, max_workers=None):
+    """Writes the shards
+
+    :param destination: Directory (Default: directory of the file)
+    :param num_parts: Number of shards (Default 2), ignored when shard_size is given
+    :param shard_size: Approximate bytes (uncompressed) per shard
+    :param compresslevel: gzip the shards at this level (None for plain)
+    :param max_workers: Threads writing shards
+
+    :return: Manifest [{"path", "start", "end", "records"}] in file order
+    """
+    _destination = str(destination or OS.path.dirname(OS.path.abspath(self.path)))
+    OS.makedirs(_destination, exist_ok=True)
+
+    _ranges = self.plan(num_parts or (None if shard_size else 2), shard_size)
+    _manifest = [{"path": self.get_shard_path(_destination, _num + 1, compresslevel), "start": _s, "end": _e, "records": 0} for _num, (_s, _e) in enumerate(_ranges)]
+
+    _max_workers = max_workers or min(len(_manifest), (OS.cpu_count() or 1) + 4) or 1
+    with ConcurrentFutures.ThreadPoolExecutor(max_workers=_max_workers) as _executor:
+      _futures = {_executor.submit(self.write_range, _m["start"], _m["end"], _m["path"], compresslevel): _m for _m in _manifest}
+      for _future in ConcurrentFutures.as_completed(_futures):
+        _futures[_future]["records"] = _future.result()
+
+    return _manifest
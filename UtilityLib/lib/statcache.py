@@ -0,0 +1,161 @@
+import os as OS, threading as Threading, time as TIME
+from collections import OrderedDict
+
+class StatCache:
+  """
+  Opt-in, process wide cache of file metadata keyed by absolute path.
+
+    * `stat()` results are served without a system call for `ttl` seconds, missing paths are not cached
+      (files created by any writer are seen right away)
+    * Derived values (e.g., file hash) are stored with the (st_dev, st_ino, st_mtime_ns, st_size) signature
+      of the file and are kept across TTL expiry as long as a fresh stat returns the same signature
+    * At most `max_entries` paths are kept, least recently used paths are dropped first
+    * `stats()` returns hits, misses, revalidated, invalidated and hit_rate
+
+  Entries can be stale for up to ttl seconds for changes made by other processes,
+  paths changed through EntityPath/FileSystemUtility are discarded right away.
+
+  @example
+  StatCache.enable(ttl=60, max_entries=200000)
+  EntityPath("data/big.tsv").size # stat
+  EntityPath("data/big.tsv").size # served from the cache
+  StatCache.active().stats()
+  """
+
+  _active = None
+  _active_lock = Threading.Lock()
+
+  def __init__(self, ttl=30, max_entries=100000):
+    self.ttl = ttl
+    self.max_entries = int(max_entries)
+    self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "invalidated": 0, "evicted": 0}
+    self._entries = OrderedDict() # {path: [stat_result|None, checked_at, signature, {key: value}]}
+    self._lock = Threading.RLock()
+
+  @classmethod
+  def enable(cls, ttl=30, max_entries=100000):
+    """Activates a new process wide cache"""
+    with cls._active_lock:
+      cls._active = cls(ttl, max_entries)
+    return cls._active
+
+  @classmethod
+  def disable(cls):
+    with cls._active_lock:
+      cls._active = None
+
+  @classmethod
+  def active(cls):
+    """Process wide cache or None if not enabled"""
+    return cls._active
+
+  @classmethod
+  def discard(cls, *paths, flag_recursive=False):
+    """Drops paths from the active cache, no-op when disabled
+
+    :param flag_recursive: Also drops the entries below the paths (directories)
+    """
+    _cache = cls._active
+    if _cache is not None:
+      for _path in paths:
+        _cache.invalidate(_path, flag_recursive)
+
+  @staticmethod
+  def get_key(path):
+    return OS.path.abspath(OS.fspath(path))
+
+  @staticmethod
+  def get_signature(stat):
+    return None if stat is None else (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+  def _get_entry(self, path):
+    """Entry of the path, re-stats when the TTL has expired"""
+    _key = self.get_key(path)
+    _now = TIME.monotonic()
+    with self._lock:
+      _entry = self._entries.get(_key)
+      if _entry is not None and (self.ttl is None or _now - _entry[1] < self.ttl):
+        self._entries.move_to_end(_key)
+        self.counters["hits"] += 1
+        return _entry
+
+    try:
+      _stat = OS.stat(_key)
+    except (FileNotFoundError, NotADirectoryError):
+      _stat = None
+
+    _signature = self.get_signature(_stat)
+    with self._lock:
+      if _stat is None:
+        # Misses are not kept, a later write through any API must be visible
+        self.counters["misses"] += 1
+        if self._entries.pop(_key, None) is not None:
+          self.counters["invalidated"] += 1
+        return [None, _now, None, {}]
+
+      if _entry is not None and _entry[2] == _signature:
+        # Unchanged, derived values are still valid
+        self.counters["revalidated"] += 1
+        _entry[0], _entry[1] = _stat, _now
+      else:
+        self.counters["misses"] += 1
+        _entry = [_stat, _now, _signature, {}]
+
+      self._entries[_key] = _entry
+      self._entries.move_to_end(_key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+        self.counters["evicted"] += 1
+
+    return _entry
+
+  def stat(self, path):
+    """os.stat result or None if the path does not exist"""
+    return self._get_entry(path)[0]
+
+  def exists(self, path):
+    return self.stat(path) is not None
+
+  def get_value(self, path, key, default=None):
+    """Derived value stored for the current version of the file"""
+    _entry = self._get_entry(path)
+    return _entry[3].get(key, default)
+
+  def set_value(self, path, key, value, stat=None):
+    """Stores a derived value, stat is the os.stat result the value was computed for (Default: cached stat)
+
+    Value is dropped if the file has changed since stat.
+    """
+    _entry = self._get_entry(path)
+    with self._lock:
+      if stat is None or self.get_signature(stat) == _entry[2]:
+        _entry[3][key] = value
+
+    return value
+
+  def invalidate(self, path, flag_recursive=False):
+    _key = self.get_key(path)
+    with self._lock:
+      _keys = [_key]
+      if flag_recursive:
+        _prefix = _key.rstrip(OS.sep) + OS.sep
+        _keys.extend(_k for _k in self._entries if _k.startswith(_prefix))
+
+      for _k in _keys:
+        if self._entries.pop(_k, None) is not None:
+          self.counters["invalidated"] += 1
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def __len__(self):
+    return len(self._entries)
+
+  def stats(self):
+    with self._lock:
+      _stats = dict(self.counters)
+    _total = _stats["hits"] + _stats["misses"] + _stats["revalidated"]
+    _stats["hit_rate"] = _stats["hits"] / _total if _total else 0
+    _stats["entries"] = len(self)
+    return _stats
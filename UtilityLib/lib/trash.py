@@ -0,0 +1,135 @@
+import os as OS, threading as Threading, queue as Queue, uuid as UUID, atexit as AtExit
+from .walk import DirWalker
+
+class Trash:
+  """
+  Deletes paths in constant time for the caller by renaming them into a staging directory
+  (`<parent>/.utl-trash`, same file system so the rename is atomic) and purging them on a background thread.
+
+  Pending deletions are completed before the interpreter exits, `wait()` blocks until the queue is empty.
+
+  @example
+  _trash = Trash.get()
+  _trash.put("scratch/run_001")
+  _trash.wait()
+
+  Trash.remove_tree("scratch/run_002", max_workers=8)
+  """
+
+  staging_name = ".utl-trash"
+  _default = None
+  _default_lock = Threading.Lock()
+
+  def __init__(self, max_workers=None):
+    self.max_workers = max_workers
+    self.errors = [] # [(staged_path, exception)]
+    self._queue = Queue.Queue()
+    self._thread = None
+    self._lock = Threading.Lock()
+
+  @classmethod
+  def get(cls, **kwargs):
+    """Process wide trash"""
+    with cls._default_lock:
+      if cls._default is None:
+        cls._default = cls(**kwargs)
+    return cls._default
+
+  @staticmethod
+  def remove_tree(path, max_workers=None, flag_files_only=False):
+    """Deletes a directory tree, files are unlinked on a thread pool (one scandir per directory)
+
+    :param path: File or directory, symlinks are unlinked but never followed
+    :param max_workers: Threads, 1 to delete in the current thread
+    :param flag_files_only: Keeps the directory structure
+    :return: Number of deleted files
+    """
+    _path = str(path)
+    if OS.path.islink(_path) or not OS.path.isdir(_path):
+      OS.unlink(_path)
+      return 1
+
+    _walker = DirWalker(_path, max_workers=max_workers)
+
+    def _remove_files(dir_path, depth):
+      _dirs, _files = _walker.scan(dir_path)
+      _removed = 0
+      for _entry in _files + [_d for _d in _dirs if _d.is_symlink()]:
+        try:
+          OS.unlink(_entry.path)
+          _removed += 1
+        except FileNotFoundError:
+          pass
+      return _walker.descend(_dirs), (depth, dir_path, _removed)
+
+    _dirs, _removed = [], 0
+    for _depth, _dir_path, _num in _walker.map(_remove_files):
+      _dirs.append((_depth, _dir_path))
+      _removed += _num
+
+    if _walker.errors:
+      raise _walker.errors[0][1]
+
+    if not flag_files_only:
+      # Deepest directories first
+      for _depth, _dir_path in sorted(_dirs, reverse=True):
+        OS.rmdir(_dir_path)
+
+    return _removed
+
+  def _get_staging_dir(self, path):
+    _staging = OS.path.join(OS.path.dirname(path), self.staging_name)
+    OS.makedirs(_staging, exist_ok=True)
+    return _staging
+
+  def put(self, path):
+    """Moves path into the staging directory and queues it for deletion
+
+    :return: Staged path
+    :raises OSError: If path cannot be renamed (e.g., read-only parent directory)
+    """
+    _path = OS.path.abspath(str(path)).rstrip(OS.sep)
+    for _attempt in range(3):
+      _staged = OS.path.join(self._get_staging_dir(_path), f"{UUID.uuid4().hex}-{OS.path.basename(_path)}")
+      try:
+        OS.rename(_path, _staged)
+        break
+      except FileNotFoundError:
+        # Staging directory removed by the purge thread in between
+        if not OS.path.lexists(_path) or _attempt == 2:
+          raise
+
+    self._queue.put(_staged)
+    self._start()
+    return _staged
+
+  def _start(self):
+    with self._lock:
+      if self._thread is None or not self._thread.is_alive():
+        self._thread = Threading.Thread(target=self._purge, name="UtilityLibTrash", daemon=True)
+        self._thread.start()
+        AtExit.register(self.wait)
+
+  def _purge(self):
+    while True:
+      _staged = self._queue.get()
+      try:
+        self.remove_tree(_staged, self.max_workers)
+        try:
+          # Removed once the last staged item is gone
+          OS.rmdir(OS.path.dirname(_staged))
+        except OSError:
+          pass
+      except Exception as _e:
+        self.errors.append((_staged, _e))
+      finally:
+        self._queue.task_done()
+
+  @property
+  def pending(self):
+    return self._queue.unfinished_tasks
+
+  def wait(self):
+    """Blocks until all the queued paths are deleted"""
+    self._queue.join()
+    return not self.errors
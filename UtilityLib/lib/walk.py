@@ -0,0 +1,243 @@
+import os as OS, re as RegEx
+from collections import deque as DeQue
+from concurrent import futures as ConcurrentFutures
+
+class DirWalker:
+  """
+  Directory tree walker using os.scandir with optional fan-out on a thread pool.
+
+  Every directory is listed once, DirEntry objects are returned as-is so that the
+  file type and stat information cached by scandir are reused by the callers.
+  os.scandir/stat release the GIL, so listing directories on threads is effective
+  on network and slow file systems.
+
+  @example
+  _walker = DirWalker("/data", max_depth=2, prune={".git", "node_modules"})
+  for _dir, _depth, _dirs, _files in _walker.walk():
+    print(_dir, len(_files))
+
+  # Custom work per directory, func(dir_path, depth) returns (sub_dirs, result)
+  for _result in _walker.map(func):
+    pass
+  """
+
+  def __init__(self, path, max_depth=-1, max_workers=None, follow_symlinks=False, prune=None):
+    """
+    :param path: Root directory
+    :param max_depth: -1 for all, 0 to list only the root directory
+    :param max_workers: Threads, 1 (or 0) to walk in the current thread
+    :param follow_symlinks: Descend into symlinked directories (listed as directories but not descended otherwise)
+    :param prune: Names of directories (or callable(DirEntry) -> bool) to skip
+    """
+    self.path = str(path)
+    self.max_depth = -1 if max_depth is None else int(max_depth)
+    self.max_workers = max_workers if max_workers is not None else min(32, (OS.cpu_count() or 1) * 4)
+    self.follow_symlinks = follow_symlinks
+    self.prune = prune
+    self.errors = [] # [(path, exception)]
+
+  def _is_pruned(self, entry):
+    if not self.prune:
+      return False
+    if callable(self.prune):
+      return self.prune(entry)
+    return entry.name in self.prune
+
+  def scan(self, path):
+    """Returns ([dir DirEntry], [file DirEntry]) of a directory, unreadable directories are recorded in errors"""
+    _dirs, _files = [], []
+    try:
+      with OS.scandir(path) as _entries:
+        for _entry in _entries:
+          try:
+            _is_dir = _entry.is_dir()
+          except OSError:
+            _is_dir = False
+
+          if _is_dir:
+            if not self._is_pruned(_entry):
+              _dirs.append(_entry)
+          else:
+            _files.append(_entry)
+    except OSError as _e:
+      self.errors.append((path, _e))
+
+    return _dirs, _files
+
+  def descend(self, dirs):
+    """Paths of the directories to walk into (symlinked directories only with follow_symlinks)"""
+    return [_d.path for _d in dirs if self.follow_symlinks or not _d.is_symlink()]
+
+  def _list(self, path, depth):
+    _dirs, _files = self.scan(path)
+    return self.descend(_dirs), (path, depth, _dirs, _files)
+
+  def _can_descend(self, depth):
+    return self.max_depth < 0 or depth < self.max_depth
+
+  def map(self, func):
+    """Yields func(dir_path, depth)[1] for every directory, in completion order
+
+    :param func: Callable(dir_path, depth) -> (sub_dir_paths, result), runs on the thread pool
+    """
+    _pending = DeQue([(self.path, 0)])
+
+    if self.max_workers is None or self.max_workers <= 1:
+      while _pending:
+        _path, _depth = _pending.pop()
+        _sub_dirs, _result = func(_path, _depth)
+        if self._can_descend(_depth):
+          _pending.extend((_d, _depth + 1) for _d in reversed(_sub_dirs) if self._can_follow(_d))
+        yield _result
+      return
+
+    _executor = ConcurrentFutures.ThreadPoolExecutor(max_workers=self.max_workers)
+    _running = {}
+    try:
+      while _pending or _running:
+        # Bounded number of queued directories keeps the memory flat for wide trees
+        while _pending and len(_running) < self.max_workers * 2:
+          _path, _depth = _pending.pop()
+          _running[_executor.submit(func, _path, _depth)] = _depth
+
+        _done, _ = ConcurrentFutures.wait(_running, return_when=ConcurrentFutures.FIRST_COMPLETED)
+        for _future in _done:
+          _depth = _running.pop(_future)
+          _sub_dirs, _result = _future.result()
+          if self._can_descend(_depth):
+            _pending.extend((_d, _depth + 1) for _d in _sub_dirs if self._can_follow(_d))
+          yield _result
+    finally:
+      for _future in _running:
+        _future.cancel()
+      _executor.shutdown(wait=True)
+
+  def _can_follow(self, path):
+    """Avoids cycles when following symlinks: skips links pointing to one of their own ancestors"""
+    if not self.follow_symlinks or not OS.path.islink(path):
+      return True
+
+    _real = OS.path.realpath(path)
+    _parent = OS.path.realpath(OS.path.dirname(path))
+    return not (_parent == _real or _parent.startswith(_real.rstrip(OS.sep) + OS.sep))
+
+  def walk(self):
+    """Yields (dir_path, depth, [dir DirEntry], [file DirEntry]) for every directory"""
+    return self.map(self._list)
+
+  def files(self):
+    """Yields file DirEntry objects"""
+    for _dir, _depth, _dirs, _files in self.walk():
+      yield from _files
+
+  def find(self, matcher, file_type="any", skip_symlinks=False):
+    """Yields paths matched by a PathMatcher in a single traversal
+
+    :param matcher: PathMatcher
+    :param file_type: any|file|dir
+    :param skip_symlinks: Ignores symlinks altogether
+    """
+    _root_len = len(self.path.rstrip("/" + OS.sep)) + 1
+
+    def _find(dir_path, depth):
+      _dirs, _files = self.scan(dir_path)
+      if skip_symlinks:
+        _dirs = [_d for _d in _dirs if not _d.is_symlink()]
+        _files = [_f for _f in _files if not _f.is_symlink()]
+
+      _prefix = dir_path[_root_len:].replace(OS.sep, "/")
+      _prefix = f"{_prefix}/" if _prefix else ""
+
+      _matched = []
+      if file_type != "file":
+        _matched.extend(_d.path for _d in _dirs if matcher.match(f"{_prefix}{_d.name}", _d.name, True))
+      if file_type != "dir":
+        _matched.extend(_f.path for _f in _files if matcher.match(f"{_prefix}{_f.name}", _f.name, False))
+
+      return self.descend(_dirs), _matched
+
+    for _matched in self.map(_find):
+      yield from _matched
+
+class PathMatcher:
+  """
+  Evaluates glob, extension and regex patterns together on relative paths.
+
+    * glob: pathlib style, relative to the root (*.txt, **/*.py, data/*/), trailing / matches directories only
+    * ext: suffix(es) of the name (.txt, .tsv.gz)
+    * regex: searched in the relative path
+
+  Glob patterns are compiled into one alternation so every path is tested once.
+  `max_depth` is the deepest directory level a walk needs to visit (-1 for all).
+
+  @example
+  _matcher = PathMatcher(glob=["*.md", "src/**/*.py"], ext=".tsv.gz", regex=r"_v\d+")
+  _matcher.match("src/lib/a.py", "a.py", False)
+  """
+
+  def __init__(self, glob=None, ext=None, regex=None):
+    _globs = [glob] if isinstance(glob, str) else list(glob or [])
+    self.ext = (ext,) if isinstance(ext, str) else tuple(ext or ())
+    _regex = [regex] if isinstance(regex, (str, RegEx.Pattern)) else list(regex or [])
+    self.regex = [RegEx.compile(_r) if isinstance(_r, str) else _r for _r in _regex]
+
+    _files, _dirs = [], []
+    self.max_depth = -1 if self.ext or self.regex or not _globs else 0
+    for _glob in _globs:
+      _glob = _glob.replace(OS.sep, "/").lstrip("/")
+      if _glob.startswith("./"):
+        _glob = _glob[2:]
+
+      _is_dir_only = _glob.endswith("/") or _glob == "**" or _glob.endswith("/**")
+      _glob = _glob.rstrip("/")
+      _regex_str = self.glob_to_regex(_glob)
+      _dirs.append(_regex_str)
+      if not _is_dir_only:
+        _files.append(_regex_str)
+
+      if "**" in _glob:
+        self.max_depth = -1
+      elif self.max_depth >= 0:
+        self.max_depth = max(self.max_depth, _glob.count("/"))
+
+    self._glob_files = RegEx.compile("|".join(_files)) if _files else None
+    self._glob_dirs = RegEx.compile("|".join(_dirs)) if _dirs else None
+
+  @staticmethod
+  def glob_to_regex(glob):
+    """Translates pathlib style glob into regex where * and ? do not cross /"""
+    _out, _idx, _len = [], 0, len(glob)
+    while _idx < _len:
+      _char = glob[_idx]
+      if glob.startswith("**/", _idx):
+        _out.append("(?:[^/]*/)*")
+        _idx += 3
+        continue
+      elif glob.startswith("**", _idx):
+        _out.append(".*")
+        _idx += 2
+        continue
+      elif _char == "*":
+        _out.append("[^/]*")
+      elif _char == "?":
+        _out.append("[^/]")
+      elif _char == "[" and glob.find("]", _idx + 2) > 0:
+        _end = glob.find("]", _idx + 2)
+        _class = glob[_idx + 1:_end]
+        _class = f"^{_class[1:]}" if _class.startswith("!") else _class
+        _out.append(f"[{_class.replace(chr(92), chr(92) * 2)}]")
+        _idx = _end + 1
+        continue
+      else:
+        _out.append(RegEx.escape(_char))
+      _idx += 1
+
+    return f"(?:{''.join(_out)})\\Z"
+
+  def match(self, rel_path, name, is_dir=False):
+    _glob = self._glob_dirs if is_dir else self._glob_files
+    if _glob is not None and _glob.match(rel_path):
+      return True
+    if self.ext and not is_dir and name.endswith(self.ext):
+      return True
+    return any(_r.search(rel_path) for _r in self.regex)
@@ -0,0 +1,181 @@
+import os as OS, itertools as IterTools
+
+class FileWriter:
+  """
+  Buffered writer session that keeps one file descriptor open for many writes.
+
+  Content is collected as encoded chunks and written in batches of `buffer_size` bytes
+  with a single vectored write (os.writev) where available.
+  In atomic mode, content goes to a temporary file in the same directory which replaces
+  the destination on close, so readers never see a partially written file.
+
+  @example
+  with FileWriter("out.tsv", flag_atomic=True) as _fw:
+    for _row in rows:
+      _fw.write("\\t".join(_row) + "\\n")
+    _fw.write_lines(["a", "b"])
+  """
+
+  iov_max = 1024 # IOV_MAX on Linux/macOS
+
+  def __init__(self, path, append=False, encoding="utf-8", flag_atomic=False, buffer_size=1024 * 1024, newline="\n"):
+    self.path = str(path)
+    self.encoding = encoding
+    self.flag_atomic = flag_atomic
+    self.buffer_size = int(buffer_size)
+    self.newline = newline
+    self.bytes_written = 0
+
+    self._chunks = []
+    self._buffered = 0
+    self._path_tmp = None
+
+    _dir = OS.path.dirname(OS.path.abspath(self.path))
+    OS.makedirs(_dir, exist_ok=True)
+
+    _flags = OS.O_WRONLY | OS.O_CREAT | getattr(OS, "O_BINARY", 0)
+    if flag_atomic:
+      self._fd, self._path_tmp = self._create_tmp(_dir, _flags)
+      if append and OS.path.isfile(self.path):
+        with open(self.path, "rb") as _fh_src, open(self._fd, "wb", closefd=False) as _fh_dst:
+          while _block := _fh_src.read(self.buffer_size):
+            _fh_dst.write(_block)
+    else:
+      self._fd = OS.open(self.path, _flags | (OS.O_APPEND if append else OS.O_TRUNC), 0o666)
+
+  def _create_tmp(self, dir_path, flags):
+    """Opens a new temporary file next to the destination, created 0666 so the kernel applies the umask"""
+    while True:
+      _path_tmp = OS.path.join(dir_path, f".{OS.path.basename(self.path)}.{OS.urandom(6).hex()}.tmp")
+      try:
+        return OS.open(_path_tmp, flags | OS.O_EXCL, 0o666), _path_tmp
+      except FileExistsError:
+        continue
+
+  @property
+  def closed(self):
+    return self._fd is None
+
+  def _encode(self, content):
+    if isinstance(content, (bytes, bytearray, memoryview)):
+      return content
+    return str(content).encode(self.encoding)
+
+  def write(self, content):
+    """Buffers str|bytes content, flushes when buffer is full"""
+    _chunk = self._encode(content)
+    self._chunks.append(_chunk)
+    self._buffered += len(_chunk)
+    if self._buffered >= self.buffer_size:
+      self.flush()
+    return len(_chunk)
+
+  def write_lines(self, lines, newline=None, flag_last_newline=True, batch_size=8192):
+    """Buffers an iterable of lines, each followed by newline (except the last one if flag_last_newline is False)
+
+    Lines are joined and encoded in batches to keep the per-line overhead low.
+    """
+    _newline = self.newline if newline is None else newline
+    _lines = iter(lines)
+    _is_first = True
+
+    while True:
+      _batch = list(IterTools.islice(_lines, batch_size))
+      if not _batch:
+        break
+
+      _is_bytes = isinstance(_batch[0], (bytes, bytearray))
+      _sep = _newline.encode(self.encoding) if _is_bytes else _newline
+      try:
+        _chunk = _sep.join(_batch)
+      except TypeError:
+        # Mixed or non str items
+        _sep = self._encode(_newline)
+        _chunk = _sep.join(self._encode(_l) for _l in _batch)
+
+      if not _is_first and not flag_last_newline:
+        self.write(_sep)
+      self.write(_chunk)
+      if flag_last_newline:
+        self.write(_sep)
+      _is_first = False
+
+    return self
+
+  writelines = write_lines
+
+  def flush(self):
+    """Writes all buffered chunks"""
+    _chunks = self._chunks
+    self._chunks, self._buffered = [], 0
+
+    _writev = getattr(OS, "writev", None)
+    while _chunks:
+      _batch = _chunks[:self.iov_max]
+      if _writev:
+        _written = _writev(self._fd, _batch)
+      else:
+        _written = OS.write(self._fd, b"".join(_batch))
+
+      self.bytes_written += _written
+      # Handle partial writes: keep the rest of the batch
+      _remaining = []
+      for _chunk in _batch:
+        if _written >= len(_chunk):
+          _written -= len(_chunk)
+        else:
+          _remaining.append(memoryview(_chunk)[_written:])
+          _written = 0
+      _chunks = _remaining + _chunks[len(_batch):]
+
+    return self
+
+  def close(self):
+    """Flushes and closes the file, moves temporary file to the destination in atomic mode"""
+    if self._fd is None:
+      return self.path
+
+    try:
+      self.flush()
+      if self.flag_atomic and OS.path.exists(self.path):
+        # Keep permissions of the existing destination
+        _mode = OS.stat(self.path).st_mode & 0o7777
+        OS.fchmod(self._fd, _mode) if hasattr(OS, "fchmod") else OS.chmod(self._path_tmp, _mode)
+      if self.flag_atomic:
+        OS.fsync(self._fd)
+    finally:
+      OS.close(self._fd)
+      self._fd = None
+
+    if self._path_tmp:
+      OS.replace(self._path_tmp, self.path)
+      self._path_tmp = None
+
+    return self.path
+
+  def abort(self):
+    """Closes without publishing the content (atomic mode leaves destination untouched)"""
+    self._chunks, self._buffered = [], 0
+    if self._fd is not None:
+      OS.close(self._fd)
+      self._fd = None
+
+    if self._path_tmp:
+      try:
+        OS.remove(self._path_tmp)
+      except OSError:
+        pass
+      self._path_tmp = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, *args):
+    if exc_type is not None and self.flag_atomic:
+      self.abort()
+    else:
+      self.close()
+
+  def __del__(self):
+    if getattr(self, "_fd", None) is not None:
+      self.abort() if self.flag_atomic else self.close()
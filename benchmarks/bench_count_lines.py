@@ -0,0 +1,53 @@
+"""Text mode vs binary/mmap line counting in count_file_lines
+
+@usage
+python benchmarks/bench_count_lines.py --size-mb 2048
+"""
+import argparse as ArgParser
+import os as OS
+import tempfile as TempFile
+import time as TIME
+
+from UtilityLib import UtilityManager
+
+def _make_tsv(path, size_mb):
+  _row = "\t".join(["ENSG00000139618", "BRCA2", "13", "32315474", "32400266", "0.9871", "protein_coding"]) + "\n"
+  _rows = _row * (1024 * 1024 // len(_row))
+  with open(path, "w") as _fh:
+    for _ in range(size_mb):
+      _fh.write(_rows)
+
+def _timed(func, *args, **kwargs):
+  _start = TIME.perf_counter()
+  _res = func(*args, **kwargs)
+  return _res, TIME.perf_counter() - _start
+
+def main():
+  _parser = ArgParser.ArgumentParser()
+  _parser.add_argument("--size-mb", type=int, default=1024)
+  _args = _parser.parse_args()
+
+  _um = UtilityManager(log_to_console=False, log_to_file=False)
+
+  with TempFile.TemporaryDirectory() as _tmp_dir:
+    _path = OS.path.join(_tmp_dir, "bench.tsv")
+    _make_tsv(_path, _args.size_mb)
+    _um.gz(_path, level=1, flag_parallel=True)
+
+    print(f"Input: {_args.size_mb} MiB, cpus {OS.cpu_count()}")
+    for _fp in (_path, f"{_path}.gz"):
+      _text, _t_text = _timed(_um.count_file_lines, _fp, flag_binary=False)
+      _binary, _t_binary = _timed(_um.count_file_lines, _fp, flag_index=False)
+      _indexed, _t_indexed = _timed(_um.count_file_lines, _fp)
+      _cached, _t_cached = _timed(_um.count_file_lines, _fp)
+
+      print(OS.path.basename(_fp))
+      print(f"  text:    {_t_text:8.2f}s {_text}")
+      print(f"  binary:  {_t_binary:8.2f}s {_binary} speedup {_t_text / _t_binary:.1f}x")
+      if _fp.endswith(".gz"):
+        print(f"  indexed: {_t_indexed:8.2f}s {_indexed} (first pass), {_t_cached:.4f}s {_cached} (from index)")
+
+      assert _text == _binary == _indexed == _cached
+
+if __name__ == "__main__":
+  main()
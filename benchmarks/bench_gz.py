@@ -0,0 +1,53 @@
+"""Single-threaded vs parallel multi-member gzip compression
+
+@usage
+python benchmarks/bench_gz.py --size-mb 512 --level 6
+"""
+import argparse as ArgParser
+import gzip as GZip
+import os as OS
+import tempfile as TempFile
+import time as TIME
+
+from UtilityLib import UtilityManager
+
+def _make_tsv(path, size_mb):
+  _row = "\t".join(["ENSG00000139618", "BRCA2", "13", "32315474", "32400266", "0.9871", "protein_coding"]) + "\n"
+  _rows = _row * (1024 * 1024 // len(_row))
+  with open(path, "w") as _fh:
+    for _ in range(size_mb):
+      _fh.write(_rows)
+
+def main():
+  _parser = ArgParser.ArgumentParser()
+  _parser.add_argument("--size-mb", type=int, default=256)
+  _parser.add_argument("--level", type=int, default=6)
+  _parser.add_argument("--block-mb", type=int, default=16)
+  _args = _parser.parse_args()
+
+  _um = UtilityManager(log_to_console=False, log_to_file=False)
+
+  with TempFile.TemporaryDirectory() as _tmp_dir:
+    _path = OS.path.join(_tmp_dir, "bench.tsv")
+    _make_tsv(_path, _args.size_mb)
+    _size = OS.path.getsize(_path)
+
+    _results = []
+    for _label, _parallel in (("single", False), ("parallel", True)):
+      _start = TIME.perf_counter()
+      _um.gz(_path, level=_args.level, flag_parallel=_parallel, block_size=_args.block_mb * 1024 * 1024)
+      _elapsed = TIME.perf_counter() - _start
+      _gz_size = OS.path.getsize(f"{_path}.gz")
+
+      with GZip.open(f"{_path}.gz", "rb") as _fh:
+        _is_valid = sum(len(_b) for _b in iter(lambda: _fh.read(1 << 20), b"")) == _size
+
+      _results.append((_label, _elapsed, _gz_size, _is_valid))
+      OS.remove(f"{_path}.gz")
+
+    print(f"Input: {_size / 2**20:.0f} MiB, level {_args.level}, workers {_um.max_workers}")
+    for _label, _elapsed, _gz_size, _is_valid in _results:
+      print(f"{_label:>10}: {_elapsed:8.2f}s {_size / 2**20 / _elapsed:8.1f} MiB/s ratio {_gz_size / _size:.3f} valid={_is_valid}")
+
+if __name__ == "__main__":
+  main()
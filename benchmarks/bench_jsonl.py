@@ -0,0 +1,56 @@
+"""Rows per second of parse_jsonl_gz (line by line) vs jsonl_to_df (batches with key projection)
+
+@usage
+python benchmarks/bench_jsonl.py --rows 1000000
+"""
+import argparse as ArgParser
+import gzip as GZip
+import json as JSON
+import os as OS
+import tempfile as TempFile
+import time as TIME
+
+from UtilityLib import UtilityManager
+
+def _make_jsonl(path, rows):
+  with GZip.open(path, "wt", compresslevel=1) as _fh:
+    for _idx in range(rows):
+      _record = {
+        "id": _idx,
+        "gene": "BRCA2",
+        "metrics": {"score": _idx / 7, "rank": _idx % 100},
+        "tags": ["protein_coding", "chr13"],
+        "note": "x" * 40,
+      }
+      _fh.write(JSON.dumps(_record) + "\n")
+
+def main():
+  _parser = ArgParser.ArgumentParser()
+  _parser.add_argument("--rows", type=int, default=1000000)
+  _parser.add_argument("--batch-size", type=int, default=100000)
+  _args = _parser.parse_args()
+
+  _um = UtilityManager(log_to_console=False, log_to_file=False)
+  _keys = {"id": "id", "score": "metrics|score", "tag": "tags|0"}
+  _schema = {"id": "int64", "score": "float64", "tag": "category"}
+
+  with TempFile.TemporaryDirectory() as _tmp_dir:
+    _path = OS.path.join(_tmp_dir, "bench.jsonl.gz")
+    _make_jsonl(_path, _args.rows)
+
+    _start = TIME.perf_counter()
+    _rows = [{_c: _um.get_deep_key(_r, _k) for _c, _k in _keys.items()} for _r in _um.parse_jsonl_gz(_path, row_size=_args.rows, flag_index=False)]
+    _um.DF(_rows).astype(_schema)
+    _t_lines = TIME.perf_counter() - _start
+
+    _start = TIME.perf_counter()
+    _num = sum(len(_df) for _df in _um.jsonl_to_df(_path, _keys, _schema, _args.batch_size))
+    _t_batches = TIME.perf_counter() - _start
+    assert _num == _args.rows
+
+    print(f"Rows: {_args.rows}")
+    print(f"{'parse_jsonl_gz':>16}: {_t_lines:8.2f}s {_args.rows / _t_lines:12,.0f} rows/s")
+    print(f"{'jsonl_to_df':>16}: {_t_batches:8.2f}s {_args.rows / _t_batches:12,.0f} rows/s")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,56 @@
+"""Time and size of write_pickle/read_pickle per codec and protocol
+
+@usage
+python benchmarks/bench_pickle.py --size-mb 512
+"""
+import argparse as ArgParser
+import os as OS
+import tempfile as TempFile
+import time as TIME
+
+import numpy as NP
+import pandas as PD
+
+from UtilityLib import UtilityManager
+
+_CODECS = ["none", "gzip-1", "gzip-6", "gzip-9", "bz2", "xz-1", "lz4", "zstd-3"]
+
+def main():
+  _parser = ArgParser.ArgumentParser()
+  _parser.add_argument("--size-mb", type=int, default=256)
+  _parser.add_argument("--codecs", nargs="+", default=_CODECS)
+  _args = _parser.parse_args()
+
+  _um = UtilityManager(log_to_console=False, log_to_file=False)
+
+  _rows = _args.size_mb * 2**20 // 24
+  _rng = NP.random.default_rng(0)
+  _df = PD.DataFrame({
+    "id": NP.arange(_rows, dtype=NP.int64),
+    "score": _rng.random(_rows).round(3),
+    "group": _rng.integers(0, 100, _rows),
+  })
+
+  print(f"Input: DataFrame {_df.memory_usage().sum() / 2**20:.0f} MiB")
+  print(f"{'codec':>8} {'protocol':>8} {'write':>8} {'read':>8} {'MiB':>8}")
+
+  with TempFile.TemporaryDirectory() as _tmp_dir:
+    _path = OS.path.join(_tmp_dir, "bench.pkl")
+    for _codec in _args.codecs:
+      for _protocol in (4, 5):
+        _start = TIME.perf_counter()
+        if not _um.write_pickle(_path, _df, _codec, _protocol):
+          print(f"{_codec:>8} {_protocol:>8} skipped (codec not installed)")
+          break
+        _t_write = TIME.perf_counter() - _start
+
+        _start = TIME.perf_counter()
+        _read = _um.read_pickle(_path)
+        _t_read = TIME.perf_counter() - _start
+
+        assert _read.equals(_df)
+        print(f"{_codec:>8} {_protocol:>8} {_t_write:8.2f} {_t_read:8.2f} {OS.path.getsize(_path) / 2**20:8.1f}")
+        OS.remove(_path)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,56 @@
+"""Per-call overhead of write() in a loop vs a single writer session
+
+@usage
+python benchmarks/bench_write.py --calls 20000
+"""
+import argparse as ArgParser
+import os as OS
+import tempfile as TempFile
+import time as TIME
+
+from UtilityLib import UtilityManager
+
+def main():
+  _parser = ArgParser.ArgumentParser()
+  _parser.add_argument("--calls", type=int, default=20000)
+  _parser.add_argument("--lines", type=int, default=1000000)
+  _args = _parser.parse_args()
+
+  _um = UtilityManager(log_to_console=False, log_to_file=False)
+  _row = "\t".join(["ENSG00000139618", "BRCA2", "13", "32315474", "32400266", "0.9871", "protein_coding"])
+
+  with TempFile.TemporaryDirectory() as _tmp_dir:
+    _path = OS.path.join(_tmp_dir, "out", "bench.tsv")
+    _results = []
+
+    _start = TIME.perf_counter()
+    for _ in range(_args.calls):
+      _um.write(_path, f"{_row}\n", append=True)
+    _results.append(("write(append=True)", TIME.perf_counter() - _start, OS.path.getsize(_path)))
+    OS.remove(_path)
+
+    _start = TIME.perf_counter()
+    with _um.get_writer(_path) as _fw:
+      for _ in range(_args.calls):
+        _fw.write(f"{_row}\n")
+    _results.append(("get_writer().write", TIME.perf_counter() - _start, OS.path.getsize(_path)))
+
+    _start = TIME.perf_counter()
+    with _um.get_writer(_path, flag_atomic=True) as _fw:
+      for _ in range(_args.calls):
+        _fw.write(f"{_row}\n")
+    _results.append(("get_writer(atomic)", TIME.perf_counter() - _start, OS.path.getsize(_path)))
+
+    print(f"Calls: {_args.calls}")
+    for _label, _elapsed, _size in _results:
+      print(f"{_label:>20}: {_elapsed:8.3f}s {_elapsed / _args.calls * 1e6:8.2f} us/call size {_size}")
+
+    _lines = [_row] * _args.lines
+    for _label, _kwargs in (("list", {}), ("list atomic", {"flag_atomic": True})):
+      _start = TIME.perf_counter()
+      _um.write(_path, _lines, **_kwargs)
+      _elapsed = TIME.perf_counter() - _start
+      print(f"{_label:>20}: {_elapsed:8.3f}s for {_args.lines} lines, {OS.path.getsize(_path) / 2**20 / _elapsed:.1f} MiB/s")
+
+if __name__ == "__main__":
+  main()
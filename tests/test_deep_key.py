@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from UtilityLib import UtilityManager
+
+RECORDS = [
+  {"id": 1, "tags": "abc", "metrics": {"score": 0.5}, "items": [{"name": "x"}, {"name": "y"}]},
+  {"id": 2, "tags": ["t1", "t2"], "metrics": None, "items": []},
+  {"id": 3, "tags": [], "metrics": {"score": 1.5, "extra": 1}},
+  {"id": 4, "tags": "de", "metrics": [10, 20], "items": [{"name": "z"}]},
+]
+
+PATHS = [
+  "id",
+  "missing",
+  "tags|0",
+  "tags|5",
+  "metrics|score",
+  "metrics|1",
+  "metrics|*",
+  "items|0|name",
+  "items|3|name",
+  "missing|child",
+]
+
+
+@pytest.fixture(scope="module")
+def utility():
+  return UtilityManager(log_to_console=False, log_to_file=False)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_getter_matches_get_deep_key(utility, path):
+  _get = utility._deep_key_getter(path, "NA")
+  for _record in RECORDS:
+    assert _get(_record) == utility.get_deep_key(_record, path, "NA")
+
+
+def test_getter_tuple_keys(utility):
+  _record = RECORDS[0]
+  assert utility._deep_key_getter(("items", 1, "name"))(_record) == utility.get_deep_key(_record, ("items", 1, "name")) == "y"
+
+
+def test_get_deep_key_semantics(utility):
+  # Strings are not indexed, out of range indices keep the list, wildcard lists the keys
+  assert utility.get_deep_key(RECORDS[0], "tags|0") == "abc"
+  assert utility.get_deep_key(RECORDS[1], "tags|5") == ["t1", "t2"]
+  assert utility.get_deep_key(RECORDS[2], "metrics|*") == ["score", "extra"]
+
+
+def test_jsonl_to_df_uses_get_deep_key(utility, tmp_path):
+  _file_path = tmp_path / "records.jsonl"
+  _file_path.write_text("\n".join(json.dumps(_record) for _record in RECORDS) + "\n")
+
+  _paths = ["tags|0", "metrics|score", "items|0|name", "metrics|*"]
+  _df = next(iter(utility.jsonl_to_df(str(_file_path), _paths)))
+  for _path in _paths:
+    assert _df[_path].tolist() == [utility.get_deep_key(_record, _path) for _record in RECORDS]
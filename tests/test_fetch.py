@@ -0,0 +1,138 @@
+import http.server
+import re
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from UtilityLib import UtilityManager
+from UtilityLib.lib.fetch import HTTPClient
+
+BODY = bytes(range(256)) * 40
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+  state = None
+
+  def log_message(self, *args):
+    pass
+
+  def do_GET(self):
+    _state = self.state
+    with _state["lock"]:
+      _state["requests"].append({"path": self.path, "range": self.headers.get("Range"), "if_range": self.headers.get("If-Range")})
+      _state["active"] += 1
+      _state["max_active"] = max(_state["max_active"], _state["active"])
+
+    try:
+      time.sleep(_state["delay"])
+      if self.headers.get("If-None-Match") == _state["etag"]:
+        self.send_response(304)
+        self.send_header("ETag", _state["etag"])
+        self.end_headers()
+        return
+
+      _body = _state["body"]
+      _range = self.headers.get("Range")
+      _if_range = self.headers.get("If-Range")
+      if _range and (_if_range is None or _if_range == _state["etag"]):
+        _start = _state["range_start"] if _state["range_start"] is not None else int(re.match(r"bytes=(\d+)-", _range).group(1))
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {_start}-{len(_body) - 1}/{len(_body)}")
+        _body = _body[_start:]
+      else:
+        self.send_response(200)
+
+      self.send_header("ETag", _state["etag"])
+      self.send_header("Content-Length", str(len(_body)))
+      self.end_headers()
+      self.wfile.write(_body)
+    finally:
+      with _state["lock"]:
+        _state["active"] -= 1
+
+
+@pytest.fixture
+def server():
+  _state = {"body": BODY, "etag": '"v1"', "delay": 0, "range_start": None, "requests": [], "active": 0, "max_active": 0, "lock": threading.Lock()}
+  _handler = type("Handler", (_Handler,), {"state": _state})
+  _server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _handler)
+  threading.Thread(target=_server.serve_forever, daemon=True).start()
+  _state["url"] = f"http://127.0.0.1:{_server.server_port}"
+  yield _state
+  _server.shutdown()
+  _server.server_close()
+
+
+def _write_part(destination, data, validator):
+  (destination.parent / f"{destination.name}.part").write_bytes(data)
+  (destination.parent / f"{destination.name}.part.validator").write_text(validator)
+
+
+def test_download_resumes_with_if_range(server, tmp_path):
+  _destination = tmp_path / "data.bin"
+  _write_part(_destination, BODY[:1000], '"v1"')
+
+  HTTPClient().download(f"{server['url']}/data.bin", _destination)
+
+  assert _destination.read_bytes() == BODY
+  assert server["requests"][-1]["range"] == "bytes=1000-"
+  assert server["requests"][-1]["if_range"] == '"v1"'
+  assert sorted(_p.name for _p in tmp_path.iterdir()) == ["data.bin"]
+
+
+def test_download_restarts_when_file_changed(server, tmp_path):
+  _destination = tmp_path / "data.bin"
+  _write_part(_destination, BODY[:1000], '"v1"')
+  server["body"], server["etag"] = b"changed" * 500, '"v2"'
+
+  HTTPClient().download(f"{server['url']}/data.bin", _destination)
+
+  assert _destination.read_bytes() == server["body"]
+
+
+def test_download_restarts_on_unexpected_range(server, tmp_path):
+  _destination = tmp_path / "data.bin"
+  _write_part(_destination, BODY[:1000], '"v1"')
+  server["range_start"] = 0
+
+  HTTPClient().download(f"{server['url']}/data.bin", _destination)
+
+  assert _destination.read_bytes() == BODY
+  assert server["requests"][-1]["range"] is None
+
+
+def test_download_without_validator_starts_over(server, tmp_path):
+  _destination = tmp_path / "data.bin"
+  (tmp_path / "data.bin.part").write_bytes(b"stale" * 100)
+
+  HTTPClient().download(f"{server['url']}/data.bin", _destination)
+
+  assert _destination.read_bytes() == BODY
+  assert server["requests"][-1]["range"] is None
+
+
+def test_download_not_modified_keeps_destination(server, tmp_path):
+  _destination = tmp_path / "data.bin"
+  _destination.write_bytes(b"local copy")
+
+  _, _response = HTTPClient().download(f"{server['url']}/data.bin", _destination, headers={"If-None-Match": '"v1"'})
+
+  assert _response.status_code == 304
+  assert _destination.read_bytes() == b"local copy"
+
+
+def test_get_files_per_host_is_scoped_to_call(server, tmp_path):
+  server["delay"] = 0.2
+  _utility = UtilityManager(log_to_console=False, log_to_file=False)
+  _shared = _utility.http_client
+  _urls = [f"{server['url']}/file{_idx}.bin" for _idx in range(4)]
+
+  _results = _utility.get_files(_urls, str(tmp_path), max_concurrency=4, per_host=1)
+
+  assert all(_results.values())
+  assert server["max_active"] == 1
+  assert _utility.http_client is _shared
+  assert _shared.per_host == HTTPClient().per_host